@@ -0,0 +1,221 @@
+"""
+Planlayıcının ölçeklenme ölçümleri. Sentetik dönemler üzerinde çekirdek fonksiyonları
+ve (isteğe bağlı) Streamlit AppTest ile uçtan uca bir çalıştırmayı ölçer; süreleri ve
+en yüksek bellek kullanımını JSON'a yazar. Önceki bir sonuç dosyasıyla karşılaştırıp
+yavaşlamaları raporlayabilir.
+
+Senaryo ölçümü aynı senaryoları süreç havuzunda (uygulamadaki gibi önceden açılmış)
+ve tek süreçte sırayla dağıtarak paralelliğin kazancını gösterir.
+
+    python -m benchmarks.run --out bench.json
+    python -m benchmarks.run --quick --compare bench.json
+"""
+import argparse
+import copy
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+
+from exam_engine import (build_course_map, build_exam_list, calculate_exam_points, calculate_initial_loads,
+                         run_allocation, run_scenario, run_scenarios, scenario_executor)
+
+from .synthetic import make_semester
+
+APP_PATH = Path(__file__).resolve().parents[1] / "exam.py"
+SIZES = [(10, 10), (50, 45), (200, 150), (1000, 600), (2000, 1200)] # (asistan, ders)
+QUICK_SIZES = [(10, 10), (50, 45), (200, 150)]
+SCENARIO_COUNTS = [2, 8]
+
+
+def measure(fn, setup, repeat):
+    """fn(*setup()) çağrısının süre (ms) dağılımı ve ayrı bir çalıştırmadaki en yüksek bellek (KiB)."""
+    times = []
+    for _ in range(repeat):
+        args = setup()
+        start = time.perf_counter()
+        fn(*args)
+        times.append((time.perf_counter() - start) * 1000)
+
+    args = setup()
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    fn(*args)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {
+        "median_ms": round(statistics.median(times), 3),
+        "min_ms": round(min(times), 3),
+        "max_ms": round(max(times), 3),
+        "peak_kib": round(peak / 1024, 1)
+    }
+
+
+def initial_pool(roster):
+    return [{"name": name, "load": 0.0} for name in roster["name"].tolist()]
+
+
+def bench_core(semester, repeat):
+    roster, loads, exams_df = semester["roster"], semester["course_loads"], semester["exams"]
+    course_map = build_course_map(loads)
+    exam_list, _ = build_exam_list([exams_df], course_map)
+    loaded_pool = calculate_initial_loads(initial_pool(roster), loads)
+
+    def all_points(exams):
+        for start, duration in zip(exams['datetime_obj'], exams['duration']):
+            calculate_exam_points(start, int(duration))
+
+    return {
+        "calculate_exam_points": measure(all_points, lambda: (exam_list,), repeat),
+        "calculate_initial_loads": measure(calculate_initial_loads, lambda: (initial_pool(roster), loads), repeat),
+        "build_exam_list": measure(build_exam_list, lambda: ([exams_df], course_map), repeat),
+        "run_allocation": measure(run_allocation, lambda: (copy.deepcopy(loaded_pool), exam_list), repeat),
+    }
+
+
+def bench_scenarios(semester, repeat, executor):
+    """Senaryo başına bir asistan çıkarılır; havuzla ve havuzsuz (sırayla) dağıtım süreleri."""
+    roster, loads, exams_df = semester["roster"], semester["course_loads"], semester["exams"]
+    exam_list, _ = build_exam_list([exams_df], build_course_map(loads))
+    loaded_pool = calculate_initial_loads(initial_pool(roster), loads)
+    names = roster["name"].tolist()
+
+    def scenarios(n):
+        return [{"name": f"S{k}", "changes": [{"action": "remove", "assistant": names[k % len(names)]}]} for k in range(n)]
+
+    def in_pool(pool, exams, scenario_list):
+        # run_scenarios az senaryoyu havuza göndermez; paralel maliyeti doğrudan ölçülür
+        list(executor.map(run_scenario, [pool] * len(scenario_list), [exams] * len(scenario_list), scenario_list))
+
+    def serial(pool, exams, scenario_list):
+        for scenario in scenario_list:
+            run_scenario(pool, exams, scenario)
+
+    timings = {}
+    for n in SCENARIO_COUNTS:
+        # Süreç havuzu tracemalloc ile görülmez; tepe bellek yalnızca ana süreçtekidir
+        timings[f"scenarios_pool_{n}"] = measure(in_pool, lambda: (loaded_pool, exam_list, scenarios(n)), repeat)
+        timings[f"scenarios_serial_{n}"] = measure(serial, lambda: (loaded_pool, exam_list, scenarios(n)), repeat)
+        timings[f"run_scenarios_{n}"] = measure(
+            lambda *args: run_scenarios(*args, executor=executor), lambda: (loaded_pool, exam_list, scenarios(n)), repeat)
+    return timings
+
+
+def bench_app(semester, repeat):
+    """Uygulamayı AppTest ile açar, sentetik veriyi oturuma koyar ve dağıtım düğmesini ölçer."""
+    from streamlit.testing.v1 import AppTest
+
+    semester_name = "Güz (1. Dönem)"
+
+    def setup():
+        at = AppTest.from_file(str(APP_PATH), default_timeout=600)
+        at.session_state["assistants_db"] = semester["roster"].copy()
+        at.session_state["course_load_data"] = semester["course_loads"].copy()
+        at.session_state["semester_data_dept"] = {semester_name: semester["exams"].copy()}
+        at.session_state["semester_data_service"] = {semester_name: semester["exams"].iloc[0:0].copy()}
+        at.run()
+        return (at,)
+
+    def click_run(at):
+        next(b for b in at.button if "DAĞITIMI" in b.label).click().run()
+        if at.exception:
+            raise RuntimeError(at.exception[0].message)
+
+    return {"app_run_allocation": measure(click_run, setup, repeat)}
+
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=APP_PATH.parent,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, baseline_path, threshold):
+    """Aynı ölçümü bir önceki sonuçla karşılaştırır; 'threshold' katından yavaş olanları döndürür."""
+    baseline = json.loads(Path(baseline_path).read_text(encoding="utf-8"))
+    old = {(r["name"], r["assistants"], r["courses"]): r for r in baseline["results"]}
+    regressions = []
+    for r in results:
+        prev = old.get((r["name"], r["assistants"], r["courses"]))
+        if prev is None or prev["median_ms"] <= 0:
+            continue
+        ratio = r["median_ms"] / prev["median_ms"]
+        # 1 ms altındaki ölçümler gürültüye çok açık; oranı gösterilir ama işaretlenmez
+        slower = ratio > threshold and r["median_ms"] >= 1.0
+        flag = "  <-- YAVAŞLAMA" if slower else ""
+        print(f"{r['name']:<26} {r['assistants']:>5} asistan  {prev['median_ms']:>10.2f} -> {r['median_ms']:>10.2f} ms  x{ratio:.2f}{flag}")
+        if slower:
+            regressions.append(r)
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.run", description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--out", default="bench_results.json", help="Sonuç dosyası (JSON)")
+    parser.add_argument("--quick", action="store_true", help="Yalnızca küçük boyutlar")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--skip-app", action="store_true", help="AppTest ile uçtan uca ölçümü atla")
+    parser.add_argument("--skip-scenarios", action="store_true", help="Senaryo (süreç havuzu) ölçümünü atla")
+    parser.add_argument("--app-max-assistants", type=int, default=1000, help="Uçtan uca ölçümün yapılacağı en büyük roster")
+    parser.add_argument("--compare", help="Karşılaştırılacak önceki sonuç dosyası")
+    parser.add_argument("--threshold", type=float, default=1.25, help="Yavaşlama sayılacak oran")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    # Uçtan uca ölçüm gerçek plan veritabanına dokunmasın
+    os.environ["EXAM_PLAN_DB"] = str(Path(tempfile.mkdtemp()) / "bench_plan.db")
+
+    executor = None if args.skip_scenarios else scenario_executor()
+    if executor is not None:
+        list(executor.map(abs, range(os.cpu_count() or 1))) # süreçler ölçümden önce başlasın
+
+    results = []
+    for n_assistants, n_courses in (QUICK_SIZES if args.quick else SIZES):
+        semester = make_semester(n_assistants, n_courses, args.seed)
+        timings = bench_core(semester, args.repeat)
+        if executor is not None:
+            timings.update(bench_scenarios(semester, args.repeat, executor))
+        if not args.skip_app and n_assistants <= args.app_max_assistants:
+            timings.update(bench_app(semester, max(1, args.repeat // 2)))
+        for name, stats in timings.items():
+            results.append({"name": name, "assistants": n_assistants, "courses": n_courses,
+                            "exams": len(semester["exams"]), **stats})
+            print(f"{name:<26} {n_assistants:>5} asistan {len(semester['exams']):>5} sınav  "
+                  f"{stats['median_ms']:>10.2f} ms  {stats['peak_kib']:>10.1f} KiB")
+    if executor is not None:
+        executor.shutdown()
+
+    report = {
+        "meta": {
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "revision": git_revision(),
+            "python": platform.python_version(),
+            "pandas": pd.__version__,
+            "platform": platform.platform(),
+            "repeat": args.repeat,
+            "seed": args.seed
+        },
+        "results": results
+    }
+    Path(args.out).write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding="utf-8")
+    print(f"Sonuçlar: {args.out}")
+
+    if args.compare:
+        if compare(results, args.compare, args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
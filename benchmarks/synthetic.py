@@ -0,0 +1,79 @@
+"""
+Ölçüm için sentetik dönem üreticisi: asistan listesi, Ders Yükleri tablosu ve
+gerçekçi biçimde kümelenmiş (vize haftaları, final dönemi) sınav takvimi.
+Tablolar uygulamadaki sütun adları ve türleriyle üretilir.
+"""
+import random
+from datetime import date, timedelta
+
+import pandas as pd
+
+from exam_engine.loads import ASSISTANT_COLUMNS
+
+EXAM_HOURS = ["09:40", "13:40", "17:40", "18:40"]
+EXAM_HOUR_WEIGHTS = [3, 3, 5, 1]
+DURATIONS = [90, 120, 150, 180]
+
+# Dönem başından itibaren sınav haftaları (gün) ve o haftaya düşen sınav türü
+EXAM_WEEKS = {"MT1": 42, "MT2": 77, "Final": 105, "Makeup": 119}
+
+
+def make_roster(n_assistants, seed=0):
+    rnd = random.Random(seed)
+    first = ["Ali", "Ayşe", "Barkın", "Duygu", "Elif", "Fatma", "Gülçehre", "İrem", "Melis", "Onur", "Rıza", "Sena", "Tuncay", "Ulaş", "Yavuz"]
+    last = ["Özalp", "Demircioğlu", "Güven", "Erdil", "Yıldız", "Bayram", "İnce", "Yaprak", "Topsakal", "Tatar", "Öz", "Akbulut", "Yüksel"]
+    names = [f"{rnd.choice(first)} {rnd.choice(last)} {i:04d}" for i in range(n_assistants)]
+    return pd.DataFrame({"name": names})
+
+
+def make_course_codes(n_courses):
+    return [f"MetE {100 + i}" for i in range(n_courses)]
+
+
+def make_course_loads(course_codes, roster, seed=0, assigned_ratio=0.8):
+    """Her derse 0-6 arası rastgele asistan ve rastgele saat yükü atar."""
+    rnd = random.Random(seed)
+    names = roster["name"].tolist()
+    rows = []
+    for code in course_codes:
+        parts = {"Recitation": rnd.randint(0, 4), "Objection": rnd.randint(0, 2), "Quiz": rnd.randint(0, 3), "Ödevler": rnd.randint(0, 4)}
+        count = rnd.randint(1, len(ASSISTANT_COLUMNS)) if rnd.random() < assigned_ratio else 0
+        picked = rnd.sample(names, min(count, len(names)))
+        row = {"Ders Kodu": code, **parts, "Toplam (Saat)": sum(parts.values())}
+        for k, col in enumerate(ASSISTANT_COLUMNS):
+            row[col] = picked[k] if k < len(picked) else "Yok"
+        rows.append(row)
+    return pd.DataFrame(rows)
+
+
+def make_exam_calendar(course_codes, seed=0, start=date(2025, 2, 17), exam_types=("MT1", "MT2", "Final"), needed=(2, 6)):
+    """
+    Sınavlar kendi haftasının iş günlerine, ağırlıkla akşam saatlerine yığılır;
+    küçük bir kısmı cumartesiye düşer (hafta sonu çarpanı).
+    """
+    rnd = random.Random(seed)
+    rows = []
+    for code in course_codes:
+        for exam_type in exam_types:
+            offset = EXAM_WEEKS[exam_type] + rnd.choice([0, 0, 1, 1, 2, 3, 4, 5])
+            day = start + timedelta(days=offset + rnd.randint(0, 1) * 7)
+            rows.append({
+                "Aktif": True,
+                "Ders Kodu": code,
+                "Sınav Türü": exam_type,
+                "Tarih": pd.Timestamp(day),
+                "Saat": rnd.choices(EXAM_HOURS, EXAM_HOUR_WEIGHTS)[0],
+                "Süre (dk)": rnd.choice(DURATIONS),
+                "İhtiyaç (Kişi)": rnd.randint(*needed)
+            })
+    return pd.DataFrame(rows)
+
+
+def make_semester(n_assistants, n_courses, seed=0):
+    roster = make_roster(n_assistants, seed)
+    codes = make_course_codes(n_courses)
+    return {
+        "roster": roster,
+        "course_loads": make_course_loads(codes, roster, seed),
+        "exams": make_exam_calendar(codes, seed)
+    }
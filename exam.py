@@ -1,9 +1,26 @@
 import streamlit as st
 import pandas as pd
 import requests
+import io
+import json
+import os
+import sqlite3
+import threading
+import time
+import functools
+from collections import deque
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
+from pathlib import Path
 from streamlit_lottie import st_lottie
 import plotly.express as px
-from datetime import datetime
+from datetime import date, datetime
+from exam_engine import (ASSISTANT_COLUMNS, EVERY_DAY, UNAVAILABILITY_COLUMNS, WEEKDAYS,
+                         build_course_map, build_exam_list, calculate_initial_loads, exam_count,
+                         new_allocation_cache, run_allocation_cached, run_scenarios, run_serially, scenario_executor,
+                         assistant_duties, calendar_matrix, load_breakdown, schedule_frame, write_schedule_xlsx,
+                         empty_unavailability_df, exam_calendar,
+                         active_trace, finish_trace, phase, phase_percentiles, start_trace)
 
 # --- 0. SAYFA AYARLARI ---
 st.set_page_config(
@@ -13,6 +30,46 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+# --- PROFİL ÖLÇÜMÜ (Geliştirici Paneli) ---
+# Panel açıkken her çalıştırmanın aşama süreleri ve sayaçları oturumdaki halka tampona
+# yazılır. Kapalıyken hiçbir trace başlatılmaz; phase() boş bir bağlam döndürür.
+PROFILE_BUFFER_SIZE = 200
+
+def profiling_enabled():
+    return bool(st.session_state.get("profiling_enabled"))
+
+def _store_trace(trace):
+    if "profile_runs" not in st.session_state:
+        st.session_state.profile_runs = deque(maxlen=PROFILE_BUFFER_SIZE)
+    st.session_state.profile_runs.append(trace)
+
+@contextmanager
+def profile_scope(label):
+    """Aktif bir çalıştırma varsa bloğu aşama olarak, yoksa (fragment, geri çağrı) ayrı bir çalıştırma olarak ölçer."""
+    if not profiling_enabled():
+        yield
+    elif active_trace() is not None:
+        with phase(label):
+            yield
+    else:
+        start_trace(label)
+        try:
+            yield
+        finally:
+            _store_trace(finish_trace())
+
+def profiled(func):
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        with profile_scope(func.__name__):
+            return func(*args, **kwargs)
+    return wrapper
+
+# Önceki (yarıda kalmış) bir çalıştırmanın trace'i bu çalıştırmaya karışmasın
+finish_trace()
+if profiling_enabled():
+    start_trace("sayfa")
+
 # --- RENK VE TEMA AYARLARI (CSS) ---
 st.markdown("""
 <style>
@@ -45,16 +102,106 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
-# --- 1. LOTTIE ANIMASYON YÜKLEYİCİ ---
-def load_lottieurl(url):
-    r = requests.get(url)
-    if r.status_code != 200:
+# --- 1. ANİMASYON VE LOGO YÜKLEYİCİ ---
+# Dosyalar önce bellekten, sonra disk önbelleğinden (.cache/) okunur. Ağdan indirme
+# arka planda yapılır; sayfa hiç beklemez. Dosya henüz yoksa animasyon gösterilmez,
+# logo ise doğrudan adresinden yüklenir.
+# İndirme başarısız olursa ASSET_RETRY_SECONDS'tan başlayıp her denemede iki katına
+# çıkan (en fazla TTL) bir bekleme sonrasında tekrar denenir.
+ASSET_CACHE_DIR = Path(__file__).parent / ".cache" / "assets"
+ASSET_TTL_SECONDS = 7 * 24 * 3600
+ASSET_RETRY_SECONDS = 5 * 60
+ASSET_TIMEOUT = (2, 5) # (bağlantı, okuma) saniye
+REMOTE_ASSETS = {
+    "lottie_exam.json": "https://assets5.lottiefiles.com/packages/lf20_42B8LS.json", # Sınav/Kağıt animasyonu
+    "lottie_success.json": "https://assets9.lottiefiles.com/packages/lf20_lk80fpsm.json", # Başarı tiki
+    "odtu_logo.jpg": "https://upload.wikimedia.org/wikipedia/tr/8/80/Ortado%C4%9Fu_Teknik_%C3%9Cniversitesi_logosu.jpg",
+}
+
+def _is_valid_asset(filename, data):
+    # Hata sayfası vb. yanlış içerik önbelleğe yazılmasın
+    if filename.endswith(".json"):
+        try:
+            json.loads(data)
+            return True
+        except ValueError:
+            return False
+    return data.startswith(b"\xff\xd8") # JPEG
+
+def _fetch_asset(filename):
+    try:
+        r = requests.get(REMOTE_ASSETS[filename], timeout=ASSET_TIMEOUT)
+        if r.status_code != 200 or not _is_valid_asset(filename, r.content):
+            return None
+        ASSET_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        tmp_path = ASSET_CACHE_DIR / f"{filename}.tmp"
+        tmp_path.write_bytes(r.content)
+        tmp_path.replace(ASSET_CACHE_DIR / filename)
+        return r.content
+    except Exception:
+        return None
+
+def _refresh_assets(store, filenames):
+    for filename in filenames:
+        data = _fetch_asset(filename)
+        with store["lock"]:
+            if data is not None:
+                store["data"][filename] = (data, time.time())
+                store["failed"].pop(filename, None)
+            else:
+                # İndirilemediyse eldeki kopyayla devam et; hata zamanı ve deneme sayısı tutulur
+                _, attempts = store["failed"].get(filename, (0, 0))
+                store["failed"][filename] = (time.time(), attempts + 1)
+            store["pending"].discard(filename)
+
+def _needs_refresh(store, filename, entry, now):
+    # Çağıran store["lock"]'u tutar. entry: (veri, indirilme zamanı)
+    if filename in store["pending"] or (entry is not None and now - entry[1] <= ASSET_TTL_SECONDS):
+        return False
+    failed_at, attempts = store["failed"].get(filename, (0, 0))
+    return now - failed_at >= min(ASSET_RETRY_SECONDS * 2 ** max(attempts - 1, 0), ASSET_TTL_SECONDS)
+
+@st.cache_resource
+def _asset_store():
+    """Süreç genelinde tek bellek önbelleği; ilk çağrıda eksik/eski dosyaları arka planda indirir."""
+    store = {"data": {}, "pending": set(), "failed": {}, "lock": threading.Lock()}
+    stale = []
+    for filename in REMOTE_ASSETS:
+        cached = ASSET_CACHE_DIR / filename
+        if not cached.exists() or time.time() - cached.stat().st_mtime > ASSET_TTL_SECONDS:
+            stale.append(filename)
+    if stale:
+        store["pending"].update(stale)
+        threading.Thread(target=_refresh_assets, args=(store, stale), daemon=True).start()
+    return store
+
+def load_asset(filename):
+    store = _asset_store()
+    with store["lock"]:
+        entry = store["data"].get(filename)
+    cached = ASSET_CACHE_DIR / filename
+    if entry is None and cached.exists():
+        entry = (cached.read_bytes(), cached.stat().st_mtime)
+        with store["lock"]:
+            entry = store["data"].setdefault(filename, entry)
+    with store["lock"]:
+        if _needs_refresh(store, filename, entry, time.time()):
+            store["pending"].add(filename)
+            threading.Thread(target=_refresh_assets, args=(store, [filename]), daemon=True).start()
+    return entry[0] if entry is not None else None
+
+def load_lottie(filename):
+    data = load_asset(filename)
+    if data is None:
+        return None
+    try:
+        return json.loads(data)
+    except ValueError:
         return None
-    return r.json()
 
-# Animasyon Linkleri
-lottie_exam = load_lottieurl("https://assets5.lottiefiles.com/packages/lf20_42B8LS.json") # Sınav/Kağıt animasyonu
-lottie_success = load_lottieurl("https://assets9.lottiefiles.com/packages/lf20_lk80fpsm.json") # Başarı tiki
+with phase("varlıklar"):
+    lottie_exam = load_lottie("lottie_exam.json")
+    lottie_success = load_lottie("lottie_success.json")
 
 # --- 2. SABİT VERİLER ---
 COMMON_SERVICE_COURSES = ["MATH 119", "MATH 120", "MATH 219", "ENG 101", "ENG 102", "TUR 101", "TUR 102", "CENG 240", "ES 361", "ES 223"]
@@ -63,145 +210,422 @@ TERM2_DEPT = sorted(["MetE 102", "MetE 202", "MetE 204", "MetE 206", "MetE 230",
 TERM1_SERVICE = sorted(["PHYS 105", "CHEM 111"] + COMMON_SERVICE_COURSES)
 TERM2_SERVICE = sorted(["PHYS 106", "CHEM 112"] + COMMON_SERVICE_COURSES)
 ALL_EXAM_TYPES = ["MT1", "MT2", "Final", "Makeup", "Lab Exam"]
+XLSX_MIME = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
 DEFAULT_ROWS_TO_CREATE = ["MT1", "MT2", "Final"]
 DEFAULT_ASSISTANT_NAMES = ["Ali Özalp", "Onur Demircioğlu", "Fatma Saadet Güven", "Tuncay Erdil", "Yavuz Yıldız", "Barkın Bayram", "Duygu İnce", "Ulaş Yaprak", "Servin Çağıl Ulusay", "İrem Topsakal", "Melis Ece Tatar", "Sena Öz", "Rıza Uğur Akbulut", "Olgu Çağan Özonuk", "Gülçehre Duygu Yüksel", "Ayşenur İrfanoğlu"]
 
 # Yeni Eklenen İdari İşler ve Görevler
 EXTRA_DUTIES = ["IT", "E.C.", "Cihaz 1", "Cihaz 2", "Cihaz 3", "Cihaz 4"]
 
-# --- 3. HESAPLAMA MOTORU ---
-def calculate_exam_points(exam_datetime, duration_minutes):
+# --- 3. KALICI DEPOLAMA (SQLite) ---
+# Plan tabloları satır satır (JSON) tutulur; her düzenlemede yalnızca değişen satırlar yazılır.
+# WAL modu sayesinde birden fazla koordinatör aynı planı aynı anda okuyabilir.
+PLAN_DB_PATH = Path(os.environ.get("EXAM_PLAN_DB", Path(__file__).parent / "plan.db"))
+DATE_COLUMNS = ["Tarih", "Başlangıç", "Bitiş"]
+
+@st.cache_resource
+def _plan_db_connection(path):
+    # Süreç başına tek bağlantı: şema kurulumu yalnızca ilk açılışta yapılır. Her yeniden
+    # çalıştırma ayrı bir thread'de olduğundan bağlantı thread'ler arasında kilitle paylaşılır.
+    # Hata önbelleğe alınmaz; açılamayan depolama sonraki çalıştırmada yeniden denenir.
+    conn = sqlite3.connect(path, timeout=5, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("CREATE TABLE IF NOT EXISTS plan_tables (tbl TEXT PRIMARY KEY, columns TEXT NOT NULL, version INTEGER NOT NULL)")
+    conn.execute("CREATE TABLE IF NOT EXISTS plan_rows (tbl TEXT NOT NULL, row_id INTEGER NOT NULL, data TEXT NOT NULL, PRIMARY KEY (tbl, row_id))")
+    conn.commit()
+    return {"conn": conn, "lock": threading.Lock()}
+
+@contextmanager
+def _plan_db():
+    """Paylaşılan bağlantıyı kilit altında verir; depolama yoksa None (uygulama yalnızca oturum belleğiyle çalışır)."""
     try:
-        duration_hours = duration_minutes / 60.0
-        points = duration_hours * 2.5
-        if exam_datetime.weekday() >= 5: points *= 1.5
-        elif exam_datetime.hour >= 17: points *= 1.25
-        return round(points, 2)
-    except: return 0.0
-
-def calculate_initial_loads(assistants_pool, course_loads_df):
+        store = _plan_db_connection(str(PLAN_DB_PATH))
+    except sqlite3.Error:
+        yield None
+        return
+    with store["lock"]:
+        yield store["conn"]
+
+def _json_value(value):
+    if isinstance(value, (pd.Timestamp, datetime, date)):
+        return value.isoformat()
+    if hasattr(value, "item"):
+        return value.item() # numpy sayıları
+    return str(value)
+
+def _rows_payload(tbl, df):
+    return [(tbl, int(row_id), json.dumps(dict(zip(df.columns, values)), default=_json_value, ensure_ascii=False))
+            for row_id, values in zip(df.index, df.itertuples(index=False, name=None))]
+
+def plan_table_versions():
+    with _plan_db() as conn:
+        if conn is None:
+            return {}
+        return dict(conn.execute("SELECT tbl, version FROM plan_tables").fetchall())
+
+def load_plan_table(tbl):
+    """Kayıtlı tabloyu DataFrame olarak döndürür; yoksa None."""
+    with _plan_db() as conn:
+        if conn is None:
+            return None
+        meta = conn.execute("SELECT columns, version FROM plan_tables WHERE tbl = ?", (tbl,)).fetchone()
+        if meta is None:
+            return None
+        rows = conn.execute("SELECT row_id, data FROM plan_rows WHERE tbl = ? ORDER BY row_id", (tbl,)).fetchall()
+    df = pd.DataFrame([json.loads(data) for _, data in rows], index=[row_id for row_id, _ in rows], columns=json.loads(meta[0]))
+    for col in DATE_COLUMNS:
+        if col in df.columns:
+            df[col] = pd.to_datetime(df[col])
+    return df
+
+# Eşzamanlı düzenleme (iyimser kilit): her yazma, tabloyu kilitleyip kayıtlı sürümü
+# oturumun bildiği sürümle ('expected') karşılaştırır. Yazma fonksiyonları
+# (sürüm, güncel_mi) döndürür; güncel_mi False ise araya başka bir oturumun yazması
+# girmiştir ve oturumdaki kopya yeniden yüklenmelidir.
+def _stored_version(conn, tbl):
+    row = conn.execute("SELECT version FROM plan_tables WHERE tbl = ?", (tbl,)).fetchone()
+    return row[0] if row else None
+
+def save_plan_table(tbl, df, expected=None):
     """
-    Ders yüklerini 'course_loads_df' tablosundan çeker.
-    Dersin toplam yükünü, o derse atanmış HER asistana TAM OLARAK ekler (Bölme yok).
+    Tabloyu baştan yazar (ilk kayıt ya da sütun değişikliği). Kayıtlı sürüm 'expected'
+    değilse eski bir kopyadan başkasının satırlarını silmemek için hiçbir şey yazmaz.
     """
-    # Önce tüm asistanların yüklerini sıfırla
-    for a in assistants_pool:
-        a['load'] = 0.0
-        a['course_duties'] = []
-    
-    if course_loads_df is None or course_loads_df.empty:
-        return assistants_pool
-    
-    # Ders Yükleri tablosunu satır satır gez
-    for index, row in course_loads_df.iterrows():
-        try:
-            course_load = float(row.get("Toplam (Saat)", 0))
-        except:
-            course_load = 0.0
-            
-        course_code = row.get("Ders Kodu", "Bilinmeyen")
-
-        if course_load > 0:
-            # Bu derse atanmış asistanları bul
-            assigned_names = []
-            for col in ["Asistan 1", "Asistan 2", "Asistan 3", "Asistan 4", "Asistan 5", "Asistan 6"]:
-                if col in row and row[col] and row[col] != "Yok":
-                    assigned_names.append(row[col])
-            
-            # Her bir atanan asistana yükü ekle (BÖLMEDEN)
-            for name in assigned_names:
-                match = next((a for a in assistants_pool if a['name'] == name), None)
-                if match:
-                    match['load'] += course_load
-                    match['course_duties'].append(f"{course_code} ({int(course_load)}p)")
-    
-    return assistants_pool
+    if not df.index.is_unique:
+        return None
+    with _plan_db() as conn:
+        if conn is None:
+            return None
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            stored = _stored_version(conn, tbl)
+            if stored != expected:
+                return stored, False
+            conn.execute("DELETE FROM plan_rows WHERE tbl = ?", (tbl,))
+            conn.executemany("INSERT INTO plan_rows (tbl, row_id, data) VALUES (?, ?, ?)", _rows_payload(tbl, df))
+            return _bump_plan_version(conn, tbl, df.columns), True
 
-def run_allocation(assistants_pool, exams):
-    schedule_log = []
-    for exam in exams:
-        try:
-            needed = int(exam['needed'])
-            assigned = []
-            exam_dt = exam['datetime_obj']
-            duration = int(exam['duration'])
-            exam_points = calculate_exam_points(exam_dt, duration)
-            
-            # 1. ADIM: Bu dersin önceden atanmış asistanlarını (Ders Yükleri sayfasından) al
-            # Bunlar öncelikli olarak sınavda görev alır.
-            pre_assigned = exam.get('pre_assigned_assistants', [])
-            
-            # Ders asistanlarını ata
-            for name in pre_assigned:
-                if len(assigned) >= needed: break # Kontenjan dolduysa dur (İsteğe göre bu satır kaldırılıp hepsi eklenebilir)
-                
-                match = next((a for a in assistants_pool if name == a['name']), None)
-                if match:
-                    assigned.append(f"{match['name']} (Ders Asistanı)")
-                    match['load'] += exam_points
-                else:
-                    assigned.append(f"{name} (Manuel/Dış)")
-
-            # 2. ADIM: Eğer kontenjan dolmadıysa havuzdan tamamla
-            if len(assigned) < needed:
-                remaining_slots = needed - len(assigned)
-                # Yükü en az olandan sırala
-                assistants_pool.sort(key=lambda x: x['load'])
-                filled = 0
-                for assistant in assistants_pool:
-                    if filled >= remaining_slots: break
-                    
-                    # Zaten görevliyse atla
-                    is_already_assigned = any(assistant['name'] in s for s in assigned)
-                    if not is_already_assigned:
-                        assistant['load'] += exam_points
-                        assigned.append(f"{assistant['name']} (Gözetmen)")
-                        filled += 1
-            
-            schedule_log.append({
-                "Tarih": exam_dt.strftime("%Y-%m-%d"),
-                "Saat": exam_dt.strftime("%H:%M"),
-                "Ders Kodu": exam['code'],
-                "Sınav Türü": exam['name'],
-                "Süre (dk)": duration,
-                "Puan": exam_points,
-                "Görevliler": ", ".join(assigned)
-            })
-        except Exception as e: st.error(f"Hata ({exam['code']}): {str(e)}")
-    return schedule_log, assistants_pool
+def _bump_plan_version(conn, tbl, columns):
+    conn.execute(
+        "INSERT INTO plan_tables (tbl, columns, version) VALUES (?, ?, 1) "
+        "ON CONFLICT(tbl) DO UPDATE SET columns = excluded.columns, version = version + 1",
+        (tbl, json.dumps(list(columns), ensure_ascii=False)))
+    return conn.execute("SELECT version FROM plan_tables WHERE tbl = ?", (tbl,)).fetchone()[0]
+
+def diff_frame_rows(old_df, new_df):
+    """
+    İki tablo arasındaki farkı satır bazında bulur.
+    (değişen/eklenen satırlar, silinen satır indeksleri) döndürür; karşılaştırılamıyorsa None.
+    """
+    if old_df is None or list(old_df.columns) != list(new_df.columns) or not (old_df.index.is_unique and new_df.index.is_unique):
+        return None
+    common = new_df.index.intersection(old_df.index)
+    old_part = old_df.loc[common]
+    new_part = new_df.loc[common]
+    try:
+        differs = (old_part != new_part) & ~(old_part.isna() & new_part.isna())
+    except (TypeError, ValueError):
+        return None
+    changed = common[differs.any(axis=1).to_numpy()].append(new_df.index.difference(old_df.index))
+    deleted = old_df.index.difference(new_df.index)
+    return new_df.loc[changed], list(deleted)
+
+def write_plan_rows(tbl, upserts, deleted=(), expected=None):
+    """Verilen satırları yazar, silinenleri kaldırır. (yeni sürüm, güncel_mi) döndürür."""
+    if upserts.empty and not deleted:
+        return None
+    with _plan_db() as conn:
+        if conn is None:
+            return None
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            current = _stored_version(conn, tbl) == expected
+            conn.executemany("INSERT OR REPLACE INTO plan_rows (tbl, row_id, data) VALUES (?, ?, ?)", _rows_payload(tbl, upserts))
+            conn.executemany("DELETE FROM plan_rows WHERE tbl = ? AND row_id = ?", [(tbl, int(i)) for i in deleted])
+            return _bump_plan_version(conn, tbl, upserts.columns), current
+
+def write_plan_diff(tbl, old_df, new_df, expected=None):
+    """Yalnızca değişen satırları yazar. (yeni sürüm, güncel_mi) döndürür."""
+    diff = diff_frame_rows(old_df, new_df)
+    if diff is None:
+        return save_plan_table(tbl, new_df, expected)
+    upserts, deleted = diff
+    return write_plan_rows(tbl, upserts, deleted, expected)
 
 # --- 4. STATE YÖNETİMİ ---
-if 'assistants_db' not in st.session_state:
-    data = [{"name": name} for name in DEFAULT_ASSISTANT_NAMES]
-    st.session_state.assistants_db = pd.DataFrame(data)
+def _plan_slot(tbl):
+    # Tablo adı -> (session_state içindeki kap, anahtar)
+    if tbl == "assistants": return st.session_state, "assistants_db"
+    if tbl == "course_loads": return st.session_state, "course_load_data"
+    if tbl == "unavailability": return st.session_state, "unavailability_db"
+    kind, semester = tbl.split(":", 1)
+    return (st.session_state.semester_data_dept if kind == "dept" else st.session_state.semester_data_service), semester
+
+# Paylaşılan tablolar: kayıtlı plan (ya da varsayılan şablon) süreç başına sürüm başına
+# bir kez kurulur ve tüm oturumlar aynı veriyi görür. Oturumlara sığ kopya verilir;
+# pandas copy-on-write ile (pandas>=3'te her zaman açık) bir oturum yalnızca düzenlediği
+# sütun bloklarını kopyalar.
+# Paylaşılan tablo hiçbir zaman doğrudan değiştirilmez.
+@st.cache_resource
+def _shared_plan_tables():
+    return {"lock": threading.Lock(), "tables": {}}
+
+def shared_plan_table(tbl, version, build_default):
+    """Tablonun süreç genelindeki salt-okunur kopyası; (tablo, sürüm) döndürür."""
+    shared = _shared_plan_tables()
+    with shared["lock"]:
+        cached = shared["tables"].get(tbl)
+        # Sürüm bilinmiyorsa (tablo bu çalıştırmadan sonra oluşturuldu ya da depolama yok) önbellekteki geçerlidir
+        if cached is not None and (version is None or cached[1] == version):
+            return cached
+        df = load_plan_table(tbl)
+        if df is None:
+            df = build_default()
+            saved = save_plan_table(tbl, df)
+            version = saved[0] if saved else None
+            if saved and not saved[1]:
+                # Tabloyu araya giren başka bir süreç oluşturdu
+                df = load_plan_table(tbl)
+        shared["tables"][tbl] = (df, version)
+        return df, version
+
+def use_plan_table(tbl, build_default):
+    """Tabloyu oturuma yükler: önce kayıtlı plandan, yoksa varsayılanı oluşturup kaydeder."""
+    container, key = _plan_slot(tbl)
+    if key in container:
+        return
+    df, version = shared_plan_table(tbl, st.session_state.plan_versions_remote.get(tbl), build_default)
+    container[key] = df.copy(deep=False)
+    st.session_state.plan_versions[tbl] = version
+
+def _column_buffers(series):
+    # Sütunun bellek bloklarının adresleri (Arrow metinleri birden fazla tampon kullanır)
+    values = series.array
+    if hasattr(values, "__arrow_array__"):
+        return {buf.address for chunk in values.__arrow_array__().chunks for buf in chunk.buffers() if buf is not None}
+    return {series.to_numpy(copy=False).__array_interface__["data"][0]}
+
+def session_table_bytes():
+    """
+    Oturumdaki tabloların paylaşılan tablolarla ortak olmayan sütunlarının bellek kullanımı
+    (bayt). Düzenlenmemiş tablolar 0, düzenlenenler yalnızca kopyalanan sütunlar kadar tutar.
+    """
+    shared = _shared_plan_tables()
+    with shared["lock"]:
+        templates = [df for df, _ in shared["tables"].values()]
+    seen = set()
+    for df in templates:
+        for col in df.columns:
+            seen |= _column_buffers(df[col])
+    frames = [st.session_state.get("assistants_db"), st.session_state.get("course_load_data")]
+    frames += list(st.session_state.semester_data_dept.values()) + list(st.session_state.semester_data_service.values())
+    frames += [entry["base"] for entry in st.session_state.editor_bases.values()]
+    total = 0
+    for df in frames:
+        if df is None:
+            continue
+        for col in df.columns:
+            buffers = _column_buffers(df[col])
+            if not buffers <= seen:
+                total += int(df[col].memory_usage(deep=True, index=False))
+                seen |= buffers
+    return total
+
+def shared_table_bytes():
+    shared = _shared_plan_tables()
+    with shared["lock"]:
+        templates = [df for df, _ in shared["tables"].values()]
+    return sum(int(df.memory_usage(deep=True, index=False).sum()) for df in templates)
+
+# Oturum başına bellek: her çalıştırmada güncellenir, geliştirici panelinde izlenir
+SESSION_MEMORY_TTL = 3600 # sn; bu süre güncellenmeyen oturumlar kapanmış sayılır
+
+@st.cache_resource
+def _session_memory():
+    return {"lock": threading.Lock(), "sessions": {}}
+
+def record_session_memory():
+    registry = _session_memory()
+    now = time.time()
+    session_id = st.session_state.setdefault("session_id", os.urandom(8).hex())
+    with registry["lock"]:
+        registry["sessions"][session_id] = (session_table_bytes(), now)
+        for sid, (_, seen_at) in list(registry["sessions"].items()):
+            if now - seen_at > SESSION_MEMORY_TTL:
+                del registry["sessions"][sid]
+        return session_id, dict(registry["sessions"])
+
+def reload_plan_table(tbl):
+    """Oturumdaki kopyayı kayıtlı planın güncel haliyle değiştirir."""
+    container, key = _plan_slot(tbl)
+    df, version = shared_plan_table(tbl, plan_table_versions().get(tbl), lambda: container[key])
+    container[key] = df.copy(deep=False)
+    st.session_state.plan_versions[tbl] = version
+
+def record_plan_write(tbl, result):
+    """Yazma sonucunu işler: araya başka bir yazma girdiyse tabloyu yeniden yükler."""
+    if result is None:
+        return
+    version, current = result
+    if current:
+        st.session_state.plan_versions[tbl] = version
+    else:
+        reload_plan_table(tbl)
+        st.toast("Bu tablo başka bir oturumda da değiştirildi; güncel hali yüklendi. Son değişikliğinizi kontrol edin.", icon="⚠️")
+
+def persist_plan_edit(tbl, new_df):
+    """Oturumdaki tabloyu günceller ve yalnızca değişen satırları veritabanına yazar."""
+    container, key = _plan_slot(tbl)
+    result = write_plan_diff(tbl, container.get(key), new_df, st.session_state.plan_versions.get(tbl))
+    container[key] = new_df
+    record_plan_write(tbl, result)
+
+# Editörler: her tablo, değişmeyen bir 'taban' tablo ile çizilir. Editörün biriken
+# farkı (edited_rows) geri çağrıda oturumdaki tabloya hücre hücre uygulanır ve yalnızca
+# değişen satırlar kaydedilir. Editörler fragment içinde olduğundan düzenleme tüm
+# sayfayı yeniden çalıştırmaz.
+# Editör bir çalıştırmada çizilmezse (sayfa ya da dönem değişince) Streamlit onun
+# durumunu siler; geri dönüldüğünde edited_rows boş başlar. Tabana uygulanmış
+# düzenlemeler varsa taban çalışma tablosundan yeniden kurulur, yoksa editör eski
+# değerleri gösterir ve sonraki düzenleme onları tabandaki değere geri alırdı.
+def editor_base(tbl, key_prefix, prepare=None):
+    """
+    Editöre verilecek taban tabloyu ve editör anahtarını ("widget_key") döndürür;
+    tablo dışarıdan değiştiyse ya da editör durumu kaybolduysa yeniden kurar.
+    """
+    container, key = _plan_slot(tbl)
+    entry = st.session_state.editor_bases.get(tbl)
+    lost_edits = entry is not None and entry["applied"] and entry["widget_key"] not in st.session_state
+    if entry is None or lost_edits or entry["working"] is not container[key]:
+        base = prepare(container[key]) if prepare else container[key]
+        # Sığ kopya: çalışma tablosu tabanla ortak başlar, düzenlenen sütunlar ayrılır
+        container[key] = base.copy(deep=False)
+        version = entry["version"] + 1 if entry else 0
+        entry = {"base": base, "working": container[key], "applied": {},
+                 "version": version, "widget_key": f"{key_prefix}_{version}"}
+        st.session_state.editor_bases[tbl] = entry
+    return entry
+
+def _cell_value(df, col, value):
+    # Editör tarihleri metin olarak gönderir
+    if value is not None and pd.api.types.is_datetime64_any_dtype(df[col].dtype):
+        return pd.to_datetime(value)
+    return value
+
+def _set_cell(df, label, col, value):
+    value = _cell_value(df, col, value)
+    try:
+        df.at[label, col] = value
+    except (TypeError, ValueError):
+        df[col] = df[col].astype(object)
+        df.at[label, col] = value
+
+@profiled
+def apply_editor_delta(tbl, widget_key):
+    """data_editor geri çağrısı: yalnızca son düzenlemede değişen hücreleri uygular ve kaydeder."""
+    entry = st.session_state.editor_bases[tbl]
+    delta = st.session_state[widget_key]
+    base = entry["base"]
+    container, key = _plan_slot(tbl)
+
+    if delta.get("added_rows") or delta.get("deleted_rows"):
+        # Satır eklendi/silindi: taban + tüm farkla tabloyu yeniden kur (seyrek işlem)
+        new_df = base.copy(deep=False)
+        for pos, cells in delta.get("edited_rows", {}).items():
+            for col, value in cells.items():
+                _set_cell(new_df, base.index[int(pos)], col, value)
+        new_df = new_df.drop(index=[base.index[int(pos)] for pos in delta.get("deleted_rows", [])])
+        next_label = int(base.index.max()) + 1 if len(base.index) else 0
+        for offset, row in enumerate(delta.get("added_rows", [])):
+            new_df.loc[next_label + offset] = {col: _cell_value(new_df, col, row.get(col)) for col in new_df.columns}
+        # Boş hücreli satır eklemek tarih sütunlarını object'e çevirebilir
+        for col in base.columns:
+            if pd.api.types.is_datetime64_any_dtype(base[col].dtype) and not pd.api.types.is_datetime64_any_dtype(new_df[col].dtype):
+                new_df[col] = pd.to_datetime(new_df[col])
+        persist_plan_edit(tbl, new_df)
+        return
+
+    working = entry["working"]
+    applied = entry["applied"]
+    edited = {int(pos): cells for pos, cells in delta.get("edited_rows", {}).items()}
+    changes = {}
+    for pos in set(applied) | set(edited):
+        label = base.index[pos]
+        before, after = applied.get(pos, {}), edited.get(pos, {})
+        cells = {col: value for col, value in after.items() if col not in before or before[col] != value}
+        # Geri alınan hücreler tabandaki değere döner
+        cells.update({col: base.at[label, col] for col in before if col not in after})
+        if cells:
+            changes[label] = cells
+    touched = list(changes)
+    previous = working.loc[touched] if tbl == "course_loads" else None
+    for label, cells in changes.items():
+        for col, value in cells.items():
+            _set_cell(working, label, col, value)
+    entry["applied"] = {pos: dict(cells) for pos, cells in edited.items()}
+    if previous is not None and refill_course_totals(working, previous):
+        # Editör yalnızca kendi düzenlemelerini gösterir; hesaplanan Toplam'ın görünmesi
+        # için tablo değişmiş sayılır ve editör yeni tabanla yeniden kurulur
+        working = container[key] = working.copy(deep=False)
+    record_plan_write(tbl, write_plan_rows(tbl, working.loc[touched], expected=st.session_state.plan_versions.get(tbl)))
+
+@profiled
+def set_active_flags(tbls, value):
+    for tbl in tbls:
+        container, key = _plan_slot(tbl)
+        persist_plan_edit(tbl, container[key].assign(Aktif=value))
+
+if 'plan_versions' not in st.session_state: st.session_state.plan_versions = {}
+if 'editor_bases' not in st.session_state: st.session_state.editor_bases = {}
+if 'allocation_cache' not in st.session_state: st.session_state.allocation_cache = new_allocation_cache()
 if 'semester_data_dept' not in st.session_state: st.session_state.semester_data_dept = {}
 if 'semester_data_service' not in st.session_state: st.session_state.semester_data_service = {}
 
+# Başka bir koordinatörün değiştirdiği tabloları yeniden yükle
+with phase("sürüm kontrolü"):
+    st.session_state.plan_versions_remote = plan_table_versions()
+for tbl, version in list(st.session_state.plan_versions.items()):
+    remote = st.session_state.plan_versions_remote.get(tbl)
+    if remote is not None and remote != version:
+        container, key = _plan_slot(tbl)
+        container.pop(key, None)
+        del st.session_state.plan_versions[tbl]
+
+def default_assistants_df():
+    data = [{"name": name} for name in DEFAULT_ASSISTANT_NAMES]
+    return pd.DataFrame(data)
+
+use_plan_table("assistants", default_assistants_df)
+
 # Ders Yükleri State'i
-if 'course_load_data' not in st.session_state:
-    all_dept_courses = sorted(list(set(TERM1_DEPT + TERM2_DEPT)))
+def default_course_loads_df():
+    all_dept_courses = sorted(set(TERM1_DEPT + TERM2_DEPT))
     all_items = all_dept_courses + EXTRA_DUTIES
-    
-    load_data = []
-    for item in all_items:
-        load_data.append({
-            "Ders Kodu": item,
-            "Recitation": 0,
-            "Objection": 0,
-            "Quiz": 0,
-            "Ödevler": 0,
-            "Toplam (Saat)": 0, # Varsayılan
-            "Asistan 1": "Yok",
-            "Asistan 2": "Yok",
-            "Asistan 3": "Yok",
-            "Asistan 4": "Yok",
-            "Asistan 5": "Yok",
-            "Asistan 6": "Yok"
-        })
-    st.session_state.course_load_data = pd.DataFrame(load_data)
+    zeros = [0] * len(all_items)
+    data = {"Ders Kodu": all_items, "Recitation": zeros, "Objection": zeros, "Quiz": zeros, "Ödevler": zeros,
+            "Toplam (Saat)": zeros} # Varsayılan
+    data.update({col: ["Yok"] * len(all_items) for col in ASSISTANT_COLUMNS})
+    return pd.DataFrame(data)
+
+use_plan_table("course_loads", default_course_loads_df)
+use_plan_table("unavailability", empty_unavailability_df)
+
+# Dönem Sınav Tabloları (seçilen dönem açıldığında yüklenir)
+def default_exam_df(courses, needed):
+    data = []
+    for course in courses:
+        for exam_type in DEFAULT_ROWS_TO_CREATE:
+            # ASİSTAN SÜTUNLARI YOK, YÜK YOK
+            data.append({
+                "Aktif": False, "Ders Kodu": course, "Sınav Türü": exam_type,
+                "Tarih": pd.to_datetime("2025-04-15"), "Saat": "17:40", "Süre (dk)": 120, "İhtiyaç (Kişi)": needed
+            })
+    return pd.DataFrame(data)
 
 # --- 5. SIDEBAR ---
-st.sidebar.image("https://upload.wikimedia.org/wikipedia/tr/8/80/Ortado%C4%9Fu_Teknik_%C3%9Cniversitesi_logosu.jpg", width=140)
+# Yerel kopya yoksa logo tarayıcı tarafından doğrudan indirilir (sunucu beklemez)
+st.sidebar.image(load_asset("odtu_logo.jpg") or REMOTE_ASSETS["odtu_logo.jpg"], width=140)
 st.sidebar.title("Sınav Koordinasyon")
 st.sidebar.info("ODTÜ Metalurji ve Malzeme Müh.")
 
@@ -211,53 +635,143 @@ menu_selection = st.sidebar.radio(
 )
 
 st.sidebar.divider()
-with st.sidebar.expander("👥 Asistan Listesi", expanded=False):
-    edited_assistants = st.data_editor(
-        st.session_state.assistants_db, num_rows="dynamic", key="assistant_editor", 
-        column_config={"name": st.column_config.TextColumn("Ad Soyad", required=True)}
+@st.fragment
+@profiled
+def assistant_editor():
+    entry = editor_base("assistants", "assistant_editor")
+    widget_key = entry["widget_key"]
+    st.data_editor(
+        entry["base"], num_rows="dynamic", key=widget_key,
+        column_config={"name": st.column_config.TextColumn("Ad Soyad", required=True)},
+        on_change=apply_editor_delta, args=("assistants", widget_key)
     )
-    if not edited_assistants.equals(st.session_state.assistants_db):
-        st.session_state.assistants_db = edited_assistants
-        st.rerun()
+
+with st.sidebar.expander("👥 Asistan Listesi", expanded=False):
+    assistant_editor()
 
 assistant_options = ["Yok"] + st.session_state.assistants_db["name"].tolist()
 
+# Müsaitlik: her satır bir kuraldır (ör. konferans haftası ya da her salı 13:00-17:00).
+# Dağıtımda kurallar dönemin zaman dilimleri üzerinde bit kümelerine derlenir.
+UPLOAD_EXTENSIONS = ["csv", "xlsx", "xls"]
+
+def import_unavailability(widget_key):
+    """Dosyadaki kuralları tabloya ekler (aynı satırlar tekrar eklenmez)."""
+    upload = st.session_state.get(widget_key)
+    if upload is None:
+        return
+    try:
+        df = pd.read_csv(upload) if upload.name.lower().endswith(".csv") else pd.read_excel(upload)
+    except Exception as e:
+        st.session_state.unavailability_import = ("error", f"Dosya okunamadı: {e}")
+        return
+    if "Asistan" not in df.columns:
+        st.session_state.unavailability_import = ("error", "Dosyada 'Asistan' sütunu bulunamadı.")
+        return
+    current = st.session_state.unavailability_db
+    rows = df.reindex(columns=UNAVAILABILITY_COLUMNS)
+    for col in ("Başlangıç", "Bitiş"):
+        rows[col] = pd.to_datetime(rows[col], errors="coerce")
+    for col in ("Saat Başlangıç", "Saat Bitiş"):
+        # Excel saat hücreleri time nesnesi olarak gelir
+        rows[col] = rows[col].map(lambda v: v.strftime("%H:%M") if hasattr(v, "strftime") else v)
+    start = int(current.index.max()) + 1 if len(current.index) else 0
+    rows.index = range(start, start + len(rows))
+    combined = pd.concat([current, rows])
+    combined = combined[~combined.duplicated(keep="first")]
+    persist_plan_edit("unavailability", combined)
+    st.session_state.unavailability_import = ("success", f"{len(combined) - len(current)} kural eklendi.")
+
+def prepare_unavailability(df):
+    # Kayıttan boş gelen sütunlar editörün beklediği tiplere çevrilir
+    df = df.copy(deep=False)
+    for col in UNAVAILABILITY_COLUMNS:
+        if col in ("Başlangıç", "Bitiş"):
+            if not pd.api.types.is_datetime64_any_dtype(df[col].dtype):
+                df[col] = pd.to_datetime(df[col], errors="coerce")
+        elif not pd.api.types.is_string_dtype(df[col].dtype):
+            # Tamamı boş metin sütunları kayıttan float olarak döner
+            df[col] = df[col].astype(object).where(df[col].notna(), None)
+    return df
+
+@st.fragment
+@profiled
+def unavailability_editor():
+    entry = editor_base("unavailability", "unavailability_editor", prepare_unavailability)
+    widget_key = entry["widget_key"]
+    st.data_editor(
+        entry["base"], num_rows="dynamic", key=widget_key,
+        column_config={
+            "Asistan": st.column_config.SelectboxColumn("Asistan", options=assistant_options[1:], required=True),
+            "Başlangıç": st.column_config.DateColumn("Başlangıç", format="YYYY-MM-DD", help="Boşsa dönem başı"),
+            "Bitiş": st.column_config.DateColumn("Bitiş", format="YYYY-MM-DD", help="Boşsa dönem sonu"),
+            "Gün": st.column_config.SelectboxColumn("Gün", options=[EVERY_DAY] + list(WEEKDAYS), default=EVERY_DAY),
+            "Saat Başlangıç": st.column_config.TextColumn("Saat (Başl.)", help="SS:DD; boşsa bütün gün"),
+            "Saat Bitiş": st.column_config.TextColumn("Saat (Bitiş)", help="SS:DD; boşsa bütün gün"),
+            "Açıklama": st.column_config.TextColumn("Açıklama")
+        },
+        on_change=apply_editor_delta, args=("unavailability", widget_key)
+    )
+
+with st.sidebar.expander("🗓️ Müsaitlik Takvimi", expanded=False):
+    st.caption("Asistanın sınav görevi alamayacağı zamanlar. Boş tarih tüm dönem, boş saat bütün gün demektir.")
+    unavailability_editor()
+    st.file_uploader("Dosyadan içe aktar (CSV/XLSX)", type=UPLOAD_EXTENSIONS, key="unavailability_upload",
+                     on_change=import_unavailability, args=("unavailability_upload",),
+                     help="Sütunlar: " + ", ".join(UNAVAILABILITY_COLUMNS))
+    if "unavailability_import" in st.session_state:
+        kind, message = st.session_state.pop("unavailability_import")
+        (st.error if kind == "error" else st.success)(message)
+
 st.sidebar.markdown("---")
 st.sidebar.caption("🛠 Developed by **METE Exam Coord. and IT**")
 
 # --- 6. ANA EKRAN MANTIĞI ---
-
-if menu_selection == "Ders Yükleri":
-    # --- YENİ EKRAN: DERS YÜKLERİ ---
-    col1, col2 = st.columns([3, 1])
-    with col1:
-        st.title("Ders ve İdari Görev Yükleri")
-        st.markdown("*Ders asistanlarını buradan atayın. 'Toplam' sütununu manuel değiştirebilirsiniz.*")
-    with col2:
-         if lottie_exam: st_lottie(lottie_exam, height=80, key="load_anim")
-
+def prepare_course_loads(df):
+    df = df.copy(deep=False) # paylaşılan tablo değişmez; yalnızca yazılan sütunlar kopyalanır
     # Veri setini hazırlama (Eksik sütun kontrolü)
-    for col in ["Asistan 1", "Asistan 2", "Asistan 3", "Asistan 4", "Asistan 5", "Asistan 6"]:
-        if col not in st.session_state.course_load_data.columns:
-            st.session_state.course_load_data[col] = "Yok"
-    if "Toplam (Saat)" not in st.session_state.course_load_data.columns:
-        st.session_state.course_load_data["Toplam (Saat)"] = 0
+    for col in ASSISTANT_COLUMNS:
+        if col not in df.columns:
+            df[col] = "Yok"
+    if "Toplam (Saat)" not in df.columns:
+        df["Toplam (Saat)"] = 0
 
-    display_df = st.session_state.course_load_data.copy()
-    
     # Otomatik Toplam Hesaplama (Kullanıcıya kolaylık olsun diye, ama manuel değiştirirse ezmeyeceğiz)
-    # Sadece 0 ise hesapla, değilse kullanıcının girdiği kalsın mantığı biraz karmaşık olur,
-    # basitçe: her zaman formül toplamını bir değişkene alıp, kullanıcı değiştirmiş mi kontrolü st.data_editor halleder.
-    # Ancak burada basitlik adına: İlk açılışta hesapla, sonra editörden geleni al.
-    
+    # Tablo editöre verilmeden önce bir kez hesaplanır; sonraki düzenlemelerde
+    # refill_course_totals yalnızca değişen satırları günceller.
     # Kullanıcıya yardımcı olmak için: Eğer Toplam 0 ise, diğerlerinin toplamını öner.
-    display_df["_AutoSum"] = display_df["Recitation"] + display_df["Objection"] + display_df["Quiz"] + display_df["Ödevler"]
-    # Eğer Toplam (Saat) 0 ise _AutoSum'ı oraya yaz (Başlangıç değeri olarak)
-    display_df.loc[display_df["Toplam (Saat)"] == 0, "Toplam (Saat)"] = display_df["_AutoSum"]
-    display_df.drop(columns=["_AutoSum"], inplace=True)
+    auto_sum = course_auto_total(df)
+    # Eğer Toplam (Saat) 0 ise otomatik toplamı oraya yaz (Başlangıç değeri olarak)
+    empty_total = df["Toplam (Saat)"] == 0
+    if empty_total.any():
+        df.loc[empty_total, "Toplam (Saat)"] = auto_sum
+    return df
 
-    edited_loads = st.data_editor(
-        display_df,
+def course_auto_total(df):
+    return df["Recitation"] + df["Objection"] + df["Quiz"] + df["Ödevler"]
+
+def refill_course_totals(df, previous):
+    """
+    Düzenlenen satırlarda ('previous': düzenlemeden önceki halleri) Toplam 0 ise ya da
+    otomatik doldurulmuş (eski görev saatlerinin toplamına eşit) ve bu düzenlemede elle
+    değiştirilmemişse yeni toplamı yazar. Toplamı değişen satır olup olmadığını döndürür.
+    """
+    rows = df.loc[previous.index]
+    old_total, new_total = previous["Toplam (Saat)"], rows["Toplam (Saat)"]
+    new_auto = course_auto_total(rows)
+    auto_filled = (new_total == old_total) & (old_total == course_auto_total(previous))
+    refill = ((new_total == 0) | auto_filled) & new_auto.notna() & (new_total != new_auto)
+    for label in refill.index[refill]:
+        _set_cell(df, label, "Toplam (Saat)", new_auto[label])
+    return bool(refill.any())
+
+@st.fragment
+@profiled
+def edit_course_loads():
+    entry = editor_base("course_loads", "course_load_editor", prepare_course_loads)
+    widget_key = entry["widget_key"]
+    st.data_editor(
+        entry["base"],
         column_config={
             "Ders Kodu": st.column_config.TextColumn("Ders / Görev", disabled=True),
             "Recitation": st.column_config.NumberColumn("Recitation", min_value=0, step=1),
@@ -277,12 +791,306 @@ if menu_selection == "Ders Yükleri":
         hide_index=True,
         use_container_width=True,
         height=600,
-        key="course_load_editor"
+        key=widget_key,
+        on_change=apply_editor_delta, args=("course_loads", widget_key)
+    )
+
+EXAM_COLUMN_CONFIG = {
+    "Aktif": st.column_config.CheckboxColumn("Seç", width="small"),
+    "Ders Kodu": st.column_config.TextColumn("Ders", disabled=True),
+    "Sınav Türü": st.column_config.SelectboxColumn("Tür", options=ALL_EXAM_TYPES, required=True),
+    "Tarih": st.column_config.DateColumn("Tarih", format="YYYY-MM-DD", required=True),
+    "Saat": st.column_config.TextColumn("Saat", default="17:40", required=True),
+    "Süre (dk)": st.column_config.NumberColumn("Süre", min_value=15, max_value=300, step=15),
+    "İhtiyaç (Kişi)": st.column_config.NumberColumn("Kişi", min_value=1, max_value=20, step=1),
+    # Asistan sütunları kaldırıldı
+}
+
+@st.fragment
+@profiled
+def edit_exam_table(tbl, height):
+    entry = editor_base(tbl, f"editor_{tbl}")
+    widget_key = entry["widget_key"]
+    st.data_editor(
+        entry["base"], column_config=EXAM_COLUMN_CONFIG,
+        hide_index=True, use_container_width=True, height=height, key=widget_key,
+        on_change=apply_editor_delta, args=(tbl, widget_key)
+    )
+
+@st.fragment
+@profiled
+def assistant_schedule_view(schedule, assignments, names):
+    # Fragment: asistan seçimi yalnızca bu bölümü yeniden çizer, sonuç ekranı kaybolmaz
+    name = st.selectbox("Asistan", names, key="schedule_view_assistant")
+    duties = assistant_duties(schedule, assignments, name)
+    st.caption(f"{len(duties)} sınav görevi, toplam {duties['Puan'].sum():.2f} puan")
+    st.dataframe(duties, hide_index=True, use_container_width=True)
+
+# Sonuç ekranı: grafik ve ısı haritası varsayılan olarak en yüklü RESULT_TOP_N asistanı
+# gösterir; tablolar sayfalanır, tarayıcıya yalnızca seçili sayfa gönderilir.
+RESULT_TOP_N = 30
+TABLE_PAGE_SIZE = 50
+HISTOGRAM_BINS = 20
+LOAD_COMPONENTS = ["Ders Yükü", "Ders Asistanı (Sınav)", "Gözetmen (Sınav)"]
+
+def build_result_view(key, schedule, final_pool, conflicts, assignments, total_exams):
+    """Bir dağıtım sonucunun ekranda gösterilen tüm özetlerini bir kez hesaplar."""
+    df_final = pd.DataFrame(final_pool).sort_values("load", ascending=False)
+    pool_by_load = [final_pool[i] for i in df_final.index]
+    duties = df_final["course_duties"].apply(lambda x: ", ".join(x) if x else "-")
+    loads = df_final.assign(**{"Ders Sorumlulukları": duties})[["name", "load", "Ders Sorumlulukları"]]
+    # Histogram sunucuda hesaplanır; grafiğe yalnızca aralık başına sayılar gider
+    bins = pd.cut(df_final["load"], bins=min(HISTOGRAM_BINS, max(df_final["load"].nunique(), 1)))
+    histogram = bins.value_counts(sort=False).rename_axis("Yük Aralığı").reset_index(name="Asistan Sayısı")
+    histogram["Yük Aralığı"] = histogram["Yük Aralığı"].map(lambda b: f"{b.left:.1f} - {b.right:.1f}")
+    names = df_final["name"].tolist()
+    return {
+        "key": key,
+        "created": datetime.now(),
+        "schedule": schedule,
+        "assignments": assignments,
+        "pool_by_load": pool_by_load,
+        "names": names,
+        "total_exams": total_exams,
+        "max_load": df_final.iloc[0]["load"],
+        "max_name": df_final.iloc[0]["name"],
+        "avg_load": round(df_final["load"].mean(), 1),
+        "loads": loads.reset_index(drop=True),
+        # Yük bileşenleri atama tablosundan hesaplanır (ders yükü + role göre sınav puanları)
+        "breakdown": load_breakdown(pool_by_load, assignments),
+        "histogram": histogram,
+        "schedule_df": schedule_frame(schedule, assignments),
+        "heatmap": calendar_matrix(schedule, assignments).reindex(list(dict.fromkeys(names)), fill_value=0.0),
+        "conflicts": pd.DataFrame(conflicts)
+    }
+
+def paginated_dataframe(df, key, page_size=TABLE_PAGE_SIZE):
+    """Tabloyu sayfa sayfa gösterir."""
+    pages = max(1, -(-len(df) // page_size))
+    page = st.number_input(f"Sayfa (toplam {pages})", min_value=1, max_value=pages, value=1, key=key) if pages > 1 else 1
+    start = (page - 1) * page_size
+    st.dataframe(df.iloc[start:start + page_size], hide_index=True, use_container_width=True)
+    if pages > 1:
+        st.caption(f"{len(df)} satırdan {start + 1}-{min(start + page_size, len(df))} arası gösteriliyor")
+
+def top_n_slider(total, label, key):
+    if total <= RESULT_TOP_N:
+        return total
+    return st.slider(label, min_value=5, max_value=total, value=RESULT_TOP_N, key=key)
+
+@st.fragment
+@profiled
+def results_panel(view):
+    # Fragment: grafik modu, sayfa ve asistan seçimi yalnızca sonuç ekranını yeniden çizer
+    suffix = view["key"][:8] # yeni sonuçta sayfa/seçimler sıfırlanır
+    k1, k2, k3 = st.columns(3)
+    k1.metric("Toplam Sınav", view["total_exams"], border=True)
+    k2.metric("En Yüksek Yük", f"{view['max_load']}p", f"{view['max_name']}", delta_color="inverse", border=True)
+    k3.metric("Ortalama Yük", f"{view['avg_load']}p", border=True)
+    st.caption(f"Sonuç {view['created']:%H:%M:%S} tarihli dağıtıma aittir; tablolar değiştiyse dağıtımı yeniden başlatın.")
+
+    conflicts = view["conflicts"]
+    tab1, tab2, tab4, tab5, tab3 = st.tabs(["📊 Yük Analizi", "📅 Sınav Programı", "👤 Asistan Programı", "🗓️ Görev Takvimi",
+                                            f"⚠️ Çakışmalar ({len(conflicts)})"])
+
+    with tab1, phase("grafik"):
+        breakdown = view["breakdown"]
+        chart_mode = "top"
+        if len(breakdown) > RESULT_TOP_N:
+            chart_mode = st.radio("Grafik", ["top", "histogram"], horizontal=True, key=f"result_chart_{suffix}",
+                                  format_func={"top": "En Yüklü Asistanlar", "histogram": "Yük Dağılımı (Histogram)"}.get)
+        if chart_mode == "histogram":
+            fig = px.bar(view["histogram"], x="Yük Aralığı", y="Asistan Sayısı", color_discrete_sequence=['#E31937'],
+                         title="Yük Dağılımı")
+        else:
+            top_n = top_n_slider(len(breakdown), "Gösterilecek asistan sayısı", f"result_top_n_{suffix}")
+            fig = px.bar(
+                breakdown.head(top_n), x='name', y=LOAD_COMPONENTS,
+                color_discrete_sequence=['#999999', '#ff9999', '#E31937'],
+                labels={'name': 'Asistan', 'value': 'Toplam Puan', 'variable': 'Bileşen'},
+                title="Asistan Yük Dağılımı"
+            )
+            fig.update_layout(xaxis_tickangle=-45)
+        st.plotly_chart(fig, use_container_width=True)
+        paginated_dataframe(view["loads"], f"result_loads_page_{suffix}")
+
+    with tab2, phase("program tablosu"):
+        paginated_dataframe(view["schedule_df"], f"result_schedule_page_{suffix}")
+        # Dosya yalnızca indirme tıklandığında (ayrı thread'de, akış modunda) üretilir
+        st.download_button(
+            "📥 Excel Olarak İndir",
+            lambda: write_schedule_xlsx(io.BytesIO(), view["schedule"], view["assignments"], view["pool_by_load"]).getvalue(),
+            "ODTU_MetE_Sinav_Programi.xlsx", XLSX_MIME, type="primary", on_click="ignore",
+            help="Sınav programı, yük özeti ve her asistan için ayrı bir sayfa")
+
+    with tab4:
+        assistant_schedule_view(view["schedule"], view["assignments"], view["names"])
+
+    with tab5, phase("ısı haritası"):
+        heatmap = view["heatmap"]
+        if heatmap.empty or heatmap.shape[1] == 0:
+            st.info("Hiç sınav görevi atanmadı.")
+        else:
+            rows = top_n_slider(len(heatmap), "Gösterilecek asistan sayısı (en yüklüden)", f"result_heatmap_n_{suffix}")
+            fig = px.imshow(heatmap.head(rows), aspect="auto", color_continuous_scale="Reds",
+                            labels={"x": "Tarih", "y": "Asistan", "color": "Puan"}, title="Günlük Sınav Görevi Puanı")
+            fig.update_layout(height=max(300, 22 * rows))
+            st.plotly_chart(fig, use_container_width=True)
+
+    with tab3:
+        if len(conflicts):
+            st.warning("Aşağıdaki sınavlar saat çakışması ya da müsaitlik nedeniyle eksik kaldı veya ders asistanı atanamadı.")
+            paginated_dataframe(conflicts, f"result_conflicts_page_{suffix}")
+        else:
+            st.success("Hiçbir asistana çakışan sınav atanmadı.")
+
+def active_exam_frames(semester):
+    """Aktif satırlar ve bu satırların editördeki sıra numaraları (hata mesajları için)."""
+    frames = [st.session_state.semester_data_dept[semester], st.session_state.semester_data_service[semester]]
+    masks = [df["Aktif"] == True for df in frames]
+    return [df[mask] for df, mask in zip(frames, masks)], [mask.to_numpy().nonzero()[0] + 1 for mask in masks]
+
+def allocation_inputs(active_frames, active_rows=None):
+    """Dağıtım girdileri: (ilk yükleri hesaplanmış havuz, sınav tablosu, tarih/saat hatalı satırlar)."""
+    pool_data = [{"name": name, "load": 0.0} for name in st.session_state.assistants_db["name"].tolist()]
+    
+    # 1. İlk Yükleri Hesapla (Ders Yükleri Sayfasından)
+    with phase("ilk yükler"):
+        pool_with_loads = calculate_initial_loads(pool_data, st.session_state.course_load_data)
+    
+    # 2. Sınavları ve Önceden Atanmış Asistanları Hazırla
+    # Ders Kodu -> [Atanmış Asistanlar] Haritası
+    with phase("ders haritası"):
+        course_map = build_course_map(st.session_state.course_load_data)
+    with phase("sınav listesi"):
+        exam_list, parse_errors = build_exam_list(active_frames, course_map, ["Bölüm", "Servis"], active_rows)
+    return pool_with_loads, exam_list, parse_errors
+
+def show_parse_errors(parse_errors):
+    st.error(f"Tarih formatlarında hata var: {len(parse_errors)} satır düzeltilmeli.")
+    st.dataframe(pd.DataFrame(parse_errors), hide_index=True, use_container_width=True)
+
+def show_rule_errors(rule_errors):
+    st.warning(f"Müsaitlik takviminde {len(rule_errors)} hatalı kural yok sayıldı.")
+    st.dataframe(pd.DataFrame(rule_errors), hide_index=True, use_container_width=True)
+
+# --- SENARYO KARŞILAŞTIRMA ---
+# Her satır bir değişikliktir; aynı senaryo adındaki satırlar birlikte uygulanır.
+# Senaryolar süreç genelinde paylaşılan bir süreç havuzunda paralel dağıtılır; az sayıda
+# senaryo ise havuz hiç açılmadan bu süreçte sırayla çalışır.
+SCENARIO_ACTIONS = {"Sınavı Taşı": "move", "İhtiyaç Değiştir": "needed", "Asistan Çıkar": "remove"}
+
+@st.cache_resource
+def _scenario_executor():
+    return scenario_executor()
+
+def empty_scenario_df():
+    return pd.DataFrame({
+        "Senaryo": pd.Series(dtype="object"), "İşlem": pd.Series(dtype="object"),
+        "Ders Kodu": pd.Series(dtype="object"), "Sınav Türü": pd.Series(dtype="object"),
+        "Yeni Tarih": pd.Series(dtype="datetime64[ns]"), "Yeni Saat": pd.Series(dtype="object"),
+        "Yeni İhtiyaç": pd.Series(dtype="float64"), "Asistan": pd.Series(dtype="object")
+    })
+
+def scenarios_from_rows(df):
+    """Editör satırlarını senaryolara çevirir; (senaryolar, eksik satır uyarıları) döndürür."""
+    scenarios, warnings = {}, []
+    for pos, row in enumerate(df.to_dict("records"), start=1):
+        name, action = row.get("Senaryo"), SCENARIO_ACTIONS.get(row.get("İşlem"))
+        if not name or pd.isna(name) or action is None:
+            warnings.append(f"{pos}. satır: senaryo adı ve işlem gerekli.")
+            continue
+        try:
+            if action == "remove":
+                if pd.isna(row["Asistan"]) or row["Asistan"] == "Yok": raise ValueError
+                change = {"action": action, "assistant": row["Asistan"]}
+            elif action == "move":
+                when = datetime.strptime(f"{pd.Timestamp(row['Yeni Tarih']).strftime('%Y-%m-%d')} {row['Yeni Saat']}", "%Y-%m-%d %H:%M")
+                change = {"action": action, "code": row["Ders Kodu"], "exam": row["Sınav Türü"], "datetime": when}
+            else:
+                change = {"action": action, "code": row["Ders Kodu"], "exam": row["Sınav Türü"], "needed": int(row["Yeni İhtiyaç"])}
+        except (TypeError, ValueError):
+            warnings.append(f"{pos}. satır ({name}): '{row.get('İşlem')}' için gerekli alanlar eksik veya hatalı.")
+            continue
+        scenarios.setdefault(name, {"name": name, "changes": []})["changes"].append(change)
+    return list(scenarios.values()), warnings
+
+@st.fragment
+@profiled
+def scenario_panel(semester, courses, mode, time_budget):
+    tables = st.session_state.setdefault("scenario_tables", {})
+    base = tables.setdefault(semester, empty_scenario_df())
+    edited = st.data_editor(
+        base, num_rows="dynamic", hide_index=True, use_container_width=True, key=f"scenario_editor_{semester}",
+        column_config={
+            "Senaryo": st.column_config.TextColumn("Senaryo", required=True),
+            "İşlem": st.column_config.SelectboxColumn("İşlem", options=list(SCENARIO_ACTIONS), required=True),
+            "Ders Kodu": st.column_config.SelectboxColumn("Ders", options=courses),
+            "Sınav Türü": st.column_config.SelectboxColumn("Tür", options=ALL_EXAM_TYPES),
+            "Yeni Tarih": st.column_config.DateColumn("Yeni Tarih", format="YYYY-MM-DD"),
+            "Yeni Saat": st.column_config.TextColumn("Yeni Saat"),
+            "Yeni İhtiyaç": st.column_config.NumberColumn("Yeni Kişi", min_value=1, max_value=20, step=1),
+            "Asistan": st.column_config.SelectboxColumn("Çıkarılacak Asistan", options=assistant_options)
+        }
     )
+    if not st.button("🔀 Senaryoları Karşılaştır", use_container_width=True):
+        return
+
+    active_frames, active_rows = active_exam_frames(semester)
+    if all(df.empty for df in active_frames):
+        st.warning("⚠️ Lütfen en az bir ders seçin.")
+        return
+    scenarios, warnings = scenarios_from_rows(edited)
+    for msg in warnings:
+        st.warning(msg)
+    pool_with_loads, exam_list, parse_errors = allocation_inputs(active_frames, active_rows)
+    if parse_errors:
+        show_parse_errors(parse_errors)
+        return
+
+    scenarios = [{"name": "Mevcut Plan", "changes": []}] + scenarios
+    serial = run_serially(len(scenarios), mode)
+    with st.spinner(f"{len(scenarios)} senaryo {'' if serial else 'paralel '}hesaplanıyor..."), phase("senaryolar"):
+        try:
+            results = run_scenarios(pool_with_loads, exam_list, scenarios, mode, time_budget,
+                                    executor=None if serial else _scenario_executor(),
+                                    unavailability=st.session_state.unavailability_db)
+        except BrokenProcessPool:
+            # Çöken havuz bir sonraki denemede yeniden kurulur
+            _scenario_executor.clear()
+            st.error("Senaryo süreçleri beklenmedik şekilde kapandı, lütfen tekrar deneyin.")
+            return
 
-    if not edited_loads.equals(st.session_state.course_load_data):
-        st.session_state.course_load_data = edited_loads
-        st.rerun()
+    for result in results:
+        for msg in result["errors"]:
+            st.warning(f"{result['name']}: {msg}")
+    baseline_max = results[0]["max"]
+    summary = pd.DataFrame([{
+        "Senaryo": r["name"], "En Yüksek": r["max"], "Fark (En Yüksek)": round(r["max"] - baseline_max, 2),
+        "Ortalama": r["mean"], "Std. Sapma": r["stdev"], "Eksik Görevli": r["missing"]
+    } for r in results])
+    st.dataframe(summary, hide_index=True, use_container_width=True)
+
+    loads = pd.DataFrame({r["name"]: pd.Series(r["loads"]) for r in results})
+    loads.index.name = "Asistan"
+    long_loads = loads.reset_index().melt(id_vars="Asistan", var_name="Senaryo", value_name="Yük").dropna()
+    fig = px.box(long_loads, x="Senaryo", y="Yük", points="all", hover_data=["Asistan"], color="Senaryo",
+                 color_discrete_sequence=['#E31937', '#555555', '#ff9999', '#999999'], title="Senaryolara Göre Yük Dağılımı")
+    fig.update_layout(showlegend=False)
+    st.plotly_chart(fig, use_container_width=True)
+    st.dataframe(loads.sort_values(results[0]["name"], ascending=False), use_container_width=True)
+
+
+if menu_selection == "Ders Yükleri":
+    # --- YENİ EKRAN: DERS YÜKLERİ ---
+    col1, col2 = st.columns([3, 1])
+    with col1:
+        st.title("Ders ve İdari Görev Yükleri")
+        st.markdown("*Ders asistanlarını buradan atayın. 'Toplam' sütununu manuel değiştirebilirsiniz.*")
+    with col2:
+         if lottie_exam: st_lottie(lottie_exam, height=80, key="load_anim")
+
+    edit_course_loads()
 
 else:
     # --- ESKİ EKRAN: SINAV PLANLAMA (Güz/Bahar) ---
@@ -299,173 +1107,126 @@ else:
             st_lottie(lottie_exam, height=100, key="header_anim")
 
     # Veri Hazırlığı
-    if semester_choice not in st.session_state.semester_data_dept:
-        data_dept = []
-        for course in current_dept_courses:
-            for exam_type in DEFAULT_ROWS_TO_CREATE:
-                # ASİSTAN SÜTUNLARI YOK, YÜK YOK
-                data_dept.append({
-                    "Aktif": False, "Ders Kodu": course, "Sınav Türü": exam_type,
-                    "Tarih": pd.to_datetime("2025-04-15"), "Saat": "17:40", "Süre (dk)": 120, "İhtiyaç (Kişi)": 4
-                })
-        st.session_state.semester_data_dept[semester_choice] = pd.DataFrame(data_dept)
-
-    if semester_choice not in st.session_state.semester_data_service:
-        data_service = []
-        for course in current_service_courses:
-            for exam_type in DEFAULT_ROWS_TO_CREATE:
-                data_service.append({
-                    "Aktif": False, "Ders Kodu": course, "Sınav Türü": exam_type,
-                    "Tarih": pd.to_datetime("2025-04-15"), "Saat": "17:40", "Süre (dk)": 120, "İhtiyaç (Kişi)": 2
-                })
-        st.session_state.semester_data_service[semester_choice] = pd.DataFrame(data_service)
-
-    current_df_dept = st.session_state.semester_data_dept[semester_choice]
-    current_df_service = st.session_state.semester_data_service[semester_choice]
+    dept_tbl = f"dept:{semester_choice}"
+    service_tbl = f"service:{semester_choice}"
+    use_plan_table(dept_tbl, lambda: default_exam_df(current_dept_courses, 4))
+    use_plan_table(service_tbl, lambda: default_exam_df(current_service_courses, 2))
 
     # Hızlı Aksiyonlar
     c1, c2, c3 = st.columns([1, 1, 4])
     with c1: 
-        if st.button("✅ Tümünü Seç"):
-            st.session_state.semester_data_dept[semester_choice]["Aktif"] = True
-            st.session_state.semester_data_service[semester_choice]["Aktif"] = True
-            st.rerun()
+        st.button("✅ Tümünü Seç", on_click=set_active_flags, args=([dept_tbl, service_tbl], True))
     with c2: 
-        if st.button("❌ Temizle"):
-            st.session_state.semester_data_dept[semester_choice]["Aktif"] = False
-            st.session_state.semester_data_service[semester_choice]["Aktif"] = False
-            st.rerun()
+        st.button("❌ Temizle", on_click=set_active_flags, args=([dept_tbl, service_tbl], False))
 
     # Tablolar
     with st.expander("🏛️ Bölüm Dersleri (MetE)", expanded=True):
-        edited_df_dept = st.data_editor(
-            current_df_dept,
-            column_config={
-                "Aktif": st.column_config.CheckboxColumn("Seç", width="small"),
-                "Ders Kodu": st.column_config.TextColumn("Ders", disabled=True),
-                "Sınav Türü": st.column_config.SelectboxColumn("Tür", options=ALL_EXAM_TYPES, required=True),
-                "Tarih": st.column_config.DateColumn("Tarih", format="YYYY-MM-DD", required=True),
-                "Saat": st.column_config.TextColumn("Saat", default="17:40", required=True),
-                "Süre (dk)": st.column_config.NumberColumn("Süre", min_value=15, max_value=300, step=15),
-                "İhtiyaç (Kişi)": st.column_config.NumberColumn("Kişi", min_value=1, max_value=20, step=1),
-                # Asistan sütunları kaldırıldı
-            },
-            hide_index=True, use_container_width=True, height=350, key=f"editor_dept_{semester_choice}"
-        )
-        if not edited_df_dept.equals(current_df_dept):
-            st.session_state.semester_data_dept[semester_choice] = edited_df_dept
-            st.rerun()
+        edit_exam_table(dept_tbl, 350)
 
     with st.expander("🌐 Servis Dersleri (Gözetmenlik)", expanded=False):
-        edited_df_service = st.data_editor(
-            current_df_service,
-            column_config={
-                "Aktif": st.column_config.CheckboxColumn("Seç", width="small"),
-                "Ders Kodu": st.column_config.TextColumn("Ders", disabled=True),
-                "Sınav Türü": st.column_config.SelectboxColumn("Tür", options=ALL_EXAM_TYPES, required=True),
-                "Tarih": st.column_config.DateColumn("Tarih", format="YYYY-MM-DD", required=True),
-                "Saat": st.column_config.TextColumn("Saat", default="17:40", required=True),
-                "Süre (dk)": st.column_config.NumberColumn("Süre", min_value=15, max_value=300, step=15),
-                "İhtiyaç (Kişi)": st.column_config.NumberColumn("Kişi", min_value=1, max_value=20, step=1),
-            },
-            hide_index=True, use_container_width=True, height=300, key=f"editor_service_{semester_choice}"
-        )
-        if not edited_df_service.equals(current_df_service):
-            st.session_state.semester_data_service[semester_choice] = edited_df_service
-            st.rerun()
+        edit_exam_table(service_tbl, 300)
 
     # --- DAĞITIM VE SONUÇLAR ---
     st.markdown("---")
     bc1, bc2, bc3 = st.columns([1, 2, 1])
     with bc2:
+        allocation_mode = st.radio("Dağıtım Modu", ["Hızlı (Sıralı)", "Dengeli (Min-Max)"], horizontal=True,
+                                   help="Dengeli mod, en yüksek yükü düşürmek için tüm sınavları birlikte ele alır.")
+        if allocation_mode == "Dengeli (Min-Max)":
+            time_budget = st.slider("Süre Sınırı (sn)", min_value=1, max_value=10, value=3)
         run_btn = st.button("🚀 DAĞITIMI BAŞLAT VE HESAPLA", type="primary", use_container_width=True)
 
     if run_btn:
         with st.spinner('Algoritma çalışıyor, yükler dengeleniyor...'):
-            active_dept = edited_df_dept[edited_df_dept["Aktif"] == True]
-            active_service = edited_df_service[edited_df_service["Aktif"] == True]
+            active_frames, active_rows = active_exam_frames(semester_choice)
             
-            if active_dept.empty and active_service.empty:
+            if all(df.empty for df in active_frames):
                 st.warning("⚠️ Lütfen en az bir ders seçin.")
+                st.session_state.get("result_views", {}).pop(semester_choice, None)
             else:
-                pool_data = [{"name": name, "load": 0.0} for name in st.session_state.assistants_db["name"].tolist()]
+                pool_with_loads, exam_list, parse_errors = allocation_inputs(active_frames, active_rows)
                 
-                # 1. İlk Yükleri Hesapla (Ders Yükleri Sayfasından)
-                pool_with_loads = calculate_initial_loads(pool_data, st.session_state.course_load_data)
-                
-                # 2. Sınavları ve Önceden Atanmış Asistanları Hazırla
-                exam_list = []
-                parse_error = False
-                
-                # Ders Kodu -> [Atanmış Asistanlar] Haritası
-                course_map = {}
-                if not st.session_state.course_load_data.empty:
-                    for _, row in st.session_state.course_load_data.iterrows():
-                        c_code = row["Ders Kodu"]
-                        assistants = []
-                        for col in ["Asistan 1", "Asistan 2", "Asistan 3", "Asistan 4", "Asistan 5", "Asistan 6"]:
-                            if col in row and row[col] and row[col] != "Yok":
-                                assistants.append(row[col])
-                        course_map[c_code] = assistants
-                
-                for df, is_service in [(active_dept, False), (active_service, True)]:
-                    for index, row in df.iterrows():
-                        try:
-                            dt_obj = datetime.strptime(f"{row['Tarih'].strftime('%Y-%m-%d')} {row['Saat']}", "%Y-%m-%d %H:%M")
-                            
-                            # Bu dersin asistanlarını bul
-                            pre_assigned = course_map.get(row["Ders Kodu"], [])
-                            
-                            exam_list.append({
-                                "code": row["Ders Kodu"], 
-                                "name": row["Sınav Türü"],
-                                "datetime_obj": dt_obj, 
-                                "duration": row["Süre (dk)"], 
-                                "needed": row["İhtiyaç (Kişi)"],
-                                "pre_assigned_assistants": pre_assigned # Yeni mantık
-                            })
-                        except: parse_error = True; break
-                
-                if not parse_error:
-                    schedule, final_pool = run_allocation(pool_with_loads, exam_list)
-                    
-                    # --- SONUÇ EKRANI ---
-                    st.balloons() 
-                    if lottie_success:
-                        st_lottie(lottie_success, height=150, key="success_anim")
-                    
-                    df_final = pd.DataFrame(final_pool).sort_values("load", ascending=False)
-                    total_exams = len(exam_list)
-                    avg_load = round(df_final['load'].mean(), 1)
-                    
-                    k1, k2, k3 = st.columns(3)
-                    k1.metric("Toplam Sınav", total_exams, border=True)
-                    k2.metric("En Yüksek Yük", f"{df_final.iloc[0]['load']}p", f"{df_final.iloc[0]['name']}", delta_color="inverse", border=True)
-                    k3.metric("Ortalama Yük", f"{avg_load}p", border=True)
-
-                    tab1, tab2 = st.tabs(["📊 Yük Analizi", "📅 Sınav Programı"])
-                    
-                    with tab1:
-                        fig = px.bar(
-                            df_final, x='name', y='load',
-                            text='load',
-                            color='load',
-                            color_continuous_scale=['#ffcccc', '#E31937'],
-                            labels={'name': 'Asistan', 'load': 'Toplam Puan'},
-                            title="Asistan Yük Dağılımı"
-                        )
-                        fig.update_traces(texttemplate='%{text:.1f}', textposition='outside')
-                        fig.update_layout(xaxis_tickangle=-45)
-                        st.plotly_chart(fig, use_container_width=True)
-                        
-                        final_df_display = df_final.copy()
-                        final_df_display['Ders Sorumlulukları'] = final_df_display['course_duties'].apply(lambda x: ", ".join(x) if x else "-")
-                        st.dataframe(final_df_display[["name", "load", "Ders Sorumlulukları"]], use_container_width=True)
-
-                    with tab2:
-                        df_sch = pd.DataFrame(schedule)
-                        st.dataframe(df_sch, use_container_width=True)
-                        st.download_button("📥 Excel Olarak İndir", df_sch.to_csv(index=False).encode('utf-8'), "ODTU_MetE_Sinav_Programi.csv", "text/csv", type="primary")
+                if not parse_errors:
+                    # Aynı girdiler önbellekten, tek sınav değişikliği artımlı olarak hesaplanır
+                    mode = "balanced" if allocation_mode == "Dengeli (Min-Max)" else "greedy"
+                    with phase("müsaitlik"):
+                        availability, rule_errors = exam_calendar(st.session_state.unavailability_db, exam_list)
+                    if rule_errors:
+                        show_rule_errors(rule_errors)
+                    with phase("dağıtım"):
+                        schedule, final_pool, conflicts, errors, assignments = run_allocation_cached(
+                            st.session_state.allocation_cache, pool_with_loads, exam_list, mode,
+                            time_budget if mode == "balanced" else None, availability)
+                    for msg in errors:
+                        st.error(msg)
+                    last_run = st.session_state.allocation_cache["last_run"]
+                    if last_run["source"] == "cache":
+                        st.caption("⚡ Girdiler değişmedi, sonuç önbellekten getirildi.")
+                    elif last_run["source"] == "incremental":
+                        st.caption(f"⚡ Yalnızca değişen kısım yeniden hesaplandı ({last_run['replayed']}/{last_run['total']} sınav).")
 
+                    views = st.session_state.setdefault("result_views", {})
+                    current = views.get(semester_choice)
+                    if current is None or current["key"] != last_run["key"]:
+                        with phase("sonuç özetleri"):
+                            views[semester_choice] = build_result_view(
+                                last_run["key"], schedule, final_pool, conflicts, assignments, exam_count(exam_list))
+                        # Kutlama yalnızca yeni bir sonuç üretildiğinde; sonraki çalıştırmalarda tekrarlanmaz
+                        st.balloons()
+                        if lottie_success:
+                            st_lottie(lottie_success, height=150, key="success_anim")
                 else:
-                    st.error("Tarih formatlarında hata var.")
\ No newline at end of file
+                    show_parse_errors(parse_errors)
+                    st.session_state.get("result_views", {}).pop(semester_choice, None)
+
+    # --- SONUÇ EKRANI ---
+    # Son sonuç oturumda tutulur; özetler sonuç başına bir kez hesaplanır ve sonraki
+    # çalıştırmalarda (sayfalama, grafik seçimi vb.) yalnızca gösterilir.
+    result_view = st.session_state.get("result_views", {}).get(semester_choice)
+    if result_view is not None:
+        results_panel(result_view)
+
+    # --- SENARYO KARŞILAŞTIRMA ---
+    with st.expander("🔀 Senaryo Karşılaştırma (Ya Şöyle Olsaydı?)", expanded=False):
+        st.caption("Her satır bir değişikliktir; aynı senaryo adına sahip satırlar birlikte uygulanır. "
+                   "Sınavlar ders ve sınav türüyle eşleştirilir; tüm senaryolar mevcut planla karşılaştırılır.")
+        balanced = allocation_mode == "Dengeli (Min-Max)"
+        scenario_panel(semester_choice, current_dept_courses + current_service_courses,
+                       "balanced" if balanced else "greedy", time_budget if balanced else None)
+
+# --- PROFİL PANELİ ---
+# Bu çalıştırmanın ölçümü burada kapanır; panelin kendisi ölçüme dahil edilmez.
+if active_trace() is not None:
+    _store_trace(finish_trace())
+
+with st.sidebar.expander("🐞 Profil (Geliştirici)", expanded=False, key="profile_panel", on_change="rerun") as profile_panel:
+    st.toggle("Süreleri ölç", key="profiling_enabled",
+              help=f"Her çalıştırmanın aşama süreleri ve sayaçları son {PROFILE_BUFFER_SIZE} çalıştırmalık tampona yazılır.")
+    profile_runs = list(st.session_state.get("profile_runs", []))
+    if profile_runs:
+        percentiles = pd.DataFrame.from_dict(phase_percentiles(profile_runs), orient="index")
+        st.caption(f"Son {len(profile_runs)} çalıştırma (ms)")
+        st.dataframe(percentiles.sort_values("p50", ascending=False), use_container_width=True)
+        last = profile_runs[-1]
+        if last["counters"]:
+            st.caption(f"Son çalıştırma sayaçları ({last['label']})")
+            st.dataframe(pd.Series(last["counters"], name="adet"), use_container_width=True)
+        st.download_button("📥 Ham Ölçümleri İndir (JSON)",
+                           json.dumps(profile_runs, ensure_ascii=False, indent=1).encode("utf-8"),
+                           "profil_olcumleri.json", "application/json")
+        if st.button("Tamponu Temizle"):
+            st.session_state.profile_runs.clear()
+            st.rerun()
+    elif profiling_enabled():
+        st.caption("Ölçüm açık; sonuçlar bir sonraki çalıştırmadan itibaren görünür.")
+
+# Oturum belleği: paylaşılan tablolardan ayrılmış (düzenlenmiş) sütunlar. Tüm tabloları
+# taradığından yalnızca panel açıkken ya da ölçüm açıkken hesaplanır.
+if profile_panel.open or profiling_enabled():
+    session_id, session_bytes = record_session_memory()
+    own = session_bytes[session_id][0]
+    others = [b for b, _ in session_bytes.values()]
+    shared_bytes = shared_table_bytes()
+    profile_panel.caption(f"🧠 Oturuma özel tablo belleği: {own / 1024:.1f} KB · "
+                          f"{len(others)} oturum, ortalama {sum(others) / len(others) / 1024:.1f} KB, "
+                          f"en yüksek {max(others) / 1024:.1f} KB · paylaşılan tablolar {shared_bytes / 1024:.1f} KB")
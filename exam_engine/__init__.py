@@ -0,0 +1,61 @@
+"""
+Sınav gözetmen dağıtım motoru. Streamlit/Plotly gerektirmez; toplu işler ve
+testler için doğrudan içe aktarılabilir. pandas kullanan modüller ilk
+kullanıldıklarında yüklenir, böylece paketin açılışı hızlı kalır.
+"""
+import importlib
+
+_EXPORTS = {
+    "calculate_exam_points": "allocation",
+    "is_slot_busy": "allocation",
+    "book_slot": "allocation",
+    "release_slot": "allocation",
+    "slot_mask": "allocation",
+    "run_allocation": "allocation",
+    "run_balanced_allocation": "allocation",
+    "ROLE_LABELS": "allocation",
+    "new_assignment_table": "allocation",
+    "assignment_frame": "assignments",
+    "schedule_frame": "assignments",
+    "assistant_duties": "assignments",
+    "load_breakdown": "assignments",
+    "calendar_matrix": "assignments",
+    "write_schedule_xlsx": "export",
+    "ASSISTANT_COLUMNS": "loads",
+    "course_assignments_long": "loads",
+    "build_course_map": "loads",
+    "calculate_initial_loads": "loads",
+    "UNAVAILABILITY_COLUMNS": "availability",
+    "WEEKDAYS": "availability",
+    "EVERY_DAY": "availability",
+    "compile_unavailability": "availability",
+    "exam_calendar": "availability",
+    "empty_unavailability_df": "availability",
+    "EXAM_FIELDS": "exams",
+    "build_exam_list": "exams",
+    "empty_exam_table": "exams",
+    "exam_count": "exams",
+    "new_allocation_cache": "memo",
+    "run_allocation_cached": "memo",
+    "apply_scenario": "scenarios",
+    "run_scenario": "scenarios",
+    "run_scenarios": "scenarios",
+    "run_serially": "scenarios",
+    "scenario_executor": "scenarios",
+    "active_trace": "profiling",
+    "start_trace": "profiling",
+    "finish_trace": "profiling",
+    "phase": "profiling",
+    "count": "profiling",
+    "phase_percentiles": "profiling",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{_EXPORTS[name]}", __name__), name)
+    globals()[name] = value
+    return value
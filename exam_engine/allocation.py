@@ -0,0 +1,410 @@
+"""Sınav puanı hesabı ve gözetmen dağıtım algoritmaları (arayüzden bağımsız)."""
+import heapq
+import math
+import sys
+import time
+from array import array
+from bisect import bisect_left
+from datetime import timedelta
+
+from .profiling import count, phase
+
+
+def calculate_exam_points(exam_datetime, duration_minutes):
+    try:
+        duration_hours = duration_minutes / 60.0
+        points = duration_hours * 2.5
+        if exam_datetime.weekday() >= 5: points *= 1.5
+        elif exam_datetime.hour >= 17: points *= 1.25
+        return round(points, 2)
+    except: return 0.0
+
+def is_slot_busy(slots, start, end):
+    """
+    slots: (başlangıçlar, bitişler) sıralı ve çakışmayan aralık listeleri.
+    [start, end) aralığı mevcut bir görevle çakışıyor mu? O(log k)
+    """
+    starts, ends = slots
+    pos = bisect_left(starts, end)
+    return pos > 0 and ends[pos - 1] > start
+
+def book_slot(slots, start, end):
+    starts, ends = slots
+    pos = bisect_left(starts, start)
+    starts.insert(pos, start)
+    ends.insert(pos, end)
+
+def release_slot(slots, start, end):
+    starts, ends = slots
+    pos = bisect_left(starts, start)
+    while pos < len(starts) and starts[pos] == start:
+        if ends[pos] == end:
+            del starts[pos], ends[pos]
+            return
+        pos += 1
+
+def slot_mask(calendar, start, end):
+    """
+    Müsaitlik takviminde (bkz. availability.compile_unavailability) [start, end)
+    aralığının değdiği zaman dilimlerinin bit maskesi; takvim dışı kısımlar atılır.
+    """
+    step = calendar["slot_minutes"] * 60
+    first = max(0, int((start - calendar["origin"]).total_seconds() // step))
+    last = min(calendar["slots"], -int(-(end - calendar["origin"]).total_seconds() // step))
+    return ((1 << (last - first)) - 1) << first if last > first else 0
+
+ROLE_COURSE, ROLE_PROCTOR, ROLE_EXTERNAL = range(3)
+ROLE_LABELS = ("Ders Asistanı", "Gözetmen", "Manuel/Dış")
+
+
+def new_assignment_table():
+    """
+    Uzun formatta atama tablosu. Her satır bir görevdir: (sınav, asistan, rol, puan).
+    Sınav kimliği schedule_log satır numarası, asistan kimliği 'assistants' listesindeki
+    konumdur (önce havuz, giriş sırasıyla; sonra havuz dışı isimler). Rol ROLE_LABELS
+    içindeki konumdur.
+    """
+    return {"assistants": [], "exam": array("i"), "assistant": array("i"), "role": array("b"), "points": array("d")}
+
+def _reset_assignment_table(table, assistant_ids, source=None, rows=0):
+    # Tabloyu yeni asistan listesiyle boşaltır; 'source' verilirse ilk 'rows' satırını kopyalar
+    table["assistants"][:] = assistant_ids
+    for col in ("exam", "assistant", "role", "points"):
+        del table[col][:]
+        if source is not None:
+            table[col].extend(source[col][:rows])
+
+def run_allocation(assistants_pool, exams, conflict_log=None, assignment_log=None, error_log=None,
+                   checkpoint_log=None, checkpoint_every=None, resume_state=None, assignment_table=None,
+                   availability=None):
+    """
+    Sınavlara gözetmen atar. Önce dersin kendi asistanları, sonra yükü en az olanlar.
+    'exams' sütun bazlı sınav tablosudur (bkz. exams.build_exam_list).
+    Yük sıralaması bir min-heap üzerinden tutulur; eşit yükte sıralama, havuzun her
+    sınavda baştan (kararlı) sıralandığı eski yöntemle birebir aynıdır.
+    Aynı saatte başka sınavı olan asistan atanmaz; çakışma yüzünden eksik kalan
+    sınavlar 'conflict_log' listesine eklenir. 'assignment_log' verilirse her sınavın
+    atamaları (ders asistanları ve gözetmenler ayrı) oraya da yazılır. İşlenemeyen
+    sınavların hata mesajları 'error_log' listesine yazılır.
+    Atamalar 'assignment_table' (bkz. new_assignment_table) içine uzun formatta yazılır;
+    sınav kimliği schedule_log satır numarasıdır.
+    'checkpoint_log' verilirse her 'checkpoint_every' sınavda bir (verilmezse ~√sınav
+    sayısı) algoritmanın durumu oraya kaydedilir; 'resume_state' ile böyle bir kayıttan
+    devam edilir (havuz, ilk çalıştırmadaki sırada ve ilk yüklerle verilmelidir).
+    'availability' derlenmiş müsaitlik takvimidir (bkz. availability.exam_calendar); o
+    saatte müsait olmayan asistan atanmaz, ders asistanıysa 'conflict_log'a yazılır.
+    """
+    schedule_log = []
+    if error_log is None:
+        error_log = []
+    if conflict_log is None:
+        conflict_log = []
+    if assignment_log is None:
+        assignment_log = []
+    if assignment_table is None:
+        assignment_table = new_assignment_table()
+    # Döngü boyunca yükler ve isimler düz listelerde tutulur; sözlüklere sonda yazılır
+    names = [a['name'] for a in assistants_pool]
+    loads = [a['load'] for a in assistants_pool]
+    # Her asistanın dolu saatleri (çakışma indeksi)
+    busy = [([], []) for _ in assistants_pool]
+    # İsim -> asistan indeksi (aynı isimden birden fazla varsa ilki geçerli)
+    name_index = {}
+    for i, name in enumerate(names):
+        name_index.setdefault(name, i)
+    # Müsait olmadığı zaman dilimleri (bit kümesi); sınavın maskesiyle tek AND yeterli
+    blocked = [availability["masks"].get(name, 0) for name in names] if availability else [0] * len(names)
+
+    # Heap anahtarı: (yük, sıra, indeks). 'sıra' eşit yüklerde bir önceki sıralamadaki
+    # konumu temsil eder. Yükü değişen asistanlar bir sonraki sıralamada yeniden sıralanır.
+    ranks = list(range(len(assistants_pool)))
+    heap = [(load, ranks[i], i) for i, load in enumerate(loads)]
+    heapq.heapify(heap)
+    changed = {}  # indeks -> son sıralamadaki yük
+    # Profil sayaçları (yerel değişkenler; trace yoksa sonda atılır)
+    heap_pops = heap_pushes = busy_checks = unavailable_skips = 0
+    next_rank = 0
+    sorted_once = False
+    start = 0
+    table_ids = [sys.intern(name) for name in names]
+    table_rows = 0
+
+    if resume_state is not None:
+        loads = list(resume_state['loads'])
+        ranks = list(resume_state['ranks'])
+        heap = list(resume_state['heap'])
+        changed = dict(resume_state['changed'])
+        next_rank = resume_state['next_rank']
+        sorted_once = resume_state['sorted_once']
+        busy = [(list(starts), list(ends)) for starts, ends in resume_state['busy']]
+        schedule_log = list(resume_state.get('schedule_log', []))
+        start = resume_state['exam_index']
+        if 'assignment_table' in resume_state:
+            _, _, _, table_rows, n_ids = resume_state['log_sizes']
+            table_ids = resume_state['assignment_table']['assistants'][:n_ids]
+
+    _reset_assignment_table(assignment_table, table_ids, resume_state['assignment_table'] if table_rows else None, table_rows)
+    table_ids = assignment_table['assistants']
+    table_exam, table_assistant = assignment_table['exam'], assignment_table['assistant']
+    table_role, table_points = assignment_table['role'], assignment_table['points']
+    # Havuz dışı (Manuel/Dış) isimlerin kimlikleri havuzdakilerden sonra gelir
+    external_ids = {name: j for j, name in enumerate(table_ids) if j >= len(names)}
+
+    # Kayıtlar dolu saatleri değiştirilemez demetler olarak tutar; son kayıttan beri
+    # değişmeyen asistanların demetleri bir önceki kayıttan paylaşılır
+    saved_busy = resume_state['busy'] if resume_state is not None else None
+    dirty = set()
+
+    def snapshot(k):
+        nonlocal saved_busy
+        if saved_busy is None:
+            saved_busy = [(tuple(starts), tuple(ends)) for starts, ends in busy]
+        else:
+            saved_busy = saved_busy[:]
+            for i in dirty:
+                saved_busy[i] = (tuple(busy[i][0]), tuple(busy[i][1]))
+        dirty.clear()
+        return {
+            "exam_index": k,
+            "loads": loads[:],
+            "ranks": ranks[:],
+            "heap": heap[:],
+            "changed": dict(changed),
+            "next_rank": next_rank,
+            "sorted_once": sorted_once,
+            "busy": saved_busy,
+            "log_sizes": (len(schedule_log), len(conflict_log), len(error_log), len(table_exam), len(table_ids))
+        }
+
+    def bump(i, points):
+        if i not in changed:
+            changed[i] = loads[i]
+        loads[i] += points
+
+    def reorder():
+        # Yükü değişenler, eşit yüklü değişmeyenlerin önüne, eski sıralarına göre girer
+        nonlocal next_rank, sorted_once, changed, heap_pushes
+        if sorted_once:
+            moved = sorted((i for i in changed if changed[i] != loads[i]), key=lambda i: (changed[i], ranks[i]))
+            next_rank -= len(moved)
+            for offset, i in enumerate(moved):
+                ranks[i] = next_rank + offset
+        for i in changed:
+            heapq.heappush(heap, (loads[i], ranks[i], i))
+        heap_pushes += len(changed)
+        changed = {}
+        sorted_once = True
+        # Geçersiz girdiler birikirse heap'i yeniden kur
+        if len(heap) > 4 * len(loads) + 64:
+            heap[:] = [(load, ranks[i], i) for i, load in enumerate(loads)]
+            heapq.heapify(heap)
+
+    codes, exam_types = exams['code'], exams['name']
+    exam_starts, durations, needs = exams['datetime_obj'], exams['duration'], exams['needed']
+    pre_assigned_lists = exams['pre_assigned_assistants']
+    if checkpoint_every is None:
+        # Kayıt sayısı ve kayıt başına kopya maliyeti dengelenir
+        checkpoint_every = max(8, math.isqrt(len(codes)))
+    for k in range(start, len(codes)):
+        if checkpoint_log is not None and k > start and k % checkpoint_every == 0:
+            checkpoint_log.append(snapshot(k))
+        try:
+            needed = int(needs[k])
+            assigned = []  # (asistan kimliği, rol)
+            assigned_names = set()
+            exam_dt = exam_starts[k]
+            duration = int(durations[k])
+            exam_points = calculate_exam_points(exam_dt, duration)
+            exam_end = exam_dt + timedelta(minutes=duration)
+            window = slot_mask(availability, exam_dt, exam_end) if availability else 0
+            clashed = []
+            unavailable = []
+            fixed = []
+            proctors = []
+            
+            # 1. ADIM: Bu dersin önceden atanmış asistanlarını (Ders Yükleri sayfasından) al
+            # Bunlar öncelikli olarak sınavda görev alır.
+            pre_assigned = pre_assigned_lists[k]
+            
+            # Ders asistanlarını ata
+            for name in pre_assigned:
+                if len(assigned) >= needed: break # Kontenjan dolduysa dur (İsteğe göre bu satır kaldırılıp hepsi eklenebilir)
+                
+                i = name_index.get(name)
+                if i is not None:
+                    if blocked[i] & window:
+                        unavailable.append(name)
+                        unavailable_skips += 1
+                        continue
+                    busy_checks += 1
+                    if is_slot_busy(busy[i], exam_dt, exam_end):
+                        clashed.append(name)
+                        continue
+                    assigned.append((i, ROLE_COURSE))
+                    fixed.append(assistants_pool[i])
+                    bump(i, exam_points)
+                    book_slot(busy[i], exam_dt, exam_end)
+                    dirty.add(i)
+                else:
+                    if name not in external_ids:
+                        external_ids[name] = len(table_ids)
+                        table_ids.append(sys.intern(name))
+                    assigned.append((external_ids[name], ROLE_EXTERNAL))
+                assigned_names.add(name)
+
+            # 2. ADIM: Eğer kontenjan dolmadıysa havuzdan tamamla
+            if len(assigned) < needed:
+                remaining_slots = needed - len(assigned)
+                # Yükü en az olandan başla
+                reorder()
+                filled = 0
+                skipped = []
+                while heap and filled < remaining_slots:
+                    entry = heapq.heappop(heap)
+                    heap_pops += 1
+                    load, rank, i = entry
+                    if load != loads[i] or rank != ranks[i]:
+                        continue # Eski kayıt
+                    
+                    # Zaten görevliyse, o saatte müsait değilse ya da başka sınavı varsa atla
+                    if blocked[i] & window:
+                        unavailable_skips += 1
+                        skipped.append(entry)
+                        continue
+                    busy_checks += 1
+                    if names[i] in assigned_names or is_slot_busy(busy[i], exam_dt, exam_end):
+                        skipped.append(entry)
+                        continue
+                    bump(i, exam_points)
+                    book_slot(busy[i], exam_dt, exam_end)
+                    dirty.add(i)
+                    assigned.append((i, ROLE_PROCTOR))
+                    proctors.append(assistants_pool[i])
+                    assigned_names.add(names[i])
+                    filled += 1
+                for entry in skipped:
+                    heapq.heappush(heap, entry)
+                heap_pushes += len(skipped)
+
+            if len(assigned) < needed or clashed or unavailable:
+                conflict_log.append({
+                    "Tarih": exam_dt.strftime("%Y-%m-%d"),
+                    "Saat": exam_dt.strftime("%H:%M"),
+                    "Ders Kodu": codes[k],
+                    "Sınav Türü": exam_types[k],
+                    "İhtiyaç": needed,
+                    "Eksik": needed - len(assigned),
+                    "Çakışan Ders Asistanları": ", ".join(clashed) if clashed else "-",
+                    "Müsait Olmayan Ders Asistanları": ", ".join(unavailable) if unavailable else "-"
+                })
+            
+            row = len(schedule_log)
+            first_proctor_row = len(table_exam) + len(assigned) - len(proctors)
+            for assistant_id, role in assigned:
+                table_exam.append(row)
+                table_assistant.append(assistant_id)
+                table_role.append(role)
+                table_points.append(exam_points)
+            assignment_log.append({
+                "row": row,
+                "points": exam_points,
+                "start": exam_dt,
+                "end": exam_end,
+                "names": assigned_names,
+                "fixed": fixed,
+                "proctors": proctors,
+                "proctor_rows": list(range(first_proctor_row, first_proctor_row + len(proctors)))
+            })
+            schedule_log.append({
+                "Tarih": exam_dt.strftime("%Y-%m-%d"),
+                "Saat": exam_dt.strftime("%H:%M"),
+                "Ders Kodu": codes[k],
+                "Sınav Türü": exam_types[k],
+                "Süre (dk)": duration,
+                "Puan": exam_points
+            })
+        except Exception as e: error_log.append(f"Hata ({codes[k]}): {str(e)}")
+
+    count("sınav", len(codes) - start)
+    count("heap pop", heap_pops)
+    count("heap push", heap_pushes)
+    count("çakışma kontrolü", busy_checks)
+    count("müsait değil", unavailable_skips)
+
+    for a, load in zip(assistants_pool, loads):
+        a['load'] = load
+    # Havuzu, eski yöntemdeki gibi son sıralamadaki düzende döndür
+    if sorted_once:
+        order = sorted(range(len(assistants_pool)), key=lambda i: (changed.get(i, loads[i]), ranks[i]))
+        assistants_pool[:] = [assistants_pool[i] for i in order]
+    return schedule_log, assistants_pool
+
+def run_balanced_allocation(assistants_pool, exams, time_budget=3.0, conflict_log=None, error_log=None,
+                            assignment_table=None, availability=None):
+    """
+    Global min-max dengeleme. Önce sıralı greedy ile başlangıç çözümü alınır, sonra
+    süre sınırı dolana kadar en yüklü asistanların gözetmenlikleri daha az yüklü ve
+    o saatte boş ve müsait olan asistanlara taşınır. Ders asistanı atamalarına dokunulmaz.
+    Çıktı run_allocation ile aynı formattadır.
+    """
+    deadline = time.perf_counter() + time_budget
+    records = []
+    if assignment_table is None:
+        assignment_table = new_assignment_table()
+    # Atama tablosundaki asistan kimliği = havuzun giriş sırasındaki konum
+    table_ids = {id(a): i for i, a in enumerate(assistants_pool)}
+    with phase("greedy"):
+        schedule_log, assistants_pool = run_allocation(assistants_pool, exams, conflict_log, records, error_log,
+                                                       assignment_table=assignment_table, availability=availability)
+
+    busy = {id(a): ([], []) for a in assistants_pool}
+    duties = {id(a): [] for a in assistants_pool}
+    blocked = {id(a): availability["masks"].get(a['name'], 0) if availability else 0 for a in assistants_pool}
+    windows = [slot_mask(availability, rec['start'], rec['end']) if availability else 0 for rec in records]
+    for k, rec in enumerate(records):
+        for a in rec['fixed'] + rec['proctors']:
+            book_slot(busy[id(a)], rec['start'], rec['end'])
+        for a in rec['proctors']:
+            duties[id(a)].append(k)
+
+    def find_move(src, by_load):
+        # src'nin bir gözetmenliğini, alınca src'nin yükünü geçmeyecek en az yüklü asistana ver
+        for k in duties[id(src)]:
+            rec = records[k]
+            points = rec['points']
+            if points <= 0: continue
+            for dst in by_load:
+                if dst['load'] + points >= src['load']: break
+                if dst['name'] in rec['names']: continue
+                if blocked[id(dst)] & windows[k]: continue
+                if is_slot_busy(busy[id(dst)], rec['start'], rec['end']): continue
+                return k, dst
+        return None
+
+    with phase("yerel arama"):
+        moves = 0
+        improved = True
+        while improved and time.perf_counter() < deadline:
+            improved = False
+            by_load = sorted(assistants_pool, key=lambda a: a['load'])
+            for src in reversed(by_load):
+                move = find_move(src, by_load)
+                if move is None: continue
+                k, dst = move
+                rec = records[k]
+                slot = rec['proctors'].index(src)
+                rec['proctors'][slot] = dst
+                assignment_table['assistant'][rec['proctor_rows'][slot]] = table_ids[id(dst)]
+                rec['names'].discard(src['name'])
+                rec['names'].add(dst['name'])
+                duties[id(src)].remove(k)
+                duties[id(dst)].append(k)
+                release_slot(busy[id(src)], rec['start'], rec['end'])
+                book_slot(busy[id(dst)], rec['start'], rec['end'])
+                src['load'] = round(src['load'] - rec['points'], 2)
+                dst['load'] = round(dst['load'] + rec['points'], 2)
+                moves += 1
+                improved = True
+                break
+        count("taşınan görev", moves)
+    return schedule_log, assistants_pool
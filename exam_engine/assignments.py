@@ -0,0 +1,84 @@
+"""
+Atama tablosu (bkz. allocation.new_assignment_table) üzerinden görünümler: sınav programı,
+asistan bazında görev listesi, yük dağılımı ve asistan x gün takvimi. Hepsi tablonun sütunlarından vektörel
+olarak üretilir; birleştirilmiş "Görevliler" metinleri yalnızca gösterim/CSV içindir.
+"""
+import numpy as np
+import pandas as pd
+
+from .allocation import ROLE_LABELS
+
+SCHEDULE_COLUMNS = ["Tarih", "Saat", "Ders Kodu", "Sınav Türü", "Süre (dk)", "Puan"]
+
+
+def _columns(table):
+    names = np.asarray(table["assistants"], dtype=object)
+    exams = np.asarray(table["exam"], dtype=np.int64)
+    ids = np.asarray(table["assistant"], dtype=np.int64)
+    roles = np.asarray(table["role"], dtype=np.int64)
+    points = np.asarray(table["points"], dtype=float)
+    return names, exams, ids, roles, points
+
+
+def assignment_frame(table):
+    """Atama tablosunu DataFrame olarak döndürür: sınav, Asistan, Rol, Puan."""
+    names, exams, ids, roles, points = _columns(table)
+    return pd.DataFrame({
+        "sınav": exams,
+        "Asistan": names[ids] if len(ids) else np.array([], dtype=object),
+        "Rol": np.asarray(ROLE_LABELS, dtype=object)[roles] if len(roles) else np.array([], dtype=object),
+        "Puan": points
+    })
+
+
+def schedule_frame(schedule_log, table):
+    """Sınav programı; 'Görevliler' sütunu atama tablosundan ("Ad (Rol)", görev sırasıyla) üretilir."""
+    schedule = pd.DataFrame(schedule_log, columns=SCHEDULE_COLUMNS)
+    duties = assignment_frame(table)
+    labels = duties["Asistan"] + " (" + duties["Rol"] + ")"
+    joined = labels.groupby(duties["sınav"], sort=False).agg(", ".join)
+    schedule["Görevliler"] = joined.reindex(range(len(schedule)), fill_value="").to_numpy(dtype=object)
+    return schedule
+
+
+def assistant_duties(schedule_log, table, name):
+    """Bir asistanın tüm sınav görevleri (tarih sırasıyla)."""
+    names, exams, ids, roles, points = _columns(table)
+    mask = np.isin(ids, np.flatnonzero(names == name)) if len(names) else np.zeros(0, dtype=bool)
+    schedule = pd.DataFrame(schedule_log, columns=SCHEDULE_COLUMNS)
+    duties = schedule.iloc[exams[mask]].reset_index(drop=True)
+    duties["Rol"] = np.asarray(ROLE_LABELS, dtype=object)[roles[mask]]
+    return duties.sort_values(["Tarih", "Saat"], kind="stable", ignore_index=True)
+
+
+def load_breakdown(assistants_pool, table):
+    """
+    Asistan başına yükün bileşenleri: ders yükleri ve role göre sınav puanları.
+    Havuz sırasını korur; sütunlar name, load, Ders Yükü ve her rol için birer sütun.
+    """
+    names, exams, ids, roles, points = _columns(table)
+    frame = pd.DataFrame({"name": [a['name'] for a in assistants_pool],
+                          "load": [a['load'] for a in assistants_pool]})
+    by_role = pd.DataFrame({"name": names[ids] if len(ids) else np.array([], dtype=object),
+                            "role": roles, "points": points})
+    sums = by_role.pivot_table(index="name", columns="role", values="points", aggfunc="sum", fill_value=0.0)
+    exam_total = pd.Series(0.0, index=frame.index)
+    for role, label in enumerate(ROLE_LABELS[:2]):
+        column = frame["name"].map(sums[role]) if role in sums.columns else pd.Series(0.0, index=frame.index)
+        frame[f"{label} (Sınav)"] = column.fillna(0.0).to_numpy()
+        exam_total += frame[f"{label} (Sınav)"]
+    frame["Ders Yükü"] = (frame["load"] - exam_total).round(2)
+    return frame
+
+
+def calendar_matrix(schedule_log, table):
+    """
+    Asistan x gün sınav puanı tablosu (ısı haritası için). Satırlar görevi olan asistanlar,
+    sütunlar sınav olan günlerdir (Tarih sırasıyla); görev olmayan hücreler 0'dır.
+    """
+    names, exams, ids, roles, points = _columns(table)
+    if not len(ids):
+        return pd.DataFrame(dtype=float)
+    dates = np.asarray([exam["Tarih"] for exam in schedule_log], dtype=object)
+    duties = pd.DataFrame({"Asistan": names[ids], "Tarih": dates[exams], "Puan": points})
+    return duties.pivot_table(index="Asistan", columns="Tarih", values="Puan", aggfunc="sum", fill_value=0.0)
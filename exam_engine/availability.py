@@ -0,0 +1,142 @@
+"""
+Asistanların müsait olmadığı zamanlar (konferans haftası, her salı öğleden sonra ders vb.).
+
+Kurallar tablosu şu sütunları kullanır:
+    Asistan, Başlangıç, Bitiş, Gün, Saat Başlangıç, Saat Bitiş
+Başlangıç/Bitiş boşsa kural tüm dönem için, Gün "Her Gün" ya da boşsa her gün için,
+saatler boşsa bütün gün için geçerlidir.
+
+Kurallar dönemin SLOT_MINUTES dakikalık zaman dilimleri üzerinde asistan başına bir
+bit kümesine (Python int) derlenir. Saatler dakika çözünürlüğünde olduğundan dilimler
+1 dakikadır; daha kaba dilimlerde aralıklar dışa yuvarlanır ve çakışmayan bir kural
+(ör. 17:42'de biten) 17:45'teki sınavı engellerdi. Dağıtımda bir adayın sınav
+saatinde müsait olup olmadığı, kural sayısından bağımsız olarak tek bir AND ile
+bulunur (bkz. allocation.slot_mask):
+    calendar["masks"][ad] & slot_mask(calendar, başlangıç, bitiş)
+"""
+import re
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+from .exams import _TIME_PATTERN
+from .profiling import count
+
+SLOT_MINUTES = 1
+UNAVAILABILITY_COLUMNS = ["Asistan", "Başlangıç", "Bitiş", "Gün", "Saat Başlangıç", "Saat Bitiş", "Açıklama"]
+WEEKDAYS = ("Pazartesi", "Salı", "Çarşamba", "Perşembe", "Cuma", "Cumartesi", "Pazar")
+EVERY_DAY = "Her Gün"
+
+
+def empty_unavailability_df():
+    return pd.DataFrame({
+        "Asistan": pd.Series(dtype="object"), "Başlangıç": pd.Series(dtype="datetime64[ns]"),
+        "Bitiş": pd.Series(dtype="datetime64[ns]"), "Gün": pd.Series(dtype="object"),
+        "Saat Başlangıç": pd.Series(dtype="object"), "Saat Bitiş": pd.Series(dtype="object"),
+        "Açıklama": pd.Series(dtype="object")
+    })
+
+
+def _repeat(pattern, period, times):
+    # Çakışmayan 'pattern' bitlerini 'period' aralıkla 'times' kez tekrarlar. Katlanarak
+    # kurulur: log(times) adet kaydırma ve OR (büyük sayılarla çarpma/bölme yok)
+    result, copies = 0, 0
+    for bit in bin(max(times, 0))[2:]:
+        result |= result << (copies * period)
+        copies *= 2
+        if bit == "1":
+            result = (result << period) | pattern
+            copies += 1
+    return result
+
+
+def _clock_minutes(value):
+    match = re.match(_TIME_PATTERN, str(value).strip())
+    if match is None or int(match[1]) > 23 or int(match[2]) > 59:
+        return None
+    return int(match[1]) * 60 + int(match[2])
+
+
+def _blank(value):
+    return value is None or (not isinstance(value, str) and pd.isna(value)) or str(value).strip() == ""
+
+
+def compile_unavailability(rules, first_day, last_day, slot_minutes=SLOT_MINUTES):
+    """
+    Kuralları first_day..last_day (dahil) günlerini kapsayan bir takvime derler.
+    (takvim, hatalı satırlar) döndürür. Takvim {"origin", "slot_minutes", "slots", "masks"}
+    sözlüğüdür; "masks" asistan adı -> bit kümesidir. Hatalı satırlar takvime alınmaz.
+    """
+    origin = datetime.combine(pd.Timestamp(first_day).date(), datetime.min.time())
+    days = (pd.Timestamp(last_day).normalize() - pd.Timestamp(origin)).days + 1
+    per_day = 24 * 60 // slot_minutes
+    calendar = {"origin": origin, "slot_minutes": slot_minutes, "slots": max(days, 0) * per_day, "masks": {}}
+    errors = []
+    if rules is None or len(rules) == 0 or days <= 0:
+        return calendar, errors
+
+    # Tarihler tek seferde çözülür; takvim başlangıcına göre gün numarası olarak tutulur
+    frame = rules.reset_index(drop=True)
+    day_columns = {}
+    for col in ("Başlangıç", "Bitiş"):
+        raw = frame[col] if col in frame.columns else pd.Series(None, index=frame.index, dtype="object")
+        parsed = pd.to_datetime(raw.where(~raw.map(_blank)), errors="coerce").dt.normalize()
+        day_columns[col] = ((parsed - pd.Timestamp(origin)).dt.days.to_numpy(), raw.map(_blank).to_numpy())
+
+    for pos, row in enumerate(frame.to_dict("records")):
+        name = row.get("Asistan")
+        problems = []
+        if _blank(name) or name == "Yok":
+            problems.append("Asistan boş")
+
+        (start_days, start_blank), (end_days, end_blank) = day_columns["Başlangıç"], day_columns["Bitiş"]
+        first = 0 if start_blank[pos] else start_days[pos]
+        last = days - 1 if end_blank[pos] else end_days[pos]
+        if pd.isna(first) or pd.isna(last):
+            problems.append("Tarih geçersiz")
+        elif last < first:
+            problems.append("Bitiş tarihi başlangıçtan önce")
+
+        weekday = row.get("Gün")
+        if not _blank(weekday) and weekday != EVERY_DAY and weekday not in WEEKDAYS:
+            problems.append(f"Gün '{weekday}' geçersiz")
+
+        from_clock, to_clock = row.get("Saat Başlangıç"), row.get("Saat Bitiş")
+        if _blank(from_clock) and _blank(to_clock):
+            day_from, day_to = 0, 24 * 60
+        else:
+            day_from, day_to = _clock_minutes(from_clock), _clock_minutes(to_clock)
+            if day_from is None or day_to is None or day_to <= day_from:
+                problems.append("Saat aralığı geçersiz (SS:DD - SS:DD, aynı gün içinde)")
+
+        if problems:
+            errors.append({"Satır": pos + 1, "Asistan": name, "Sorun": "; ".join(problems)})
+            continue
+
+        # Kuralın takvim içine düşen ilk ve son günü
+        first, last = max(int(first), 0), min(int(last), days - 1)
+        if last < first:
+            continue
+        day_bits = ((1 << (-(-day_to // slot_minutes) - day_from // slot_minutes)) - 1) << (day_from // slot_minutes)
+        if _blank(weekday) or weekday == EVERY_DAY:
+            period, first_day_index = 1, first
+        else:
+            period = 7
+            first_day_index = first + (WEEKDAYS.index(weekday) - (origin + timedelta(days=first)).weekday()) % 7
+        times = (last - first_day_index) // period + 1 if first_day_index <= last else 0
+        # Önce tek günün deseni tekrarlanır, sonra ilk güne kaydırılır (küçük sayı x büyük sayı çarpımı)
+        mask = _repeat(day_bits, period * per_day, times) << (first_day_index * per_day)
+        calendar["masks"][name] = calendar["masks"].get(name, 0) | mask
+
+    count("müsaitlik kuralı", len(rules))
+    return calendar, errors
+
+
+def exam_calendar(rules, exams, slot_minutes=SLOT_MINUTES):
+    """Sınav tablosunun tarih aralığını kapsayan takvim; (takvim, hatalı satırlar) döndürür."""
+    starts = exams["datetime_obj"]
+    if not starts:
+        return None, []
+    ends = [start + timedelta(minutes=int(duration)) for start, duration in zip(starts, exams["duration"])]
+    return compile_unavailability(rules, min(starts), max(ends), slot_minutes)
+
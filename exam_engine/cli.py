@@ -0,0 +1,128 @@
+"""
+Toplu dağıtım komutu. Asistan listesi, ders yükleri ve sınav takvimini CSV/XLSX
+dosyalarından okur, dağıtımı yapar ve programı dosyaya yazar.
+
+    python -m exam_engine asistanlar.csv sinavlar.xlsx --course-loads ders_yukleri.xlsx -o program.csv
+"""
+import argparse
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+from .allocation import new_assignment_table, run_allocation, run_balanced_allocation
+from .assignments import SCHEDULE_COLUMNS, assignment_frame, schedule_frame
+from .availability import exam_calendar
+from .exams import build_exam_list, exam_count
+from .loads import build_course_map, calculate_initial_loads
+
+
+def read_table(path):
+    path = Path(path)
+    if path.suffix.lower() in (".xlsx", ".xlsm", ".xls"):
+        return pd.read_excel(path)
+    return pd.read_csv(path)
+
+
+def write_table(df, path):
+    path = Path(path)
+    if path.suffix.lower() in (".xlsx", ".xlsm"):
+        df.to_excel(path, index=False)
+    else:
+        df.to_csv(path, index=False, encoding="utf-8")
+
+
+def read_roster(path):
+    df = read_table(path)
+    for col in ("name", "Ad Soyad"):
+        if col in df.columns:
+            names = df[col]
+            break
+    else:
+        names = df.iloc[:, 0]
+    return names.dropna().astype(str).str.strip().tolist()
+
+
+def read_exams(path):
+    df = read_table(path)
+    if "Aktif" in df.columns:
+        df = df[df["Aktif"] == True]
+    df = df.copy()
+    df["Tarih"] = pd.to_datetime(df["Tarih"], errors="coerce")
+    df["Saat"] = df["Saat"].astype(str).str.strip()
+    return df
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m exam_engine", description="Sınav gözetmen dağıtımını arayüz olmadan çalıştırır.")
+    parser.add_argument("roster", help="Asistan listesi (CSV/XLSX, 'name' ya da 'Ad Soyad' sütunu)")
+    parser.add_argument("exams", help="Sınav takvimi (CSV/XLSX; Ders Kodu, Sınav Türü, Tarih, Saat, Süre (dk), İhtiyaç (Kişi))")
+    parser.add_argument("--course-loads", help="Ders Yükleri tablosu (CSV/XLSX)")
+    parser.add_argument("--unavailability", help="Müsaitlik kuralları (CSV/XLSX; Asistan, Başlangıç, Bitiş, Gün, Saat Başlangıç, Saat Bitiş)")
+    parser.add_argument("-o", "--output", default="ODTU_MetE_Sinav_Programi.csv",
+                        help="Sınav programı çıktısı (.csv ya da .xlsx; .xlsx yük özeti ve asistan sayfalarını da içerir)")
+    parser.add_argument("--loads-output", help="Asistan yükleri çıktısı (.csv ya da .xlsx)")
+    parser.add_argument("--assignments-output", help="Görev başına bir satır (sınav, asistan, rol, puan) çıktısı (.csv ya da .xlsx)")
+    parser.add_argument("--mode", choices=["greedy", "balanced"], default="greedy", help="Sıralı greedy ya da global min-max dengeleme")
+    parser.add_argument("--time-budget", type=float, default=3.0, help="Dengeli mod için süre sınırı (sn)")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+
+    pool = [{"name": name, "load": 0.0} for name in read_roster(args.roster)]
+    course_loads = read_table(args.course_loads) if args.course_loads else None
+    pool = calculate_initial_loads(pool, course_loads)
+    course_map = build_course_map(course_loads)
+
+    exams = read_exams(args.exams)
+    # Hata mesajlarındaki satır numarası, 'Aktif' filtresinden önceki dosya satırıdır (başlık hariç)
+    exam_list, parse_errors = build_exam_list([exams], course_map, [Path(args.exams).name], [exams.index.to_numpy() + 1])
+    if parse_errors:
+        print(f"Tarih/saat hatası olan {len(parse_errors)} satır var:", file=sys.stderr)
+        for err in parse_errors:
+            print(f"  {err['Tablo']} satır {err['Satır']} ({err['Ders Kodu']} {err['Sınav Türü']}): {err['Sorun']}", file=sys.stderr)
+        return 1
+
+    availability = None
+    if args.unavailability:
+        availability, rule_errors = exam_calendar(read_table(args.unavailability), exam_list)
+        for err in rule_errors:
+            print(f"Müsaitlik kuralı satır {err['Satır']} ({err['Asistan']}) yok sayıldı: {err['Sorun']}", file=sys.stderr)
+
+    conflicts = []
+    errors = []
+    assignments = new_assignment_table()
+    if args.mode == "balanced":
+        schedule, final_pool = run_balanced_allocation(pool, exam_list, args.time_budget, conflicts, errors, assignments,
+                                                       availability)
+    else:
+        schedule, final_pool = run_allocation(pool, exam_list, conflicts, error_log=errors, assignment_table=assignments,
+                                              availability=availability)
+    for msg in errors:
+        print(msg, file=sys.stderr)
+
+    if Path(args.output).suffix.lower() == ".xlsx":
+        # Program + yük özeti + asistan sayfaları, akış modunda. openpyxl yalnızca burada
+        # yüklenir; CSV çıktısı ve komutun açılışı onu beklemez.
+        from .export import write_schedule_xlsx
+        write_schedule_xlsx(args.output, schedule, assignments, final_pool)
+    else:
+        write_table(schedule_frame(schedule, assignments), args.output)
+    if args.assignments_output:
+        long_df = assignment_frame(assignments)
+        exam_info = pd.DataFrame(schedule, columns=SCHEDULE_COLUMNS).iloc[long_df["sınav"]].reset_index(drop=True)
+        write_table(pd.concat([exam_info, long_df.drop(columns=["sınav", "Puan"])], axis=1), args.assignments_output)
+    df_final = pd.DataFrame(final_pool).sort_values("load", ascending=False)
+    if args.loads_output:
+        df_loads = df_final.assign(course_duties=df_final["course_duties"].apply(lambda x: ", ".join(x) if x else "-"))
+        write_table(df_loads, args.loads_output)
+
+    print(f"Toplam Sınav: {exam_count(exam_list)}")
+    if not df_final.empty:
+        print(f"En Yüksek Yük: {df_final.iloc[0]['load']}p ({df_final.iloc[0]['name']})")
+        print(f"Ortalama Yük: {round(df_final['load'].mean(), 1)}p")
+    if conflicts:
+        print(f"Çakışma nedeniyle eksik kalan sınav: {len(conflicts)}", file=sys.stderr)
+    return 0
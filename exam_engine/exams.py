@@ -0,0 +1,98 @@
+"""
+Sınav tablolarının (Bölüm / Servis) algoritmanın kullandığı sınav tablosuna çevrilmesi.
+
+Sınav tablosu sütun bazlıdır: EXAM_FIELDS anahtarlarının her biri eşit uzunlukta bir
+listedir ve k. sınav her listenin k. elemanıdır.
+"""
+import numpy as np
+import pandas as pd
+
+from .profiling import count
+
+EXAM_FIELDS = ("code", "name", "datetime_obj", "duration", "needed", "pre_assigned_assistants")
+
+# SS:DD (strptime("%H:%M") gibi tek haneli saat/dakikayı da kabul eder). Excel'den gelen
+# SS:DD:ss değerlerinde saniye yok sayılır.
+_TIME_PATTERN = r"^(\d{1,2}):(\d{1,2})(?::\d{1,2})?$"
+
+
+def empty_exam_table():
+    return {field: [] for field in EXAM_FIELDS}
+
+
+def exam_count(exam_table):
+    return len(exam_table["code"])
+
+
+def _numeric_column(frame, col):
+    if col not in frame.columns:
+        return pd.Series(float("nan"), index=frame.index)
+    return pd.to_numeric(frame[col], errors="coerce")
+
+
+def build_exam_list(exam_frames, course_map, frame_labels=None, frame_rows=None):
+    """
+    Aktif sınav satırlarının tamamını tek geçişte sınav tablosuna çevirir ve dersin
+    asistanlarını ekler. (sınav tablosu, hatalı satırlar) döndürür; her hatalı satır
+    için tablo, satır numarası, ders kodu, sınav türü ve sorun listelenir. Satır
+    numarası 'frame_rows' (tablo başına, satırların kullanıcının gördüğü tablodaki
+    numaraları; ör. filtrelenmeden önceki sıra) verilmezse satırın verilen tablodaki
+    sırasıdır. Hatalı satırlar sınav tablosuna alınmaz.
+    """
+    if frame_labels is None:
+        frame_labels = [f"Tablo {i + 1}" for i in range(len(exam_frames))]
+    if frame_rows is None:
+        frame_rows = [np.arange(1, len(df) + 1) for df in exam_frames]
+    used = [(df, label, rows) for df, label, rows in zip(exam_frames, frame_labels, frame_rows) if len(df)]
+    if not used:
+        return empty_exam_table(), []
+    frame = pd.concat([df for df, _, _ in used], ignore_index=True) if len(used) > 1 else used[0][0].reset_index(drop=True)
+    count("sınav satırı", len(frame))
+
+    # Tarih + Saat -> datetime (tüm satırlar birlikte)
+    dates = pd.to_datetime(frame["Tarih"], errors="coerce").dt.normalize()
+    clock = frame["Saat"].astype("string").str.strip().str.extract(_TIME_PATTERN)
+    hours = pd.to_numeric(clock[0], errors="coerce")
+    minutes = pd.to_numeric(clock[1], errors="coerce")
+    bad_time = hours.isna() | (hours > 23) | (minutes > 59)
+    starts = dates + pd.to_timedelta((hours * 60 + minutes).where(~bad_time), unit="m")
+
+    durations = _numeric_column(frame, "Süre (dk)")
+    needed = _numeric_column(frame, "İhtiyaç (Kişi)")
+
+    checks = [
+        ("Tarih boş veya geçersiz", dates.isna()),
+        ("Saat '{Saat}' geçersiz (SS:DD bekleniyor)", bad_time),
+        ("Süre geçersiz", durations.isna() | (durations <= 0)),
+        ("Kişi sayısı geçersiz", needed.isna() | (needed < 0)),
+    ]
+    invalid = np.logical_or.reduce([mask.to_numpy(dtype=bool) for _, mask in checks])
+
+    errors = []
+    if invalid.any():
+        flags = [(reason, mask.to_numpy(dtype=bool)[invalid]) for reason, mask in checks]
+        # Hatalı satırın hangi tablodan geldiği ve o tablodaki sırası
+        tables = np.repeat(np.array([label for _, label, _ in used], dtype=object), [len(df) for df, _, _ in used])
+        positions = np.concatenate([np.asarray(rows) for _, _, rows in used])
+        bad = frame.loc[invalid, ["Ders Kodu", "Sınav Türü", "Saat"]]
+        for k, (table, pos, row) in enumerate(zip(tables[invalid], positions[invalid], bad.to_dict("records"))):
+            errors.append({
+                "Tablo": table, "Satır": int(pos),
+                "Ders Kodu": row["Ders Kodu"], "Sınav Türü": row["Sınav Türü"],
+                "Sorun": "; ".join(reason.format(Saat=row["Saat"] if pd.notna(row["Saat"]) else "boş")
+                                   for reason, mask in flags if mask[k])
+            })
+
+    valid = ~invalid
+    codes = frame["Ders Kodu"].to_numpy(dtype=object)[valid].tolist()
+    exam_table = {
+        "code": codes,
+        "name": frame["Sınav Türü"].to_numpy(dtype=object)[valid].tolist(),
+        # datetime64[us] -> datetime.datetime
+        "datetime_obj": starts.to_numpy(dtype="datetime64[us]")[valid].astype(object).tolist(),
+        "duration": durations.to_numpy()[valid].astype(np.int64).tolist(),
+        "needed": needed.to_numpy()[valid].astype(np.int64).tolist(),
+        # Bu dersin asistanlarını bul
+        "pre_assigned_assistants": [course_map.get(code, []) for code in codes]
+    }
+    return exam_table, errors
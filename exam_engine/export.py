@@ -0,0 +1,101 @@
+"""
+Dağıtım sonucunun XLSX olarak dışa aktarılması. openpyxl'in write_only (akış) modu
+kullanılır: satırlar doğrudan dosyaya yazılır, sayfa başına DataFrame kurulmaz.
+
+Sayfalar: "Sınav Programı", "Yük Özeti" ve her asistan için bir sayfa.
+"""
+import re
+
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font, PatternFill
+
+from .allocation import ROLE_COURSE, ROLE_LABELS, ROLE_PROCTOR
+from .assignments import SCHEDULE_COLUMNS
+
+SUMMARY_COLUMNS = ["Asistan", "Toplam Yük", "Ders Yükü", "Ders Asistanı (Sınav)", "Gözetmen (Sınav)",
+                   "Sınav Görevi", "Ders Sorumlulukları"]
+DUTY_COLUMNS = ["Tarih", "Saat", "Ders Kodu", "Sınav Türü", "Süre (dk)", "Puan", "Rol"]
+
+_HEADER_FONT = Font(bold=True, color="FFFFFF")
+_HEADER_FILL = PatternFill("solid", fgColor="E31937")
+_INVALID_SHEET_CHARS = re.compile(r"[\[\]:*?/\\]")
+
+
+def _header(ws, columns, widths):
+    for letter, width in zip("ABCDEFGHIJ", widths):
+        ws.column_dimensions[letter].width = width
+    ws.freeze_panes = "A2"
+    row = []
+    for col in columns:
+        cell = WriteOnlyCell(ws, value=col)
+        cell.font = _HEADER_FONT
+        cell.fill = _HEADER_FILL
+        row.append(cell)
+    ws.append(row)
+
+
+def _sheet_title(name, used):
+    # Excel: en fazla 31 karakter, []:*?/\ yasak, büyük/küçük harf duyarsız tekil
+    base = _INVALID_SHEET_CHARS.sub("_", str(name)).strip("'") or "Asistan"
+    title, n = base[:31], 2
+    while title.lower() in used:
+        suffix = f" ({n})"
+        title, n = base[:31 - len(suffix)] + suffix, n + 1
+    used.add(title.lower())
+    return title
+
+
+def write_schedule_xlsx(target, schedule_log, assignments, assistants_pool):
+    """
+    Programı, yük özetini ve asistan sayfalarını 'target' (dosya yolu ya da BytesIO)
+    içine yazar. 'assignments' run_allocation'ın doldurduğu atama tablosudur;
+    'assistants_pool' dağıtım sonrası havuzdur (sayfalar bu sırayla yazılır).
+    """
+    names = assignments["assistants"]
+    exam_ids, assistant_ids = assignments["exam"], assignments["assistant"]
+    roles, points = assignments["role"], assignments["points"]
+    wb = Workbook(write_only=True)
+
+    # 1) Sınav programı: tablo sınav sırasında olduğundan görevliler tek geçişte birleştirilir
+    ws = wb.create_sheet("Sınav Programı")
+    _header(ws, SCHEDULE_COLUMNS + ["Görevliler"], [12, 8, 14, 12, 10, 8, 80])
+    j = 0
+    for row_id, exam in enumerate(schedule_log):
+        labels = []
+        while j < len(exam_ids) and exam_ids[j] == row_id:
+            labels.append(f"{names[assistant_ids[j]]} ({ROLE_LABELS[roles[j]]})")
+            j += 1
+        ws.append([exam[col] for col in SCHEDULE_COLUMNS] + [", ".join(labels)])
+
+    # Asistan kimliği -> görev satırları (tarih/saat sırasıyla)
+    duties = {}
+    for k in sorted(range(len(exam_ids)), key=lambda k: (assistant_ids[k], schedule_log[exam_ids[k]]["Tarih"],
+                                                          schedule_log[exam_ids[k]]["Saat"])):
+        duties.setdefault(assistant_ids[k], []).append(k)
+    first_id = {}
+    for i, name in enumerate(names):
+        first_id.setdefault(name, i)
+
+    # 2) Yük özeti
+    ws = wb.create_sheet("Yük Özeti")
+    _header(ws, SUMMARY_COLUMNS, [28, 12, 12, 20, 16, 12, 60])
+    for a in assistants_pool:
+        rows = duties.get(first_id.get(a['name']), [])
+        course_exam = sum(points[k] for k in rows if roles[k] == ROLE_COURSE)
+        proctor = sum(points[k] for k in rows if roles[k] == ROLE_PROCTOR)
+        ws.append([a['name'], round(a['load'], 2), round(a['load'] - course_exam - proctor, 2),
+                   round(course_exam, 2), round(proctor, 2), len(rows),
+                   ", ".join(a.get('course_duties', [])) or "-"])
+
+    # 3) Asistan sayfaları
+    used = {"sınav programı", "yük özeti"}
+    for a in assistants_pool:
+        ws = wb.create_sheet(_sheet_title(a['name'], used))
+        _header(ws, DUTY_COLUMNS, [12, 8, 14, 12, 10, 8, 16])
+        for k in duties.get(first_id.get(a['name']), []):
+            exam = schedule_log[exam_ids[k]]
+            ws.append([exam[col] for col in DUTY_COLUMNS[:-1]] + [ROLE_LABELS[roles[k]]])
+
+    wb.save(target)
+    return target
@@ -0,0 +1,74 @@
+"""Ders Yükleri tablosundan başlangıç yüklerinin ve ders -> asistan haritasının çıkarılması."""
+import pandas as pd
+
+from .profiling import count
+
+ASSISTANT_COLUMNS = ["Asistan 1", "Asistan 2", "Asistan 3", "Asistan 4", "Asistan 5", "Asistan 6"]
+
+
+def course_assignments_long(course_loads_df):
+    """
+    'Asistan 1..6' sütunlarını tek seferde uzun formata çevirir ("Yok" ve boşlar atılır).
+    Her satır bir (ders satırı, asistan) atamasıdır; sıra, satır ve sütun sırasıdır.
+    """
+    frame = course_loads_df.reset_index(drop=True)
+    cols = [c for c in ASSISTANT_COLUMNS if c in frame.columns]
+    if frame.empty or not cols:
+        return pd.DataFrame({"row": pd.Series(dtype="int64"), "Asistan": pd.Series(dtype="object")})
+    stacked = frame[cols].stack()
+    stacked = stacked[stacked.notna() & stacked.ne("Yok") & stacked.ne("")]
+    return pd.DataFrame({
+        "row": stacked.index.get_level_values(0).to_numpy(),
+        "Asistan": stacked.to_numpy()
+    })
+
+def build_course_map(course_loads_df):
+    """Ders Kodu -> [Atanmış Asistanlar] haritası (aynı ders iki kez varsa son satır geçerli)."""
+    if course_loads_df is None or course_loads_df.empty:
+        return {}
+    codes = course_loads_df["Ders Kodu"].reset_index(drop=True)
+    long_df = course_assignments_long(course_loads_df)
+    by_row = long_df.groupby("row", sort=False)["Asistan"].agg(list).to_dict()
+    last_rows = codes.drop_duplicates(keep="last")
+    return {code: by_row.get(pos, []) for pos, code in last_rows.items()}
+
+def calculate_initial_loads(assistants_pool, course_loads_df):
+    """
+    Ders yüklerini 'course_loads_df' tablosundan çeker.
+    Dersin toplam yükünü, o derse atanmış HER asistana TAM OLARAK ekler (Bölme yok).
+    """
+    # Önce tüm asistanların yüklerini sıfırla
+    name_index = {}
+    for a in assistants_pool:
+        a['load'] = 0.0
+        a['course_duties'] = []
+        name_index.setdefault(a['name'], a)
+    
+    if course_loads_df is None or course_loads_df.empty:
+        return assistants_pool
+    
+    frame = course_loads_df.reset_index(drop=True)
+    if "Toplam (Saat)" in frame.columns:
+        totals = pd.to_numeric(frame["Toplam (Saat)"], errors="coerce").fillna(0.0).astype(float).tolist()
+    else:
+        totals = [0.0] * len(frame)
+    codes = frame["Ders Kodu"].tolist() if "Ders Kodu" in frame.columns else ["Bilinmeyen"] * len(frame)
+    assistant_cols = [frame[col].tolist() for col in ASSISTANT_COLUMNS if col in frame.columns]
+
+    # Sütunlar düz listeler olarak satır satır gezilir (satır nesnesi kurulmaz). Yükler
+    # satır ve sütun sırasıyla tek tek toplanır; ondalık toplamlar eski döngüyle birebir aynıdır.
+    assignments = 0
+    for course_code, course_load, *assigned_names in zip(codes, totals, *assistant_cols):
+        assigned_names = [name for name in assigned_names if name and name != "Yok" and not pd.isna(name)]
+        assignments += len(assigned_names)
+        if course_load > 0:
+            # Her bir atanan asistana yükü ekle (BÖLMEDEN)
+            for name in assigned_names:
+                match = name_index.get(name)
+                if match:
+                    match['load'] += course_load
+                    match['course_duties'].append(f"{course_code} ({int(course_load)}p)")
+    count("ders satırı", len(frame))
+    count("ders ataması", assignments)
+    
+    return assistants_pool
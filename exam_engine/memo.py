@@ -0,0 +1,136 @@
+"""
+Dağıtım sonuçlarının girdi özetine (hash) göre önbelleklenmesi ve artımlı yeniden dağıtım.
+
+Aynı girdiyle yapılan dağıtım önbellekten döner. Greedy modda girdilerden yalnızca
+sınav listesi değiştiyse, işlem sırasındaki ilk değişen sınavdan önceki en yakın
+durum kaydından (checkpoint) devam edilir; öncesi yeniden hesaplanmaz.
+"""
+import copy
+import hashlib
+from collections import OrderedDict
+
+from .allocation import new_assignment_table, run_allocation, run_balanced_allocation
+from .profiling import count, phase
+
+# Sonuçlar oturumda derin kopya olarak tutulur; son birkaç sonuç yeterli (geri alma,
+# senaryolar arasında gidip gelme). Artımlı hesap için ayrıca yalnızca son çalıştırmanın
+# durum kayıtları (trace) saklanır.
+RESULT_CACHE_SIZE = 4
+
+
+def new_allocation_cache():
+    return {"results": OrderedDict(), "trace": None, "last_run": None}
+
+
+def _digest(value):
+    return hashlib.blake2b(repr(value).encode("utf-8"), digest_size=16).hexdigest()
+
+
+def pool_key(assistants_pool):
+    return _digest([(a['name'], a['load'], tuple(a.get('course_duties', []))) for a in assistants_pool])
+
+
+def exam_keys(exams):
+    rows = zip(exams['code'], exams['name'], exams['datetime_obj'], exams['duration'], exams['needed'],
+               exams['pre_assigned_assistants'])
+    return [_digest((code, name, start, duration, needed, tuple(pre_assigned)))
+            for code, name, start, duration, needed, pre_assigned in rows]
+
+
+def _first_difference(old_keys, new_keys):
+    for k, (old, new) in enumerate(zip(old_keys, new_keys)):
+        if old != new:
+            return k
+    return min(len(old_keys), len(new_keys))
+
+
+def availability_key(availability):
+    if not availability:
+        return None
+    # Maskeler çok büyük tam sayılardır (dakika başına bir bit); repr() yerine baytları
+    # özetlenir. Aksi halde birkaç haftalık takvimde int -> str dönüşüm sınırına takılır.
+    h = hashlib.blake2b(digest_size=16)
+    h.update(repr((availability["origin"], availability["slot_minutes"], availability["slots"])).encode("utf-8"))
+    for name, mask in sorted(availability["masks"].items()):
+        name_bytes = str(name).encode("utf-8")
+        mask_bytes = mask.to_bytes((mask.bit_length() + 7) // 8, "little")
+        # Uzunluk önekleri, (ad, maske) çiftlerinin sınırlarını belirsizlikten korur
+        h.update(len(name_bytes).to_bytes(4, "little") + name_bytes)
+        h.update(len(mask_bytes).to_bytes(8, "little") + mask_bytes)
+    return h.hexdigest()
+
+
+def _run_greedy_incremental(cache, assistants_pool, exams, base_key, keys, availability=None):
+    trace = cache["trace"]
+    snap = None
+    if trace is not None and trace["base_key"] == base_key:
+        first_changed = _first_difference(trace["exam_keys"], keys)
+        usable = [c for c in trace["checkpoints"] if c["exam_index"] <= first_changed]
+        if usable:
+            snap = usable[-1]
+
+    conflict_log, error_log = [], []
+    checkpoints = []
+    resume = None
+    if snap is not None:
+        n_schedule, n_conflict, n_error = snap["log_sizes"][:3]
+        resume = dict(snap, schedule_log=trace["schedule_log"][:n_schedule], assignment_table=trace["assignment_table"])
+        conflict_log.extend(trace["conflict_log"][:n_conflict])
+        error_log.extend(trace["error_log"][:n_error])
+        checkpoints = [c for c in trace["checkpoints"] if c["exam_index"] <= snap["exam_index"]]
+
+    assignment_table = new_assignment_table()
+    with phase("greedy"):
+        schedule_log, assistants_pool = run_allocation(assistants_pool, exams, conflict_log, error_log=error_log,
+                                                       checkpoint_log=checkpoints, resume_state=resume,
+                                                       assignment_table=assignment_table, availability=availability)
+    cache["trace"] = {
+        "base_key": base_key,
+        "exam_keys": keys,
+        "checkpoints": checkpoints,
+        "schedule_log": schedule_log,
+        "conflict_log": conflict_log,
+        "error_log": error_log,
+        "assignment_table": assignment_table
+    }
+    start = snap["exam_index"] if snap is not None else 0
+    cache["last_run"] = {"source": "incremental" if start else "full", "replayed": len(keys) - start, "total": len(keys)}
+    return schedule_log, assistants_pool, conflict_log, error_log, assignment_table
+
+
+def run_allocation_cached(cache, assistants_pool, exams, mode="greedy", time_budget=3.0, availability=None):
+    """
+    Önbellekli dağıtım. 'assistants_pool', calculate_initial_loads çıktısı olmalıdır;
+    'availability' derlenmiş müsaitlik takvimidir (bkz. availability.exam_calendar).
+    (schedule_log, havuz, conflict_log, error_log, atama tablosu) döndürür; nasıl hesaplandığı
+    ve sonucun anahtarı (cache["last_run"]["key"]) cache["last_run"] içine yazılır.
+    """
+    with phase("özet (hash)"):
+        # Müsaitlik değişirse tüm sınavlar etkilenebilir: havuzla birlikte taban anahtara girer
+        base_key = _digest((pool_key(assistants_pool), availability_key(availability)))
+        keys = exam_keys(exams)
+        result_key = _digest((mode, time_budget if mode == "balanced" else None, base_key, keys))
+
+    results = cache["results"]
+    if result_key in results:
+        results.move_to_end(result_key)
+        cache["last_run"] = {"source": "cache", "replayed": 0, "total": len(keys), "key": result_key}
+        count("önbellek isabeti")
+        return copy.deepcopy(results[result_key])
+
+    if mode == "balanced":
+        conflict_log, error_log = [], []
+        assignment_table = new_assignment_table()
+        schedule_log, assistants_pool = run_balanced_allocation(assistants_pool, exams, time_budget, conflict_log, error_log,
+                                                                assignment_table, availability)
+        cache["last_run"] = {"source": "full", "replayed": len(keys), "total": len(keys)}
+        result = (schedule_log, assistants_pool, conflict_log, error_log, assignment_table)
+    else:
+        result = _run_greedy_incremental(cache, assistants_pool, exams, base_key, keys, availability)
+
+    cache["last_run"]["key"] = result_key
+    count("yeniden oynatılan sınav", cache["last_run"]["replayed"])
+    results[result_key] = copy.deepcopy(result)
+    if len(results) > RESULT_CACHE_SIZE:
+        results.popitem(last=False)
+    return result
@@ -0,0 +1,84 @@
+"""
+Hafif ölçüm katmanı. Bir çalıştırma (trace) başlatılmadıysa phase() boş bir bağlam,
+count() tek bir kontrol döndürür; yani panel kapalıyken maliyeti yok denecek kadar azdır.
+Her Streamlit oturumu kendi thread'inde çalıştığı için aktif trace thread başınadır.
+"""
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+
+_local = threading.local()
+_NULL = nullcontext()
+
+
+def active_trace():
+    return getattr(_local, "trace", None)
+
+
+def start_trace(label):
+    trace = {"label": label, "started": time.time(), "total_ms": 0.0, "phases": {}, "counters": {}, "_t0": time.perf_counter(), "_stack": []}
+    _local.trace = trace
+    return trace
+
+
+def finish_trace():
+    trace = active_trace()
+    _local.trace = None
+    if trace is None:
+        return None
+    trace["total_ms"] = round((time.perf_counter() - trace.pop("_t0")) * 1000, 3)
+    trace.pop("_stack")
+    return trace
+
+
+@contextmanager
+def _timed(trace, name):
+    stack = trace["_stack"]
+    full_name = "/".join(stack + [name])
+    stack.append(name)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        add_time(full_name, (time.perf_counter() - start) * 1000, trace)
+        stack.pop()
+
+
+def phase(name):
+    """Aktif trace varsa bloğun süresini (iç içe adlarla, ör. 'dağıtım/greedy') ekler."""
+    trace = active_trace()
+    if trace is None:
+        return _NULL
+    return _timed(trace, name)
+
+
+def add_time(name, ms, trace=None):
+    trace = trace or active_trace()
+    if trace is not None:
+        phases = trace["phases"]
+        phases[name] = round(phases.get(name, 0.0) + ms, 3)
+
+
+def count(name, n=1):
+    trace = active_trace()
+    if trace is not None:
+        counters = trace["counters"]
+        counters[name] = counters.get(name, 0) + n
+
+
+def phase_percentiles(traces, percentiles=(50, 90, 99)):
+    """Trace listesinden her aşama için yüzdelik süreler: {aşama: {"n", "p50", ..., "max"}}."""
+    samples = {}
+    for trace in traces:
+        samples.setdefault("(toplam) " + trace["label"], []).append(trace["total_ms"])
+        for name, ms in trace["phases"].items():
+            samples.setdefault(name, []).append(ms)
+    summary = {}
+    for name, values in samples.items():
+        values = sorted(values)
+        row = {"n": len(values)}
+        for p in percentiles:
+            row[f"p{p}"] = values[min(len(values) - 1, int(round(p / 100 * (len(values) - 1))))]
+        row["max"] = values[-1]
+        summary[name] = row
+    return summary
@@ -0,0 +1,139 @@
+"""
+"Ya şöyle olsaydı?" senaryoları: mevcut planın varyantlarını ayrı süreçlerde dağıtır.
+
+Senaryo bir isim ve değişiklik listesidir:
+    {"name": "Final cumartesi", "changes": [
+        {"action": "move", "code": "METE 301", "exam": "Final", "datetime": datetime(...)},
+        {"action": "needed", "code": "METE 301", "exam": "Final", "needed": 6},
+        {"action": "remove", "assistant": "Ali Özalp"}]}
+Sınavlar (Ders Kodu, Sınav Türü) ile eşleştirilir. Her dağıtım bağımsız ve CPU ağırlıklı
+olduğundan senaryolar bir süreç havuzunda paralel çalışır.
+"""
+import copy
+import multiprocessing
+import os
+import statistics
+import sys
+import threading
+import types
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+
+from .allocation import run_allocation, run_balanced_allocation
+from .availability import exam_calendar
+
+SCENARIO_ACTIONS = ("move", "needed", "remove")
+# Açgözlü dağıtım milisaniyeler sürdüğünden bundan az senaryoda havuz ile veri aktarımının
+# maliyeti paralellikten kazanılanı aşar; bu senaryolar bu süreçte sırayla çalışır.
+# Dengeli mod her senaryoda time_budget kadar çalıştığından iki senaryoda bile paraleldir.
+PARALLEL_MIN_SCENARIOS = 4
+
+
+def run_serially(n_scenarios, mode="greedy"):
+    """Senaryoların süreç havuzu yerine bu süreçte sırayla çalıştırılıp çalıştırılmayacağı."""
+    if n_scenarios <= 1 or (os.cpu_count() or 1) == 1:
+        return True
+    return mode != "balanced" and n_scenarios < PARALLEL_MIN_SCENARIOS
+
+
+_MAIN_LOCK = threading.Lock()
+
+
+@contextmanager
+def _hidden_main():
+    """
+    Streamlit betiği sahte bir __main__ modülü olarak çalıştırır; forkserver/spawn ile
+    başlayan işçi __main__.__file__'ı yeniden çalıştırır ve uygulamanın tamamı işçide
+    açılırdı. İşçilere yalnızca exam_engine gerekir. Havuz işçileri görev gönderilirken
+    başlatıldığından gönderim süresince __main__ boş bir modülle değiştirilir.
+    """
+    with _MAIN_LOCK:
+        main = sys.modules.get("__main__")
+        placeholder = sys.modules["__main__"] = types.ModuleType("__main__")
+        try:
+            yield
+        finally:
+            if sys.modules.get("__main__") is placeholder:
+                sys.modules["__main__"] = main
+
+
+def scenario_executor(max_workers=None):
+    """Senaryolar için süreç havuzu. Thread'li (ör. Streamlit) süreçlerde fork güvenli olmadığından forkserver/spawn kullanılır."""
+    methods = multiprocessing.get_all_start_methods()
+    context = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+    return ProcessPoolExecutor(max_workers=max_workers, mp_context=context)
+
+
+def apply_scenario(assistants_pool, exams, scenario):
+    """Senaryonun değişikliklerini havuz ve sınav tablosunun kopyalarına uygular; (havuz, sınavlar, uyarılar) döndürür."""
+    pool = copy.deepcopy(assistants_pool)
+    exams = {field: list(values) for field, values in exams.items()}
+    warnings = []
+    for change in scenario.get("changes", []):
+        action = change.get("action")
+        if action == "remove":
+            name = change["assistant"]
+            if not any(a['name'] == name for a in pool):
+                warnings.append(f"Asistan bulunamadı: {name}")
+            pool = [a for a in pool if a['name'] != name]
+            exams['pre_assigned_assistants'] = [[n for n in names if n != name] for names in exams['pre_assigned_assistants']]
+        elif action in ("move", "needed"):
+            matches = [k for k, (code, exam_type) in enumerate(zip(exams['code'], exams['name']))
+                       if code == change["code"] and exam_type == change["exam"]]
+            if not matches:
+                warnings.append(f"Sınav bulunamadı: {change['code']} {change['exam']}")
+            for k in matches:
+                if action == "move":
+                    exams['datetime_obj'][k] = change["datetime"]
+                else:
+                    exams['needed'][k] = change["needed"]
+        else:
+            warnings.append(f"Bilinmeyen işlem: {action}")
+    return pool, exams, warnings
+
+
+def run_scenario(assistants_pool, exams, scenario, mode="greedy", time_budget=3.0, unavailability=None):
+    """Tek senaryoyu dağıtır ve yük dağılımının özetini döndürür (süreç havuzunda çalışır)."""
+    pool, exams, warnings = apply_scenario(assistants_pool, exams, scenario)
+    # Taşınan sınavlar da kapsansın diye takvim senaryonun sınavlarından derlenir
+    availability = exam_calendar(unavailability, exams)[0] if unavailability is not None else None
+    conflict_log, error_log = [], []
+    if mode == "balanced":
+        schedule_log, pool = run_balanced_allocation(pool, exams, time_budget, conflict_log, error_log,
+                                                     availability=availability)
+    else:
+        schedule_log, pool = run_allocation(pool, exams, conflict_log, error_log=error_log, availability=availability)
+    loads = [a['load'] for a in pool]
+    return {
+        "name": scenario["name"],
+        "loads": {a['name']: round(a['load'], 2) for a in pool},
+        "max": round(max(loads), 2) if loads else 0.0,
+        "mean": round(statistics.fmean(loads), 2) if loads else 0.0,
+        "stdev": round(statistics.pstdev(loads), 2) if loads else 0.0,
+        "exams": len(schedule_log),
+        "missing": sum(c["Eksik"] for c in conflict_log),
+        "conflicts": len(conflict_log),
+        "errors": warnings + error_log
+    }
+
+
+def run_scenarios(assistants_pool, exams, scenarios, mode="greedy", time_budget=3.0, executor=None, unavailability=None):
+    """
+    Senaryoları paralel dağıtır; özetleri senaryo sırasında döndürür. 'assistants_pool',
+    calculate_initial_loads çıktısı olmalıdır; 'unavailability' müsaitlik kuralları
+    tablosudur (bkz. availability). 'executor' verilmezse geçici bir süreç havuzu açılır;
+    az sayıda senaryo (bkz. run_serially) havuz verilse de bu süreçte sırayla çalışır.
+    """
+    if not scenarios:
+        return []
+    args = [(assistants_pool, exams, scenario, mode, time_budget, unavailability) for scenario in scenarios]
+    if run_serially(len(scenarios), mode):
+        return [run_scenario(*scenario_args) for scenario_args in args]
+    if executor is None:
+        with scenario_executor(min(len(scenarios), os.cpu_count())) as pool_executor:
+            with _hidden_main():
+                results = pool_executor.map(run_scenario, *zip(*args))
+            return list(results)
+    with _hidden_main():
+        results = executor.map(run_scenario, *zip(*args))
+    return list(results)
@@ -0,0 +1,62 @@
+"""
+Uygulama testleri için ortak yardımcılar. Uygulama Streamlit AppTest ile geçici bir
+plan veritabanı üzerinde çalıştırılır. AppTest data_editor etkileşimini desteklemediği
+için editör farkı (edited_rows/added_rows/deleted_rows) doğrudan widget durumu olarak
+gönderilir; tarayıcının gönderdiğiyle aynı biçimdedir.
+"""
+import json
+from pathlib import Path
+
+import pytest
+
+APP_PATH = Path(__file__).resolve().parents[1] / "exam.py"
+FIRST_SEMESTER = "Güz (1. Dönem)"
+
+
+@pytest.fixture
+def plan_db(tmp_path, monkeypatch):
+    path = tmp_path / "plan.db"
+    monkeypatch.setenv("EXAM_PLAN_DB", str(path))
+    return path
+
+
+@pytest.fixture
+def app(plan_db):
+    """Temiz süreç önbellekleriyle açılmış uygulama."""
+    import streamlit as st
+    from streamlit.testing.v1 import AppTest
+
+    st.cache_resource.clear()
+    at = AppTest.from_file(str(APP_PATH), default_timeout=60)
+    at.run()
+    assert not at.exception, at.exception
+    yield at
+    st.cache_resource.clear()
+
+
+def editor_delta(edited_rows=None, added_rows=None, deleted_rows=None):
+    return {"edited_rows": {str(pos): cells for pos, cells in (edited_rows or {}).items()},
+            "added_rows": added_rows or [], "deleted_rows": deleted_rows or []}
+
+
+def edit_table(at, key_prefix, delta):
+    """Anahtarı 'key_prefix' ile başlayan editöre, editörün toplam farkını gönderir."""
+    from streamlit.proto.WidgetStates_pb2 import WidgetStates
+
+    node = next(n for n in at._tree if n.type == "dataframe" and f"-{key_prefix}_" in n.proto.id)
+    states = WidgetStates()
+    for state in at._tree.get_widget_states().widgets:
+        if state.id != node.proto.id:
+            states.widgets.append(state)
+    state = states.widgets.add()
+    state.id = node.proto.id
+    state.string_value = json.dumps(delta)
+    at._run(states)
+    assert not at.exception, at.exception
+    return at
+
+
+def open_page(at, page):
+    at.sidebar.radio[0].set_value(page).run()
+    assert not at.exception, at.exception
+    return at
@@ -0,0 +1,84 @@
+"""
+Greedy dağıtımın, havuzun her sınavda baştan (kararlı) sıralandığı eski yöntemle
+birebir aynı sonucu verdiğini doğrular.
+"""
+import copy
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+from exam_engine import EXAM_FIELDS, calculate_exam_points, new_assignment_table, run_allocation
+from exam_engine.allocation import ROLE_COURSE, ROLE_EXTERNAL, ROLE_PROCTOR
+
+
+def reference_allocation(assistants_pool, exams):
+    """Eski döngü: her sınavda havuz yüke göre kararlı sıralanır ve baştan taranır."""
+    busy = {a['name']: [] for a in assistants_pool}
+    rows = []
+    for k in range(len(exams['code'])):
+        needed = int(exams['needed'][k])
+        start = exams['datetime_obj'][k]
+        end = start + timedelta(minutes=int(exams['duration'][k]))
+        points = calculate_exam_points(start, int(exams['duration'][k]))
+        clashes = lambda name: any(s < end and start < e for s, e in busy[name])
+        assigned = []
+        for name in exams['pre_assigned_assistants'][k]:
+            if len(assigned) >= needed:
+                break
+            match = next((a for a in assistants_pool if a['name'] == name), None)
+            if match is None:
+                assigned.append((name, ROLE_EXTERNAL))
+            elif not clashes(name):
+                match['load'] += points
+                busy[name].append((start, end))
+                assigned.append((name, ROLE_COURSE))
+        if len(assigned) < needed:
+            assistants_pool.sort(key=lambda a: a['load'])
+            for a in assistants_pool:
+                if len(assigned) >= needed:
+                    break
+                if a['name'] in [name for name, _ in assigned] or clashes(a['name']):
+                    continue
+                a['load'] += points
+                busy[a['name']].append((start, end))
+                assigned.append((a['name'], ROLE_PROCTOR))
+        rows.append(assigned)
+    return rows, assistants_pool
+
+
+def assignments_by_exam(table, n_exams):
+    rows = [[] for _ in range(n_exams)]
+    for exam, assistant, role in zip(table['exam'], table['assistant'], table['role']):
+        rows[exam].append((table['assistants'][assistant], role))
+    return rows
+
+
+def random_semester(seed):
+    rnd = random.Random(seed)
+    names = [f"Asistan {i:02d}" for i in range(rnd.randint(1, 30))]
+    pool = [{"name": name, "load": float(rnd.choice([0, 0, 2, 4.5, 6]))} for name in names]
+    exams = {field: [] for field in EXAM_FIELDS}
+    for e in range(rnd.randint(1, 80)):
+        exams['code'].append(f"MetE {e}")
+        exams['name'].append(rnd.choice(["MT1", "MT2", "Final"]))
+        exams['datetime_obj'].append(datetime(2025, 4, 1) + timedelta(days=rnd.randint(0, 12), hours=rnd.choice([9, 13, 17, 18]),
+                                                                     minutes=rnd.choice([0, 40])))
+        exams['duration'].append(rnd.choice([60, 90, 120, 180]))
+        exams['needed'].append(rnd.randint(0, 8))
+        exams['pre_assigned_assistants'].append(rnd.sample(names, rnd.randint(0, min(2, len(names))))
+                                                + (["Dış Gözetmen"] if rnd.random() < 0.1 else []))
+    return pool, exams
+
+
+@pytest.mark.parametrize("seed", range(200))
+def test_greedy_matches_stable_sort_reference(seed):
+    pool, exams = random_semester(seed)
+    expected_rows, expected_pool = reference_allocation(copy.deepcopy(pool), exams)
+
+    table = new_assignment_table()
+    schedule, final_pool = run_allocation(copy.deepcopy(pool), exams, assignment_table=table)
+
+    assert len(schedule) == len(exams['code'])
+    assert assignments_by_exam(table, len(schedule)) == expected_rows
+    assert [(a['name'], a['load']) for a in final_pool] == [(a['name'], a['load']) for a in expected_pool]
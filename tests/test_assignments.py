@@ -0,0 +1,99 @@
+"""Atama tablosundan üretilen görünümler: program, görev listesi, yük dağılımı ve takvim."""
+import copy
+import random
+
+import pytest
+
+from exam_engine import (assignment_frame, assistant_duties, calendar_matrix, load_breakdown, new_assignment_table,
+                         run_allocation, schedule_frame)
+from exam_engine.allocation import ROLE_COURSE, ROLE_EXTERNAL, ROLE_PROCTOR
+
+from test_allocation import random_semester
+
+
+def exam_row(day, hour, code, points):
+    return {"Tarih": day, "Saat": hour, "Ders Kodu": code, "Sınav Türü": "MT1", "Süre (dk)": 120, "Puan": points}
+
+
+SCHEDULE = [
+    exam_row("2025-04-08", "17:40", "MetE 201", 2.0),
+    exam_row("2025-04-07", "09:40", "MetE 203", 3.0),
+    exam_row("2025-04-08", "13:40", "MetE 301", 1.0),
+]
+
+
+def sample_table():
+    table = new_assignment_table()
+    table["assistants"][:] = ["A", "B", "C", "Dış Gözetmen"]
+    for exam, assistant, role, points in [(0, 0, ROLE_COURSE, 2.0), (0, 1, ROLE_PROCTOR, 2.0),
+                                          (1, 1, ROLE_PROCTOR, 3.0), (1, 3, ROLE_EXTERNAL, 3.0),
+                                          (2, 1, ROLE_COURSE, 1.0)]:
+        table["exam"].append(exam)
+        table["assistant"].append(assistant)
+        table["role"].append(role)
+        table["points"].append(points)
+    return table
+
+
+def test_assignment_frame_labels_rows():
+    frame = assignment_frame(sample_table())
+    assert frame["sınav"].tolist() == [0, 0, 1, 1, 2]
+    assert frame["Asistan"].tolist() == ["A", "B", "B", "Dış Gözetmen", "B"]
+    assert frame["Rol"].tolist() == ["Ders Asistanı", "Gözetmen", "Gözetmen", "Manuel/Dış", "Ders Asistanı"]
+    assert frame["Puan"].tolist() == [2.0, 2.0, 3.0, 3.0, 1.0]
+    assert assignment_frame(new_assignment_table()).empty
+
+
+def test_schedule_frame_joins_duties_in_table_order():
+    schedule = schedule_frame(SCHEDULE + [exam_row("2025-04-09", "09:40", "MetE 401", 1.0)], sample_table())
+    assert schedule["Görevliler"].tolist() == [
+        "A (Ders Asistanı), B (Gözetmen)", "B (Gözetmen), Dış Gözetmen (Manuel/Dış)", "B (Ders Asistanı)", ""]
+    assert schedule["Ders Kodu"].tolist() == ["MetE 201", "MetE 203", "MetE 301", "MetE 401"]
+
+
+def test_assistant_duties_are_sorted_by_date():
+    duties = assistant_duties(SCHEDULE, sample_table(), "B")
+    assert duties["Ders Kodu"].tolist() == ["MetE 203", "MetE 301", "MetE 201"]
+    assert duties["Rol"].tolist() == ["Gözetmen", "Ders Asistanı", "Gözetmen"]
+    assert assistant_duties(SCHEDULE, sample_table(), "C").empty
+    assert assistant_duties(SCHEDULE, sample_table(), "Yok").empty
+
+
+def test_load_breakdown_splits_course_and_exam_load():
+    pool = [{"name": "A", "load": 5.0}, {"name": "B", "load": 12.5}, {"name": "C", "load": 1.0}]
+    frame = load_breakdown(pool, sample_table())
+    assert frame["name"].tolist() == ["A", "B", "C"]
+    assert frame["Ders Asistanı (Sınav)"].tolist() == [2.0, 1.0, 0.0]
+    assert frame["Gözetmen (Sınav)"].tolist() == [0.0, 5.0, 0.0]
+    assert frame["Ders Yükü"].tolist() == [3.0, 6.5, 1.0]
+
+
+def test_calendar_matrix_sums_points_per_day():
+    matrix = calendar_matrix(SCHEDULE, sample_table())
+    assert list(matrix.columns) == ["2025-04-07", "2025-04-08"]
+    assert matrix.loc["B"].tolist() == [3.0, 3.0]
+    assert matrix.loc["A"].tolist() == [0.0, 2.0]
+    assert "C" not in matrix.index
+    assert calendar_matrix(SCHEDULE, new_assignment_table()).empty
+
+
+@pytest.mark.parametrize("seed", range(30))
+def test_views_agree_with_allocation(seed):
+    pool, exams = random_semester(seed)
+    initial = {a["name"]: a["load"] for a in pool}
+    table = new_assignment_table()
+    schedule, final_pool = run_allocation(copy.deepcopy(pool), exams, assignment_table=table)
+
+    breakdown = load_breakdown(final_pool, table)
+    exam_points = breakdown["Ders Asistanı (Sınav)"] + breakdown["Gözetmen (Sınav)"]
+    assert breakdown["load"].tolist() == pytest.approx((breakdown["Ders Yükü"] + exam_points).tolist())
+    assert breakdown["Ders Yükü"].tolist() == pytest.approx([initial[name] for name in breakdown["name"]])
+
+    frame = assignment_frame(table)
+    joined = schedule_frame(schedule, table)["Görevliler"]
+    assert sum(len(text.split(", ")) for text in joined if text) == len(frame)
+    if len(frame):
+        matrix = calendar_matrix(schedule, table)
+        assert matrix.to_numpy().sum() == pytest.approx(frame["Puan"].sum())
+    name = random.Random(seed).choice(final_pool)["name"]
+    assert len(assistant_duties(schedule, table, name)) == (frame["Asistan"] == name).sum()
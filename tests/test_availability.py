@@ -0,0 +1,176 @@
+"""Müsaitlik takviminin derlenmesi ve dağıtımda kullanılması."""
+import copy
+import random
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+from exam_engine import (EXAM_FIELDS, compile_unavailability, exam_calendar, new_allocation_cache, new_assignment_table,
+                         run_allocation, run_allocation_cached, run_balanced_allocation, slot_mask)
+from exam_engine.availability import WEEKDAYS
+from exam_engine.memo import availability_key
+
+
+def rules_frame(rows):
+    columns = ["Asistan", "Başlangıç", "Bitiş", "Gün", "Saat Başlangıç", "Saat Bitiş"]
+    return pd.DataFrame([dict(zip(columns, row)) for row in rows], columns=columns)
+
+
+def exam_table(rows):
+    table = {field: [] for field in EXAM_FIELDS}
+    for code, start, duration, needed, pre_assigned in rows:
+        for field, value in zip(EXAM_FIELDS, (code, "MT1", start, duration, needed, pre_assigned)):
+            table[field].append(value)
+    return table
+
+
+def unavailable(calendar, name, start, end):
+    return bool(calendar["masks"].get(name, 0) & slot_mask(calendar, start, end))
+
+
+def test_boundaries_are_exact_to_the_minute():
+    rules = rules_frame([("A", None, None, None, "15:00", "17:42")])
+    calendar, errors = compile_unavailability(rules, datetime(2025, 4, 1), datetime(2025, 4, 30))
+    assert errors == []
+    day = datetime(2025, 4, 3)
+    assert not unavailable(calendar, "A", day.replace(hour=17, minute=45), day.replace(hour=19))
+    assert not unavailable(calendar, "A", day.replace(hour=17, minute=42), day.replace(hour=19))
+    assert unavailable(calendar, "A", day.replace(hour=17, minute=41), day.replace(hour=19))
+    assert not unavailable(calendar, "A", day.replace(hour=13), day.replace(hour=15))
+    assert unavailable(calendar, "A", day.replace(hour=13), day.replace(hour=15, minute=1))
+
+
+def test_date_range_and_weekday_rules():
+    rules = rules_frame([
+        ("A", "2025-04-14", "2025-04-18", None, None, None),
+        ("B", None, None, "Salı", "13:00", "17:00"),
+    ])
+    calendar, _ = compile_unavailability(rules, datetime(2025, 3, 1), datetime(2025, 6, 30))
+    assert unavailable(calendar, "A", datetime(2025, 4, 18, 23), datetime(2025, 4, 19, 1))
+    assert not unavailable(calendar, "A", datetime(2025, 4, 19, 9), datetime(2025, 4, 19, 10))
+    for day in pd.date_range("2025-03-01", "2025-06-30"):
+        day = day.to_pydatetime()
+        assert unavailable(calendar, "B", day + timedelta(hours=16, minutes=50), day + timedelta(hours=18)) == (day.weekday() == 1)
+        assert not unavailable(calendar, "B", day + timedelta(hours=17), day + timedelta(hours=19))
+
+
+def test_invalid_rules_are_reported_and_ignored():
+    rules = rules_frame([
+        ("", None, None, "Cuma", None, None),
+        ("C", None, None, "Pazar", "9:00", "8:00"),
+        ("D", "2025-05-01", "2025-04-01", None, None, None),
+        ("E", None, None, "Perşembe ", None, None),
+        ("F", None, None, None, None, None),
+    ])
+    calendar, errors = compile_unavailability(rules, datetime(2025, 4, 1), datetime(2025, 4, 30))
+    assert [e["Satır"] for e in errors] == [1, 2, 3, 4]
+    assert set(calendar["masks"]) == {"F"}
+
+
+def test_masks_match_a_rule_scan():
+    rnd = random.Random(1)
+    first, last = datetime(2025, 3, 1), datetime(2025, 7, 15)
+    names = [f"N{i}" for i in range(30)]
+    rows = []
+    for _ in range(200):
+        start = first + timedelta(days=rnd.randrange(120))
+        hour = rnd.randrange(8, 20)
+        timed = rnd.random() < 0.7
+        rows.append((rnd.choice(names), start if rnd.random() < 0.6 else None,
+                     start + timedelta(days=rnd.randrange(10)) if rnd.random() < 0.6 else None,
+                     rnd.choice([None, "Her Gün", "Pazartesi", "Salı", "Cuma", "Cumartesi"]),
+                     f"{hour}:{rnd.randrange(60):02d}" if timed else None,
+                     f"{hour + 2}:{rnd.randrange(60):02d}" if timed else None))
+    calendar, errors = compile_unavailability(rules_frame(rows), first, last)
+    assert errors == []
+
+    def clock(value, day):
+        hours, minutes = map(int, value.split(":"))
+        return day + timedelta(hours=hours, minutes=minutes)
+
+    def scan(name, start, end):
+        for rule_name, lo, hi, weekday, from_clock, to_clock in rows:
+            if rule_name != name:
+                continue
+            day = start.replace(hour=0, minute=0)
+            while day < end:
+                in_range = (lo or first).date() <= day.date() <= (hi or last).date()
+                on_day = weekday in (None, "Her Gün") or WEEKDAYS.index(weekday) == day.weekday()
+                if in_range and on_day:
+                    a, b = (clock(from_clock, day), clock(to_clock, day)) if from_clock else (day, day + timedelta(days=1))
+                    if a < end and start < b:
+                        return True
+                day += timedelta(days=1)
+        return False
+
+    for _ in range(1500):
+        start = first + timedelta(days=rnd.randrange(130), hours=rnd.randrange(8, 21), minutes=rnd.randrange(60))
+        end = start + timedelta(minutes=rnd.randrange(1, 200))
+        name = rnd.choice(names)
+        assert unavailable(calendar, name, start, end) == scan(name, start, end), (name, start, end)
+
+
+def test_exam_calendar_spans_the_exam_dates():
+    exams = exam_table([("X", datetime(2025, 4, 1, 9, 40), 120, 1, []), ("Y", datetime(2025, 5, 20, 23, 0), 120, 1, [])])
+    calendar, _ = exam_calendar(rules_frame([("A", None, None, "Salı", "9:00", "12:00")]), exams)
+    assert calendar["origin"] == datetime(2025, 4, 1)
+    assert calendar["slots"] == 51 * 24 * 60  # 1 Nisan - 21 Mayıs (son sınav gece yarısını geçer)
+    assert unavailable(calendar, "A", datetime(2025, 5, 20, 9, 40), datetime(2025, 5, 20, 11, 40))
+    assert exam_calendar(rules_frame([]), exam_table([])) == (None, [])
+
+
+def multi_week_semester():
+    names = [f"A{i:02d}" for i in range(12)]
+    rnd = random.Random(3)
+    rows = []
+    for e in range(120):
+        start = datetime(2025, 3, 3) + timedelta(days=e // 2, hours=rnd.choice([9, 13, 17]), minutes=40)
+        rows.append((f"C{e}", start, rnd.choice([90, 120]), rnd.randint(1, 4), rnd.sample(names, 1)))
+    rules = rules_frame([
+        ("A00", None, None, "Salı", None, None),
+        ("A01", "2025-03-10", "2025-03-21", None, None, None),
+        ("A02", None, None, None, "12:00", "18:00"),
+    ])
+    return [{"name": name, "load": 0.0} for name in names], exam_table(rows), rules
+
+
+def test_unavailable_assistants_are_never_assigned():
+    pool, exams, rules = multi_week_semester()
+    calendar, _ = exam_calendar(rules, exams)
+    for mode in ("greedy", "balanced"):
+        table, conflicts = new_assignment_table(), []
+        if mode == "greedy":
+            run_allocation(copy.deepcopy(pool), exams, conflicts, assignment_table=table, availability=calendar)
+        else:
+            run_balanced_allocation(copy.deepcopy(pool), exams, 0.2, conflicts, [], table, calendar)
+        for exam, assistant in zip(table["exam"], table["assistant"]):
+            start = exams["datetime_obj"][exam]
+            end = start + timedelta(minutes=exams["duration"][exam])
+            assert not unavailable(calendar, table["assistants"][assistant], start, end), mode
+        logged = [c for c in conflicts if c["Müsait Olmayan Ders Asistanları"] != "-"]
+        assert logged, mode
+
+
+def test_cached_run_with_a_multi_week_calendar():
+    pool, exams, rules = multi_week_semester()
+    calendar, _ = exam_calendar(rules, exams)
+    # 1 dakikalık dilimlerle maskeler int -> str sınırını (4300 basamak) aşar
+    assert max(calendar["masks"].values()).bit_length() > 4300 * 3.33
+
+    key = availability_key(calendar)
+    assert key == availability_key(copy.deepcopy(calendar))
+    changed = copy.deepcopy(calendar)
+    changed["masks"]["A00"] ^= 1 << 5000
+    assert availability_key(changed) != key
+
+    cache = new_allocation_cache()
+    result = run_allocation_cached(cache, copy.deepcopy(pool), exams, availability=calendar)
+    conflicts, errors, table = [], [], new_assignment_table()
+    schedule, final_pool = run_allocation(copy.deepcopy(pool), exams, conflicts, error_log=errors,
+                                          assignment_table=table, availability=calendar)
+    assert result == (schedule, final_pool, conflicts, errors, table)
+    assert run_allocation_cached(cache, copy.deepcopy(pool), exams, availability=calendar) == result
+    assert cache["last_run"]["source"] == "cache"
+    # Farklı takvim aynı sonucu önbellekten döndürmez
+    run_allocation_cached(cache, copy.deepcopy(pool), exams, availability=changed)
+    assert cache["last_run"]["source"] != "cache"
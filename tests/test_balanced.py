@@ -0,0 +1,62 @@
+"""Dengeli mod: greedy çözümünü bozmadan en yüksek yükü düşürür."""
+import copy
+from datetime import datetime, timedelta
+
+import pytest
+
+from exam_engine import EXAM_FIELDS, new_assignment_table, run_allocation, run_balanced_allocation
+from exam_engine.allocation import ROLE_COURSE, ROLE_PROCTOR
+
+from test_allocation import random_semester
+
+
+def duties(table):
+    return [(exam, table["assistants"][i], role) for exam, i, role in zip(table["exam"], table["assistant"], table["role"])]
+
+
+@pytest.mark.parametrize("seed", range(40))
+def test_balanced_keeps_greedy_invariants(seed):
+    pool, exams = random_semester(seed)
+    greedy_table, balanced_table = new_assignment_table(), new_assignment_table()
+    greedy_schedule, greedy_pool = run_allocation(copy.deepcopy(pool), exams, assignment_table=greedy_table)
+    conflicts = []
+    schedule, balanced_pool = run_balanced_allocation(copy.deepcopy(pool), exams, 0.5, conflicts, [], balanced_table)
+
+    assert schedule == greedy_schedule
+    greedy_rows, balanced_rows = duties(greedy_table), duties(balanced_table)
+    # Yalnızca gözetmenlikler el değiştirir; ders asistanları ve dış görevliler aynı kalır
+    assert [r for r in balanced_rows if r[2] != ROLE_PROCTOR] == [r for r in greedy_rows if r[2] != ROLE_PROCTOR]
+    assert [(e, role) for e, _, role in balanced_rows] == [(e, role) for e, _, role in greedy_rows]
+
+    loads = {a["name"]: a["load"] for a in balanced_pool}
+    assert max(loads.values()) <= max(a["load"] for a in greedy_pool) + 1e-9
+    assert sum(loads.values()) == pytest.approx(sum(a["load"] for a in greedy_pool))
+
+    # Aynı sınavda iki kez görev yok, çakışan iki sınavda aynı asistan yok
+    windows = {}
+    for exam, name, _ in balanced_rows:
+        start = exams["datetime_obj"][exam]
+        windows.setdefault(name, []).append((start, start + timedelta(minutes=exams["duration"][exam])))
+    for name, spans in windows.items():
+        if name not in loads:
+            continue
+        spans.sort()
+        assert all(end <= next_start for (_, end), (next_start, _) in zip(spans, spans[1:]))
+
+
+def test_balanced_moves_proctoring_off_the_busiest_assistant():
+    # Greedy ilk sınavda A'yı gözetmen yapar; A ikinci sınavın ders asistanı olduğundan
+    # en yüklü kalır. Dengeli mod gözetmenliği B'ye verir, ders asistanlığına dokunmaz.
+    exams = {field: [] for field in EXAM_FIELDS}
+    rows = [("MetE 201", datetime(2025, 4, 7, 9, 40), []), ("MetE 203", datetime(2025, 4, 7, 13, 40), ["A"])]
+    for code, start, pre_assigned in rows:
+        for field, value in zip(EXAM_FIELDS, (code, "MT1", start, 120, 1, pre_assigned)):
+            exams[field].append(value)
+    pool = [{"name": "A", "load": 0.0}, {"name": "B", "load": 4.0}]
+
+    greedy_table, balanced_table = new_assignment_table(), new_assignment_table()
+    _, greedy_pool = run_allocation(copy.deepcopy(pool), exams, assignment_table=greedy_table)
+    assert [(a["name"], a["load"]) for a in greedy_pool] == [("A", 10.0), ("B", 4.0)]
+    _, balanced_pool = run_balanced_allocation(copy.deepcopy(pool), exams, 0.5, assignment_table=balanced_table)
+    assert sorted((a["name"], a["load"]) for a in balanced_pool) == [("A", 5.0), ("B", 9.0)]
+    assert duties(balanced_table) == [(0, "B", ROLE_PROCTOR), (1, "A", ROLE_COURSE)]
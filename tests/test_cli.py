@@ -0,0 +1,47 @@
+"""Toplu dağıtım komutu."""
+import subprocess
+import sys
+
+import pandas as pd
+from openpyxl import load_workbook
+
+from exam_engine import cli
+
+
+def run_cli(*args):
+    return subprocess.run([sys.executable, "-m", "exam_engine", *map(str, args)], capture_output=True, text=True)
+
+
+def test_import_does_not_load_openpyxl():
+    code = "import sys, exam_engine.cli; print('openpyxl' in sys.modules)"
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert out.stdout.strip() == "False"
+
+
+def test_schedule_written_as_csv_and_xlsx(tmp_path):
+    roster = tmp_path / "asistanlar.csv"
+    exams = tmp_path / "sinavlar.csv"
+    pd.DataFrame({"name": ["Ali", "Ayşe", "Onur"]}).to_csv(roster, index=False)
+    pd.DataFrame({"Aktif": [True, False, True], "Ders Kodu": ["MetE 201", "MetE 203", "MetE 301"],
+                  "Sınav Türü": ["MT1", "MT1", "Final"], "Tarih": ["2025-04-15", "2025-04-15", "2025-06-02"],
+                  "Saat": ["17:40", "x", "9:40"], "Süre (dk)": [120, 120, 90], "İhtiyaç (Kişi)": [2, 2, 1]}).to_csv(exams, index=False)
+
+    result = run_cli(roster, exams, "-o", tmp_path / "program.csv")
+    assert result.returncode == 0, result.stderr
+    assert pd.read_csv(tmp_path / "program.csv")["Ders Kodu"].tolist() == ["MetE 201", "MetE 301"]
+
+    assert cli.main([str(roster), str(exams), "-o", str(tmp_path / "program.xlsx")]) == 0
+    assert load_workbook(tmp_path / "program.xlsx", read_only=True).sheetnames[0]
+
+
+def test_invalid_rows_report_file_row(tmp_path):
+    roster = tmp_path / "asistanlar.csv"
+    exams = tmp_path / "sinavlar.csv"
+    pd.DataFrame({"name": ["Ali"]}).to_csv(roster, index=False)
+    pd.DataFrame({"Aktif": [False, True], "Ders Kodu": ["A", "B"], "Sınav Türü": ["MT1", "MT1"],
+                  "Tarih": ["2025-04-15", "2025-04-15"], "Saat": ["x", "25:00"],
+                  "Süre (dk)": [120, 120], "İhtiyaç (Kişi)": [1, 1]}).to_csv(exams, index=False)
+
+    result = run_cli(roster, exams, "-o", tmp_path / "program.csv")
+    assert result.returncode == 1
+    assert "sinavlar.csv satır 2 (B MT1)" in result.stderr
@@ -0,0 +1,79 @@
+"""Çakışma indeksi: aynı asistan üst üste binen iki sınava atanmaz; atanamayanlar raporlanır."""
+import copy
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+from exam_engine import EXAM_FIELDS, book_slot, is_slot_busy, new_assignment_table, release_slot, run_allocation
+
+from test_allocation import random_semester
+
+
+def exam_table(rows):
+    table = {field: [] for field in EXAM_FIELDS}
+    for code, start, duration, needed, pre_assigned in rows:
+        for field, value in zip(EXAM_FIELDS, (code, "Final", start, duration, needed, pre_assigned)):
+            table[field].append(value)
+    return table
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_slot_index_matches_brute_force(seed):
+    rnd = random.Random(seed)
+    origin = datetime(2025, 4, 1)
+    slots, booked = ([], []), []
+    for _ in range(200):
+        start = origin + timedelta(minutes=rnd.randrange(0, 2000, 10))
+        end = start + timedelta(minutes=rnd.choice([10, 60, 120]))
+        overlaps = any(s < end and start < e for s, e in booked)
+        assert is_slot_busy(slots, start, end) == overlaps
+        if not overlaps:
+            book_slot(slots, start, end)
+            booked.append((start, end))
+        elif booked and rnd.random() < 0.3:
+            released = booked.pop(rnd.randrange(len(booked)))
+            release_slot(slots, *released)
+        assert list(zip(*slots)) == sorted(booked)
+
+
+def test_back_to_back_exams_do_not_clash():
+    start = datetime(2025, 4, 1, 9, 40)
+    slots = ([], [])
+    book_slot(slots, start, start + timedelta(minutes=120))
+    assert not is_slot_busy(slots, start + timedelta(minutes=120), start + timedelta(minutes=240))
+    assert not is_slot_busy(slots, start - timedelta(minutes=60), start)
+    assert is_slot_busy(slots, start + timedelta(minutes=119), start + timedelta(minutes=240))
+
+
+@pytest.mark.parametrize("seed", range(50))
+def test_no_assistant_is_double_booked(seed):
+    pool, exams = random_semester(seed)
+    table = new_assignment_table()
+    run_allocation(copy.deepcopy(pool), exams, assignment_table=table)
+    pool_names = {a["name"] for a in pool}
+    windows = {}
+    for exam, assistant in zip(table["exam"], table["assistant"]):
+        name = table["assistants"][assistant]
+        if name in pool_names:
+            start = exams["datetime_obj"][exam]
+            windows.setdefault(name, []).append((start, start + timedelta(minutes=exams["duration"][exam])))
+    for spans in windows.values():
+        spans.sort()
+        assert all(end <= next_start for (_, end), (next_start, _) in zip(spans, spans[1:]))
+
+
+def test_clashing_course_assistant_is_reported():
+    pool = [{"name": "A", "load": 0.0}, {"name": "B", "load": 5.0}]
+    exams = exam_table([
+        ("MetE 301", datetime(2025, 6, 2, 17, 40), 120, 1, ["A"]),
+        ("MATH 119", datetime(2025, 6, 2, 18, 40), 120, 2, ["A"]),
+        ("MetE 303", datetime(2025, 6, 2, 18, 0), 60, 2, []),
+    ])
+    conflicts = []
+    table = new_assignment_table()
+    run_allocation(pool, exams, conflicts, assignment_table=table)
+    assigned = [(exam, table["assistants"][i]) for exam, i in zip(table["exam"], table["assistant"])]
+    assert assigned == [(0, "A"), (1, "B")]
+    assert [(c["Ders Kodu"], c["Eksik"], c["Çakışan Ders Asistanları"]) for c in conflicts] == [
+        ("MATH 119", 1, "A"), ("MetE 303", 2, "-")]
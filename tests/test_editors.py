@@ -0,0 +1,75 @@
+"""Editör farklarının oturumdaki tabloya ve plan veritabanına uygulanması."""
+import sqlite3
+
+from conftest import FIRST_SEMESTER, edit_table, editor_delta, open_page
+
+NEED = "İhtiyaç (Kişi)"
+
+
+def stored_rows(plan_db, tbl):
+    import json
+    with sqlite3.connect(plan_db) as conn:
+        rows = conn.execute("SELECT row_id, data FROM plan_rows WHERE tbl = ? ORDER BY row_id", (tbl,)).fetchall()
+    return {row_id: json.loads(data) for row_id, data in rows}
+
+
+def dept_table(at):
+    return at.session_state["semester_data_dept"][FIRST_SEMESTER]
+
+
+def test_cell_edits_and_reverts_are_saved(app, plan_db):
+    tbl = f"dept:{FIRST_SEMESTER}"
+    before = dept_table(app)[NEED].tolist()
+
+    edit_table(app, f"editor_{tbl}", editor_delta({0: {NEED: 7}, 2: {"Saat": "9:40"}}))
+    assert dept_table(app)[NEED].tolist()[:3] == [7] + before[1:3]
+    assert dept_table(app)["Saat"].iloc[2] == "9:40"
+    assert stored_rows(plan_db, tbl)[0][NEED] == 7
+
+    # Farktan çıkan hücre tabandaki değere döner ve bu da kaydedilir
+    edit_table(app, f"editor_{tbl}", editor_delta({0: {NEED: 7}}))
+    assert dept_table(app)["Saat"].iloc[2] == "17:40"
+    assert stored_rows(plan_db, tbl)[2]["Saat"] == "17:40"
+    assert stored_rows(plan_db, tbl)[0][NEED] == 7
+
+
+def test_edits_survive_leaving_and_returning_to_the_page(app, plan_db):
+    tbl = f"dept:{FIRST_SEMESTER}"
+    before = dept_table(app)[NEED].tolist()
+    edit_table(app, f"editor_{tbl}", editor_delta({0: {NEED: 7}}))
+
+    # Editör çizilmediğinde Streamlit durumunu siler; dönüşte fark boş başlar
+    open_page(app, "Ders Yükleri")
+    open_page(app, FIRST_SEMESTER)
+    assert app.dataframe[0].value[NEED].iloc[0] == 7
+
+    edit_table(app, f"editor_{tbl}", editor_delta({1: {NEED: 9}}))
+    assert dept_table(app)[NEED].tolist()[:3] == [7, 9, before[2]]
+    stored = stored_rows(plan_db, tbl)
+    assert (stored[0][NEED], stored[1][NEED]) == (7, 9)
+
+
+def test_rows_added_and_deleted(app, plan_db):
+    edit_table(app, "assistant_editor", editor_delta(added_rows=[{"name": "Yeni Asistan"}], deleted_rows=[0]))
+    names = app.session_state["assistants_db"]["name"].tolist()
+    assert names[-1] == "Yeni Asistan" and "Ali Özalp" not in names
+    assert [row["name"] for row in stored_rows(plan_db, "assistants").values()] == names
+
+
+def test_course_total_follows_its_parts_until_set_by_hand(app, plan_db):
+    open_page(app, "Ders Yükleri")
+    loads = lambda: app.session_state["course_load_data"]
+    total = "Toplam (Saat)"
+
+    edit_table(app, "course_load_editor", editor_delta({0: {"Recitation": 3}}))
+    assert loads()[total].iloc[0] == 3
+    # Toplam ekranda görünsün diye editör yeni tabanla yeniden kurulur
+    assert app.dataframe[0].value[total].iloc[0] == 3
+
+    edit_table(app, "course_load_editor", editor_delta({0: {"Quiz": 2}}))
+    assert loads()[total].iloc[0] == 5
+
+    edit_table(app, "course_load_editor", editor_delta({0: {total: 9}}))
+    edit_table(app, "course_load_editor", editor_delta({0: {total: 9, "Ödevler": 4}}))
+    assert loads()[total].iloc[0] == 9  # elle girilen toplam korunur
+    assert stored_rows(plan_db, "course_loads")[0][total] == 9
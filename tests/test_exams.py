@@ -0,0 +1,74 @@
+"""Sınav tablolarının sınav listesine çevrilmesi ve hatalı satırların raporlanması."""
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from exam_engine import build_exam_list
+
+
+def exam_frame(rows):
+    columns = ["Aktif", "Ders Kodu", "Sınav Türü", "Tarih", "Saat", "Süre (dk)", "İhtiyaç (Kişi)"]
+    return pd.DataFrame([dict(zip(columns, row)) for row in rows], columns=columns)
+
+
+def test_valid_rows_become_exam_table():
+    df = exam_frame([
+        (True, "MetE 201", "MT1", pd.Timestamp("2025-04-15"), "17:40", 120, 4),
+        (True, "MetE 203", "Final", "2025-06-02", "9:05", 90.0, 2),
+        (True, "MetE 301", "MT2", pd.Timestamp("2025-05-10 00:00"), "13:40:00", 150, 0),
+    ])
+    exams, errors = build_exam_list([df], {"MetE 201": ["Ali"], "MetE 301": []})
+    assert errors == []
+    assert exams == {
+        "code": ["MetE 201", "MetE 203", "MetE 301"],
+        "name": ["MT1", "Final", "MT2"],
+        "datetime_obj": [datetime(2025, 4, 15, 17, 40), datetime(2025, 6, 2, 9, 5), datetime(2025, 5, 10, 13, 40)],
+        "duration": [120, 90, 150],
+        "needed": [4, 2, 0],
+        "pre_assigned_assistants": [["Ali"], [], []],
+    }
+    assert all(type(start) is datetime for start in exams["datetime_obj"])
+
+
+def test_invalid_rows_are_reported_and_skipped():
+    df = exam_frame([
+        (True, "A", "MT1", "2025-04-15", "25:00", 120, 2),
+        (True, "B", "MT1", "geçersiz", "abc", 0, -1),
+        (True, "C", "MT1", "2025-04-15", None, 60, 1),
+        (True, "D", "MT1", "2025-04-15", "10:60", 60, 1),
+        (True, "E", "MT1", "2025-04-15", "10:00", 60, 1),
+    ])
+    exams, errors = build_exam_list([df], {}, ["Bölüm"])
+    assert exams["code"] == ["E"]
+    assert [(e["Tablo"], e["Satır"], e["Ders Kodu"]) for e in errors] == [
+        ("Bölüm", 1, "A"), ("Bölüm", 2, "B"), ("Bölüm", 3, "C"), ("Bölüm", 4, "D")]
+    assert errors[0]["Sorun"] == "Saat '25:00' geçersiz (SS:DD bekleniyor)"
+    assert errors[1]["Sorun"] == ("Tarih boş veya geçersiz; Saat 'abc' geçersiz (SS:DD bekleniyor); "
+                                  "Süre geçersiz; Kişi sayısı geçersiz")
+    assert errors[2]["Sorun"] == "Saat 'boş' geçersiz (SS:DD bekleniyor)"
+
+
+def test_row_numbers_refer_to_the_unfiltered_table():
+    dept = exam_frame([
+        (False, "A", "MT1", "2025-04-15", "x", 120, 2),
+        (True, "B", "MT1", "2025-04-15", "10:00", 120, 2),
+        (False, "C", "MT1", "2025-04-15", "x", 120, 2),
+        (True, "D", "MT1", "2025-04-15", "99:00", 120, 2),
+    ])
+    service = exam_frame([(True, "S", "Final", "2025-06-01", "bad", 90, 1)])
+    frames = [dept, service]
+    masks = [df["Aktif"] == True for df in frames]
+    active = [df[mask] for df, mask in zip(frames, masks)]
+
+    _, errors = build_exam_list(active, {}, ["Bölüm", "Servis"], [mask.to_numpy().nonzero()[0] + 1 for mask in masks])
+    assert [(e["Tablo"], e["Satır"], e["Ders Kodu"]) for e in errors] == [("Bölüm", 4, "D"), ("Servis", 1, "S")]
+
+    # Satır numaraları verilmezse verilen tablodaki sıra kullanılır
+    _, errors = build_exam_list(active, {}, ["Bölüm", "Servis"])
+    assert [e["Satır"] for e in errors] == [2, 1]
+
+
+def test_empty_frames():
+    exams, errors = build_exam_list([exam_frame([]), exam_frame([])], {}, ["Bölüm", "Servis"], [np.array([]), np.array([])])
+    assert errors == [] and exams["code"] == []
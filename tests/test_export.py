@@ -0,0 +1,56 @@
+"""XLSX dışa aktarımı: sayfalar, sütunlar ve asistan sayfalarının içeriği."""
+import copy
+import io
+
+from openpyxl import load_workbook
+
+from exam_engine import load_breakdown, new_assignment_table, run_allocation, write_schedule_xlsx
+from exam_engine.export import DUTY_COLUMNS, SUMMARY_COLUMNS
+from exam_engine.assignments import SCHEDULE_COLUMNS
+
+from test_allocation import random_semester
+from test_assignments import SCHEDULE, sample_table
+
+
+def read_sheets(buffer):
+    wb = load_workbook(buffer, read_only=True)
+    return {ws.title: [list(row) for row in ws.iter_rows(values_only=True)] for ws in wb.worksheets}
+
+
+def test_sheets_and_columns():
+    pool = [{"name": "A", "load": 5.0, "course_duties": ["MetE 201"]}, {"name": "B", "load": 12.5}, {"name": "C", "load": 1.0}]
+    sheets = read_sheets(write_schedule_xlsx(io.BytesIO(), SCHEDULE, sample_table(), pool))
+    assert list(sheets) == ["Sınav Programı", "Yük Özeti", "A", "B", "C"]
+
+    schedule = sheets["Sınav Programı"]
+    assert schedule[0] == SCHEDULE_COLUMNS + ["Görevliler"]
+    assert [row[-1] for row in schedule[1:]] == [
+        "A (Ders Asistanı), B (Gözetmen)", "B (Gözetmen), Dış Gözetmen (Manuel/Dış)", "B (Ders Asistanı)"]
+
+    summary = sheets["Yük Özeti"]
+    assert summary[0] == SUMMARY_COLUMNS
+    assert summary[1:] == [["A", 5, 3, 2, 0, 1, "MetE 201"], ["B", 12.5, 6.5, 1, 5, 3, "-"], ["C", 1, 1, 0, 0, 0, "-"]]
+
+    assert sheets["B"][0] == DUTY_COLUMNS
+    assert [(row[2], row[-1]) for row in sheets["B"][1:]] == [
+        ("MetE 203", "Gözetmen"), ("MetE 301", "Ders Asistanı"), ("MetE 201", "Gözetmen")]
+    assert sheets["C"] == [DUTY_COLUMNS]
+
+
+def test_sheet_titles_are_valid_and_unique():
+    names = ["Ali/Veli: [2025]", "ali/veli: [2025]", "Sınav Programı", "X" * 40, "X" * 40 + "y"]
+    pool = [{"name": name, "load": 0.0} for name in names]
+    titles = list(read_sheets(write_schedule_xlsx(io.BytesIO(), [], new_assignment_table(), pool)))[2:]
+    assert titles == ["Ali_Veli_ _2025_", "ali_veli_ _2025_ (2)", "Sınav Programı (2)", "X" * 31, "X" * 27 + " (2)"]
+
+
+def test_summary_matches_load_breakdown():
+    pool, exams = random_semester(7)
+    table = new_assignment_table()
+    schedule, final_pool = run_allocation(copy.deepcopy(pool), exams, assignment_table=table)
+    summary = read_sheets(write_schedule_xlsx(io.BytesIO(), schedule, table, final_pool))["Yük Özeti"][1:]
+    breakdown = load_breakdown(final_pool, table)
+    assert [row[0] for row in summary] == breakdown["name"].tolist()
+    assert [row[2] for row in summary] == breakdown["Ders Yükü"].round(2).tolist()
+    assert [row[3] for row in summary] == breakdown["Ders Asistanı (Sınav)"].round(2).tolist()
+    assert [row[4] for row in summary] == breakdown["Gözetmen (Sınav)"].round(2).tolist()
@@ -0,0 +1,66 @@
+"""Ders Yükleri tablosundan ilk yüklerin, eski satır satır döngüyle birebir aynı hesaplandığını doğrular."""
+import copy
+import random
+
+import pandas as pd
+import pytest
+
+from exam_engine import ASSISTANT_COLUMNS, build_course_map, calculate_initial_loads
+
+
+def reference_loads(assistants_pool, course_loads_df):
+    for a in assistants_pool:
+        a['load'] = 0.0
+        a['course_duties'] = []
+    for _, row in course_loads_df.iterrows():
+        try:
+            course_load = float(row.get("Toplam (Saat)", 0))
+        except (TypeError, ValueError):
+            course_load = 0.0
+        course_code = row.get("Ders Kodu", "Bilinmeyen")
+        if course_load > 0:
+            assigned_names = [row[col] for col in ASSISTANT_COLUMNS if col in row and row[col] and row[col] != "Yok"]
+            for name in assigned_names:
+                match = next((a for a in assistants_pool if a['name'] == name), None)
+                if match:
+                    match['load'] += course_load
+                    match['course_duties'].append(f"{course_code} ({int(course_load)}p)")
+    return assistants_pool
+
+
+def random_course_loads(rnd, names):
+    rows = [{"Ders Kodu": f"MetE {100 + r}", "Toplam (Saat)": rnd.choice([0, 1.1, 2.7, 3.8, 0.1, 4, 6, -1]),
+             **{col: rnd.choice(names + ["Yok", "", "Dış Kişi"]) for col in ASSISTANT_COLUMNS}}
+            for r in range(rnd.randint(1, 60))]
+    return pd.DataFrame(rows, index=rnd.sample(range(1000), len(rows)))
+
+
+@pytest.mark.parametrize("seed", range(100))
+def test_initial_loads_match_row_loop(seed):
+    rnd = random.Random(seed)
+    names = [f"Asistan {i}" for i in range(rnd.randint(1, 20))]
+    df = random_course_loads(rnd, names)
+    # Aynı isim iki kez varsa yük ilkine yazılır
+    pool = [{"name": name, "load": 5.0} for name in names + names[:2]]
+
+    assert calculate_initial_loads(copy.deepcopy(pool), df) == reference_loads(copy.deepcopy(pool), df)
+
+
+def test_float_totals_are_summed_in_row_order():
+    df = pd.DataFrame({"Ders Kodu": ["A", "B", "C"], "Toplam (Saat)": [1.1, 2.7, 0.1],
+                       "Asistan 1": ["X", "X", "X"]})
+    (x,) = calculate_initial_loads([{"name": "X", "load": 0.0}], df)
+    assert x['load'] == (0.0 + 1.1) + 2.7 + 0.1
+    assert x['course_duties'] == ["A (1p)", "B (2p)", "C (0p)"]
+
+
+def test_missing_columns_and_empty_table():
+    pool = [{"name": "X", "load": 3.0}]
+    assert calculate_initial_loads(copy.deepcopy(pool), None) == [{"name": "X", "load": 0.0, "course_duties": []}]
+    no_assistants = pd.DataFrame({"Ders Kodu": ["A"], "Toplam (Saat)": [4]})
+    assert calculate_initial_loads(copy.deepcopy(pool), no_assistants)[0]['load'] == 0.0
+
+
+def test_course_map_last_row_wins():
+    df = pd.DataFrame({"Ders Kodu": ["A", "B", "A"], "Asistan 1": ["X", "Yok", "Y"], "Asistan 2": ["Z", None, "Yok"]})
+    assert build_course_map(df) == {"A": ["Y"], "B": []}
@@ -0,0 +1,44 @@
+"""Önbellekli ve artımlı greedy dağıtımın, baştan yapılan dağıtımla aynı olduğunu doğrular."""
+import copy
+import random
+from datetime import datetime, timedelta
+
+from exam_engine import EXAM_FIELDS, new_allocation_cache, new_assignment_table, run_allocation, run_allocation_cached
+
+
+def full_run(pool, exams):
+    conflict_log, error_log, table = [], [], new_assignment_table()
+    schedule, final_pool = run_allocation(copy.deepcopy(pool), exams, conflict_log, error_log=error_log, assignment_table=table)
+    return schedule, final_pool, conflict_log, error_log, table
+
+
+def test_incremental_matches_full_run():
+    rnd = random.Random(0)
+    names = [f"A{i:03d}" for i in range(60)]
+    pool = [{"name": name, "load": float(i % 5), "course_duties": []} for i, name in enumerate(names)]
+    exams = {field: [] for field in EXAM_FIELDS}
+    for e in range(300):
+        exams['code'].append(f"C{e}")
+        exams['name'].append("Final")
+        exams['datetime_obj'].append(datetime(2025, 6, 1) + timedelta(days=e // 4, hours=9 + 2 * (e % 4)))
+        exams['duration'].append(120)
+        exams['needed'].append(rnd.randint(1, 6))
+        exams['pre_assigned_assistants'].append(rnd.sample(names, 1))
+
+    cache = new_allocation_cache()
+    sources = set()
+    for step in range(25):
+        edited = {field: list(values) for field, values in exams.items()}
+        k = rnd.randrange(len(edited['code']))
+        edited['needed'][k] = rnd.randint(1, 8)
+        if step % 6 == 5:
+            edited = {field: values[:rnd.randint(200, 300)] for field, values in edited.items()}
+        result = run_allocation_cached(cache, copy.deepcopy(pool), edited)
+        sources.add(cache["last_run"]["source"])
+        assert result == full_run(pool, edited), step
+        # Aynı girdi önbellekten gelir
+        assert run_allocation_cached(cache, copy.deepcopy(pool), edited) == result
+        assert cache["last_run"]["source"] == "cache"
+        if len(edited['code']) == len(exams['code']):
+            exams = edited
+    assert "incremental" in sources
@@ -0,0 +1,65 @@
+"""Plan veritabanı: yalnızca değişen satırların yazılması ve eşzamanlı düzenleme çakışmaları."""
+import json
+import sqlite3
+
+from streamlit.testing.v1 import AppTest
+
+from conftest import APP_PATH, FIRST_SEMESTER, edit_table, editor_delta
+
+TBL = f"dept:{FIRST_SEMESTER}"
+EDITOR = f"editor_{TBL}"
+NEED = "İhtiyaç (Kişi)"
+
+
+def stored(plan_db):
+    with sqlite3.connect(plan_db) as conn:
+        version = conn.execute("SELECT version FROM plan_tables WHERE tbl = ?", (TBL,)).fetchone()[0]
+        rows = conn.execute("SELECT row_id, data FROM plan_rows WHERE tbl = ?", (TBL,)).fetchall()
+    return version, {row_id: json.loads(data) for row_id, data in rows}
+
+
+def second_session():
+    at = AppTest.from_file(str(APP_PATH), default_timeout=60)
+    at.run()
+    assert not at.exception, at.exception
+    return at
+
+
+def test_default_plan_is_saved_once(app, plan_db):
+    version, rows = stored(plan_db)
+    assert version == 1
+    assert len(rows) == len(app.session_state["semester_data_dept"][FIRST_SEMESTER])
+    second_session()
+    assert stored(plan_db)[0] == 1
+
+
+def test_edit_writes_only_changed_rows(app, plan_db):
+    # Düzenlenmeyen bir satırı veritabanında işaretle; fark yazımı ona dokunmamalı
+    with sqlite3.connect(plan_db) as conn:
+        conn.execute("UPDATE plan_rows SET data = ? WHERE tbl = ? AND row_id = 3", ('{"işaret": 1}', TBL))
+
+    edit_table(app, EDITOR, editor_delta({0: {NEED: 7}}))
+    version, rows = stored(plan_db)
+    assert version == 2
+    assert rows[0][NEED] == 7
+    assert rows[3] == {"işaret": 1}
+
+
+def test_concurrent_edit_reloads_the_stale_session(app, plan_db):
+    other = second_session()
+    edit_table(app, EDITOR, editor_delta({0: {NEED: 7}}))
+    assert not app.toast
+
+    # Diğer oturum sürüm 1'i biliyor; yazması kaydedilir ama tablo yeniden yüklenir
+    edit_table(other, EDITOR, editor_delta({1: {NEED: 9}}))
+    assert "başka bir oturumda" in other.toast[0].value
+    version, rows = stored(plan_db)
+    assert version == 3
+    assert (rows[0][NEED], rows[1][NEED]) == (7, 9)
+    assert other.session_state["semester_data_dept"][FIRST_SEMESTER][NEED].tolist()[:2] == [7, 9]
+    assert other.session_state["plan_versions"][TBL] == 3
+
+    # Yeniden yüklenen oturum artık güncel; sonraki yazması çakışma sayılmaz
+    edit_table(other, EDITOR, editor_delta({2: {NEED: 5}}))
+    assert not other.toast
+    assert stored(plan_db)[1][2][NEED] == 5
@@ -0,0 +1,74 @@
+"""Sonuç ekranı: özetler sonuç başına bir kez kurulur, tablolar sayfalanır, grafik en yüklü N asistanla sınırlıdır."""
+import pytest
+import streamlit as st
+from streamlit.testing.v1 import AppTest
+
+from benchmarks.synthetic import make_semester
+from conftest import APP_PATH, FIRST_SEMESTER
+
+N_ASSISTANTS = 60
+
+
+@pytest.fixture
+def results_app(plan_db):
+    semester = make_semester(N_ASSISTANTS, 40, 0)
+    st.cache_resource.clear()
+    at = AppTest.from_file(str(APP_PATH), default_timeout=60)
+    at.session_state["assistants_db"] = semester["roster"].copy()
+    at.session_state["course_load_data"] = semester["course_loads"].copy()
+    at.session_state["semester_data_dept"] = {FIRST_SEMESTER: semester["exams"].copy()}
+    at.session_state["semester_data_service"] = {FIRST_SEMESTER: semester["exams"].iloc[0:0].copy()}
+    at.run()
+    next(b for b in at.button if "DAĞITIMI" in b.label).click().run()
+    assert not at.exception, at.exception
+    yield at
+    st.cache_resource.clear()
+
+
+def view(at):
+    return at.session_state["result_views"][FIRST_SEMESTER]
+
+
+def test_result_view_is_built_once(results_app):
+    at = results_app
+    built = view(at)
+    assert len(at.get("balloons")) == 1
+    assert len(built["schedule"]) == len(built["schedule_df"]) == 120
+    assert built["breakdown"]["name"].tolist() == built["names"]
+    assert built["histogram"]["Asistan Sayısı"].sum() == N_ASSISTANTS
+
+    # Sayfa değişimi ve yeniden çalıştırma özetleri yeniden kurmaz, kutlamayı tekrarlamaz
+    at.number_input[0].set_value(2).run()
+    assert view(at) is built
+    assert not at.get("balloons")
+    at.run()
+    assert view(at) is built
+
+
+def shown_rows(at, column):
+    return next(df.value for df in at.dataframe if column in df.value.columns)
+
+
+def test_tables_are_paginated(results_app):
+    at = results_app
+    pages = {n.label: n for n in at.number_input}
+    assert set(pages) == {"Sayfa (toplam 2)", "Sayfa (toplam 3)"}
+    assert len(shown_rows(at, "Ders Sorumlulukları")) == 50
+    assert len(shown_rows(at, "Görevliler")) == 50
+
+    pages["Sayfa (toplam 2)"].set_value(2).run()
+    assert shown_rows(at, "Ders Sorumlulukları")["name"].tolist() == view(at)["loads"]["name"].tolist()[50:]
+    pages = {n.label: n for n in at.number_input}
+    pages["Sayfa (toplam 3)"].set_value(3).run()
+    assert len(shown_rows(at, "Görevliler")) == 20
+
+
+def test_chart_is_limited_to_the_most_loaded(results_app):
+    at = results_app
+    assert [s.label for s in at.slider] == ["Gösterilecek asistan sayısı", "Gösterilecek asistan sayısı (en yüklüden)"]
+    assert at.slider[0].value == 30
+
+    chart = next(r for r in at.radio if r.label == "Grafik")
+    chart.set_value("histogram").run()
+    assert not at.exception
+    assert [s.label for s in at.slider] == ["Gösterilecek asistan sayısı (en yüklüden)"]
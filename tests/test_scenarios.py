@@ -0,0 +1,99 @@
+"""Senaryoların uygulanması ve süreç havuzunda / sırayla dağıtılması."""
+import sys
+import types
+from datetime import datetime
+
+import pandas as pd
+import pytest
+
+from exam_engine import EXAM_FIELDS, apply_scenario, run_scenario, run_scenarios, scenario_executor
+from exam_engine import scenarios as scenarios_module
+
+
+def semester():
+    names = [f"Asistan {i}" for i in range(6)]
+    pool = [{"name": name, "load": float(i)} for i, name in enumerate(names)]
+    exams = {field: [] for field in EXAM_FIELDS}
+    for e, (code, hour) in enumerate([("MetE 201", 9), ("MetE 203", 9), ("MetE 301", 13), ("MetE 303", 17)]):
+        for field, value in zip(EXAM_FIELDS, (code, "MT1", datetime(2025, 4, 7 + e % 2, hour, 40), 120, 3,
+                                              ["Asistan 0"] if e == 0 else [])):
+            exams[field].append(value)
+    return pool, exams
+
+
+SCENARIOS = [
+    {"name": "Mevcut Plan", "changes": []},
+    {"name": "Asistan 0 yok", "changes": [{"action": "remove", "assistant": "Asistan 0"}]},
+    {"name": "Daha çok kişi", "changes": [{"action": "needed", "code": "MetE 301", "exam": "MT1", "needed": 5}]},
+    {"name": "Taşı", "changes": [{"action": "move", "code": "MetE 203", "exam": "MT1", "datetime": datetime(2025, 4, 9, 9, 40)}]},
+    {"name": "Hatalı", "changes": [{"action": "remove", "assistant": "Kimse"}, {"action": "sil"}]},
+]
+
+
+def test_apply_scenario_works_on_copies():
+    pool, exams = semester()
+    new_pool, new_exams, warnings = apply_scenario(pool, exams, {"name": "x", "changes": SCENARIOS[1]["changes"] + SCENARIOS[2]["changes"]})
+    assert warnings == []
+    assert [a["name"] for a in new_pool] == [f"Asistan {i}" for i in range(1, 6)]
+    assert new_exams["pre_assigned_assistants"][0] == [] and new_exams["needed"][2] == 5
+    assert len(pool) == 6 and exams["pre_assigned_assistants"][0] == ["Asistan 0"] and exams["needed"][2] == 3
+
+    _, _, warnings = apply_scenario(pool, exams, SCENARIOS[4])
+    assert warnings == ["Asistan bulunamadı: Kimse", "Bilinmeyen işlem: sil"]
+
+
+def test_few_greedy_scenarios_run_serially(monkeypatch):
+    monkeypatch.setattr(scenarios_module.os, "cpu_count", lambda: 8)
+    limit = scenarios_module.PARALLEL_MIN_SCENARIOS
+    assert scenarios_module.run_serially(1, "balanced")
+    assert scenarios_module.run_serially(limit - 1, "greedy")
+    assert not scenarios_module.run_serially(limit, "greedy")
+    assert not scenarios_module.run_serially(2, "balanced")
+    monkeypatch.setattr(scenarios_module.os, "cpu_count", lambda: 1)
+    assert scenarios_module.run_serially(limit * 4, "balanced")
+
+
+def refuse_pool(*args):
+    raise AssertionError("havuz kullanılmamalıydı")
+
+
+def test_serial_fallback_ignores_the_executor(monkeypatch):
+    monkeypatch.setattr(scenarios_module.os, "cpu_count", lambda: 8)
+    pool, exams = semester()
+    results = run_scenarios(pool, exams, SCENARIOS[:2], executor=types.SimpleNamespace(map=refuse_pool))
+    assert [r["name"] for r in results] == ["Mevcut Plan", "Asistan 0 yok"]
+
+
+@pytest.mark.parametrize("mode", ["greedy", "balanced"])
+def test_pool_results_match_serial_run(monkeypatch, mode):
+    monkeypatch.setattr(scenarios_module.os, "cpu_count", lambda: 8)
+    pool, exams = semester()
+    unavailability = pd.DataFrame([{"Asistan": "Asistan 1", "Başlangıç": None, "Bitiş": None, "Gün": "Salı",
+                                    "Saat Başlangıç": None, "Saat Bitiş": None}])
+    expected = [run_scenario(pool, exams, scenario, mode, 0.2, unavailability) for scenario in SCENARIOS]
+    with scenario_executor(2) as executor:
+        results = run_scenarios(pool, exams, SCENARIOS, mode, 0.2, executor=executor, unavailability=unavailability)
+    if mode == "greedy":
+        assert results == expected
+    else:
+        # Dengeli mod süre bütçesiyle çalışır; sıra ve deterministik alanlar karşılaştırılır
+        assert [(r["name"], r["exams"], r["errors"]) for r in results] == [(r["name"], r["exams"], r["errors"]) for r in expected]
+    assert results[4]["errors"][:2] == ["Asistan bulunamadı: Kimse", "Bilinmeyen işlem: sil"]
+
+
+def test_pool_workers_do_not_rerun_the_main_script(monkeypatch, tmp_path):
+    # Streamlit uygulamayı sahte bir __main__ olarak çalıştırır; işçiler onu yeniden çalıştırmamalı
+    marker = tmp_path / "calisti"
+    script = tmp_path / "app.py"
+    script.write_text(f"open({str(marker)!r}, 'w').close()\n", encoding="utf-8")
+    fake_main = types.ModuleType("__main__")
+    fake_main.__file__ = str(script)
+    monkeypatch.setitem(sys.modules, "__main__", fake_main)
+    monkeypatch.setattr(scenarios_module.os, "cpu_count", lambda: 8)
+
+    pool, exams = semester()
+    with scenario_executor(2) as executor:
+        results = run_scenarios(pool, exams, SCENARIOS, executor=executor)
+    assert [r["name"] for r in results] == [s["name"] for s in SCENARIOS]
+    assert not marker.exists()
+    assert sys.modules["__main__"] is fake_main